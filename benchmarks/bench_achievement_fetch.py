@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Achievement fetch benchmark
+
+Serves a library of games from the local stand-in server, each response
+delayed by --latency seconds and every --flaky'th game failing once with
+503, then fetches the whole library into an in-memory AchievementStore one
+game at a time and with the batched fetcher. Reports wall time, requests
+made and connections opened. Correctness is covered by
+tests/test_achievement_fetch.py.
+
+Usage:
+    python benchmarks/bench_achievement_fetch.py [--games 200] [--latency 0.02]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from achievements.fetcher import BatchAchievementFetcher, ConnectionPool, HttpAchievementSource  # noqa: E402
+from achievements.store import AchievementStore  # noqa: E402
+from achievements.sync import AchievementSync  # noqa: E402
+from standin_server import StandinServer  # noqa: E402
+
+
+def make_library(games, per_game):
+    return {
+        f"game{g}": {
+            "name": f"Game {g}",
+            "achievements": [
+                {"id": f"a{i}", "name": f"Achievement {i}", "rarity": (g * 7 + i) % 100,
+                 "unlocked": i % 3 == 0, "unlock_date": "2026-10-01" if i % 3 == 0 else None}
+                for i in range(per_game)
+            ],
+        }
+        for g in range(games)
+    }
+
+
+def serve(server, library, latency, flaky):
+    failures = {}
+    lock = threading.Lock()
+
+    def games(request):
+        body = {"games": [{"game_id": k, "name": v["name"]} for k, v in library.items()]}
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+    def achievements(request):
+        url = urlparse(request.path)
+        game_id = url.path.rsplit("/", 1)[-1]
+        time.sleep(latency)
+        if game_id not in library:
+            return 404, {}, b"unknown game"
+        with lock:
+            seen = failures.get(game_id, 0)
+            failures[game_id] = seen + 1
+        if flaky and int(game_id[4:]) % flaky == 0 and seen == 0:
+            return 503, {"Retry-After": "0"}, b"busy"
+        data = library[game_id]
+        since = parse_qs(url.query).get("since", [None])[0]
+        body = {"name": data["name"], "achievements": [] if since else data["achievements"],
+                "token": "v1", "full": since is None}
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+    server.add_route("/games", games)
+    server.add_route("/achievements/", achievements, prefix=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--achievements", type=int, default=50, help="achievements per game")
+    parser.add_argument("--latency", type=float, default=0.02, help="server delay per request")
+    parser.add_argument("--flaky", type=int, default=10, help="every Nth game fails once (0: none)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=1000.0, help="requests per second per host")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    library = make_library(args.games, args.achievements)
+    results = {"games": args.games, "latency_s": args.latency}
+    with StandinServer() as server:
+        serve(server, library, args.latency, 0)
+        sequential_store = AchievementStore(":memory:")
+        source = HttpAchievementSource(server.base_url, pool=ConnectionPool())
+        started = time.perf_counter()
+        outcome = AchievementSync(sequential_store, source).sync()
+        results["sequential"] = {
+            "seconds": round(time.perf_counter() - started, 3),
+            "result": outcome,
+            "connections_opened": source.pool.connections_opened,
+        }
+
+    with StandinServer() as server:
+        serve(server, library, args.latency, args.flaky)
+        batched_store = AchievementStore(":memory:")
+        source = HttpAchievementSource(server.base_url, pool=ConnectionPool())
+        fetcher = BatchAchievementFetcher(batched_store, source, concurrency=args.concurrency,
+                                          requests_per_second=args.rate, backoff_base=0.01)
+        started = time.perf_counter()
+        outcome = fetcher.fetch_all()
+        results["batched"] = {
+            "seconds": round(time.perf_counter() - started, 3),
+            "result": outcome,
+            "requests": sum(server.request_counts.values()),
+            "connections_opened": source.pool.connections_opened,
+            "server_connections": server.connection_count,
+        }
+
+        started = time.perf_counter()
+        results["batched_incremental"] = {
+            "result": fetcher.fetch_all(),
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        source.pool.close()
+
+    results["speedup"] = round(results["sequential"]["seconds"] / results["batched"]["seconds"], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
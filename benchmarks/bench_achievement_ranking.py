@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+"Next easy achievements" ranking benchmark
+
+Fills an in-memory AchievementStore with --games games of --per-game
+locked achievements (random rarity, progress and estimated time, some
+unknown), then times loading the column arrays, scoring them and the
+top-k queries. Uses numpy when it is installed and the pure-Python path
+otherwise; --backend forces one or times both. Correctness, including
+agreement between the backends, is covered by tests/test_achievement_ranking.py.
+
+Usage:
+    python benchmarks/bench_achievement_ranking.py [--games 1000] [--per-game 150]
+"""
+
+import argparse
+import contextlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from achievements import ranking  # noqa: E402
+from achievements.ranking import EasyAchievementRanker  # noqa: E402
+from achievements.store import AchievementStore  # noqa: E402
+
+
+@contextlib.contextmanager
+def timed(results, name):
+    started = time.perf_counter()
+    yield
+    results[name] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def fill(store, games, per_game, seed):
+    rnd = random.Random(seed)
+    for g in range(games):
+        store.apply_changes(f"game{g:05d}", f"Game {g}", [
+            {
+                "id": f"a{i:04d}",
+                "name": f"Achievement {i}",
+                "rarity": rnd.uniform(0.1, 99.9) if rnd.random() > 0.05 else None,
+                "progress": rnd.random() if rnd.random() > 0.3 else None,
+                "estimated_minutes": rnd.expovariate(1 / 90) if rnd.random() > 0.2 else None,
+            }
+            for i in range(per_game)
+        ])
+
+
+def run(store, use_numpy, k):
+    ranker = EasyAchievementRanker(store, use_numpy=use_numpy)
+    timings = {}
+    with timed(timings, "load_and_score_ms"):
+        ranker.refresh()
+    with timed(timings, "top_global_ms"):
+        top = ranker.top(k)
+    with timed(timings, "top_one_game_ms"):
+        ranker.top_for_game("game00000", k)
+    with timed(timings, "top_per_game_ms"):
+        ranker.top_per_game(k)
+    with timed(timings, "cached_top_global_ms"):
+        ranker.top(k)
+    return timings, top
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--per-game", type=int, default=150)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--backend", choices=["auto", "numpy", "python", "both"], default="auto")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    store = AchievementStore(":memory:")
+    started = time.perf_counter()
+    fill(store, args.games, args.per_game, args.seed)
+    results = {
+        "locked_achievements": args.games * args.per_game,
+        "numpy_available": ranking.np is not None,
+        "fill_s": round(time.perf_counter() - started, 2),
+    }
+
+    backends = {"auto": [None], "numpy": [True], "python": [False], "both": [True, False]}[args.backend]
+    if ranking.np is None and True in backends:
+        # numpy is an optional dependency; without it only the Python path runs
+        backends.remove(True)
+        results["numpy"] = "skipped: numpy is not installed"
+    top = []
+    for use_numpy in backends:
+        timings, top = run(store, use_numpy, args.k)
+        name = "numpy" if (use_numpy if use_numpy is not None else ranking.np is not None) else "python"
+        results[name] = timings
+    results["top"] = [{key: row[key] for key in ("game_id", "id", "score")} for row in top[:3]]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+CLI startup benchmark
+
+Times each epic_manager.py subcommand from process launch to exit under an
+empty temporary HOME, so every run sees a first-start setup with nothing
+to scan, fetch or back up. It also lists which project modules each command
+imports (from -X importtime). tests/test_cli_startup.py checks that
+commands do not load subsystems they never use.
+
+Commands that need the network are left out; `free-games --history` covers
+the free-games startup path without fetching.
+
+Usage:
+    python benchmarks/bench_cli_startup.py [--runs 10] [--budget-ms 80]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = PROJECT_ROOT / "src" / "epic_manager.py"
+PACKAGES = ("core", "library", "downloads", "free_games", "achievements")
+
+COMMANDS = {
+    "help": ["--help"],
+    "license": ["license"],
+    "free-games --history": ["free-games", "--history", "hades"],
+    "achievements": ["achievements"],
+    "scan": ["scan"],
+    "repair": ["repair", "--game", "missing"],
+    "backup": ["backup"],
+}
+
+
+def run(args, home, extra=()):
+    env = dict(os.environ, HOME=home, APPDATA=home)
+    return subprocess.run([sys.executable, *extra, str(SCRIPT), *args], cwd=PROJECT_ROOT, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def time_command(args, runs, home):
+    """Run a command several times and return wall-clock milliseconds per run"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run(args, home)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def project_imports(args, home):
+    """Project modules a command imports, in import order"""
+    stderr = run(args, home, ("-X", "importtime")).stderr.decode(errors="replace")
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        name = line.rsplit("|", 1)[1].strip()
+        if name.split(".")[0] in PACKAGES:
+            modules.append(name)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="runs per command")
+    parser.add_argument("--budget-ms", type=float, default=80,
+                        help="median a light command (help, license) may take")
+    args = parser.parse_args()
+
+    results = {"baseline": {}, "commands": {}}
+    with tempfile.TemporaryDirectory() as home:
+        started = time.perf_counter()
+        for _ in range(args.runs):
+            subprocess.run([sys.executable, "-c", "pass"])
+        results["baseline"]["python_ms"] = round((time.perf_counter() - started) * 1000 / args.runs, 1)
+
+        for name, command in COMMANDS.items():
+            run(command, home)  # first start creates the config and data directories
+            timings = time_command(command, args.runs, home)
+            modules = project_imports(command, home)
+            results["commands"][name] = {
+                "min_ms": round(min(timings), 1),
+                "median_ms": round(statistics.median(timings), 1),
+                "project_modules": len(modules),
+            }
+
+    over_budget = [name for name in ("help", "license") if results["commands"][name]["median_ms"] > args.budget_ms]
+    results["over_budget"] = over_budget
+    print(json.dumps(results, indent=2))
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Config persistence benchmark
+
+Runs against a config directory under a temporary HOME. Times --changes
+settings written one set() at a time against the same changes in one
+transaction, a hot reload after another process edits the file, and
+cached reads. Correctness is covered by tests/test_config.py.
+
+Usage:
+    python benchmarks/bench_config.py [--changes 200]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--changes", type=int, default=200)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    home = tempfile.mkdtemp()
+    os.environ["HOME"] = os.environ["APPDATA"] = home
+    from core.config import Config
+
+    config = Config(reload_interval=0)
+    results = {"changes": args.changes}
+
+    started = time.perf_counter()
+    for i in range(args.changes):
+        config.add_game_directory(f"/games/{i}")
+    results["one_write_per_change_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    started = time.perf_counter()
+    with config.transaction():
+        for i in range(args.changes):
+            config.add_game_directory(f"/more-games/{i}")
+            config.set("last_scan", str(i))
+    results["single_transaction_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    results["speedup"] = round(results["one_write_per_change_ms"] / results["single_transaction_ms"], 1)
+
+    other = Config(reload_interval=0)
+    config.set("theme", "light")
+    started = time.perf_counter()
+    other.get_str("theme")
+    results["hot_reload_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    started = time.perf_counter()
+    for _ in range(10000):
+        other.get_str("theme")
+    results["get_us"] = round((time.perf_counter() - started) * 100, 2)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
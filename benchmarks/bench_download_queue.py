@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Download queue benchmark
+
+Times the DownloadQueueManager operations on a queue of 100k items (or
+--items N), including the journal append each change costs. fsync is off
+unless --fsync is given, so the figures do not just measure the disk.
+
+Usage:
+    python benchmarks/bench_download_queue.py [--items 100000] [--fsync]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from downloads.queue_manager import DownloadQueueManager  # noqa: E402
+
+
+@contextlib.contextmanager
+def timed(results, name, count):
+    """Record total seconds and microseconds per operation for a block"""
+    started = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - started
+    results[name] = {
+        "ops": count,
+        "total_s": round(elapsed, 4),
+        "us_per_op": round(elapsed / count * 1e6, 2),
+    }
+
+
+def run(items, durable=False, seed=1):
+    rng = random.Random(seed)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue_file = Path(tmp) / "download_queue.json"
+        manager = DownloadQueueManager(queue_file=queue_file, durable=durable)
+
+        ids = [f"game-{i}" for i in range(items)]
+        sample = rng.sample(ids, min(items, 10_000))
+
+        # add_to_queue prints a line per call
+        with contextlib.redirect_stdout(io.StringIO()):
+            with timed(results, "add_to_queue", items):
+                for game_id in ids:
+                    manager.add_to_queue(game_id, game_id, rng.randint(1, 100) * 1024 ** 3,
+                                         priority=rng.randint(0, 5))
+            with timed(results, "add_to_queue_duplicate", len(sample)):
+                for game_id in sample:
+                    manager.add_to_queue(game_id, game_id, 0)
+
+        with timed(results, "get_next_download", len(sample)):
+            for _ in sample:
+                manager.get_next_download()
+
+        with timed(results, "prioritize_game", len(sample)):
+            for game_id in sample:
+                manager.prioritize_game(game_id)
+
+        with timed(results, "update_status", len(sample)):
+            for game_id in sample:
+                manager.update_status(game_id, "downloading")
+
+        with timed(results, "drain_next_pending", len(sample)):
+            for _ in sample:
+                item = manager.get_next_download()
+                manager.update_status(item.game_id, "completed")
+
+        with timed(results, "remove_from_queue", len(sample)):
+            for game_id in sample:
+                manager.remove_from_queue(game_id)
+
+        with timed(results, "get_queue_info", 10):
+            for _ in range(10):
+                manager.get_queue_info()
+
+        with timed(results, "get_queue_info_counts_only", len(sample)):
+            for _ in sample:
+                manager.get_queue_info(include_items=False)
+
+        with timed(results, "compact", 1):
+            manager.compact()
+
+        with timed(results, "load", 1):
+            DownloadQueueManager(queue_file=queue_file, durable=durable)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the download queue")
+    parser.add_argument("--items", type=int, default=100_000, help="Items to queue")
+    parser.add_argument("--fsync", action="store_true", help="fsync every change")
+    args = parser.parse_args()
+    results = run(args.items, durable=args.fsync)
+    print(json.dumps({"items": args.items, "fsync": args.fsync, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+License entitlement benchmark
+
+Runs against a license file under a temporary HOME. Times --checks feature
+checks through the cached Entitlements service against the old way of
+calling LicenseValidator.get_features() (read, parse and checksum the file
+each time). Cache invalidation is covered by tests/test_entitlements.py.
+
+Usage:
+    python benchmarks/bench_entitlements.py [--checks 100000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+def uncached_has(validator, feature):
+    """Feature check as it was done before the service: parse and validate every time"""
+    data = validator._load_license()
+    tier = data.get('tier', 'free') if validator._validate_license_data(data) else 'free'
+    return validator.get_features(tier)[feature]
+
+
+def time_checks(function, count):
+    started = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - started) * 1e6 / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--checks", type=int, default=100000)
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp()
+    os.environ["HOME"] = os.environ["APPDATA"] = home
+    from core.license import LicenseValidator
+
+    validator = LicenseValidator()
+    validator.activate("EPIC-PRO-0000-1111-2222")
+    service = validator.entitlements
+
+    results = {"checks_timed": args.checks}
+    results["uncached_us"] = round(time_checks(lambda: uncached_has(validator, "batch_repair"),
+                                               max(args.checks // 100, 100)), 3)
+    results["cached_us"] = round(time_checks(lambda: service.has("batch_repair"), args.checks), 3)
+    results["speedup"] = round(results["uncached_us"] / results["cached_us"])
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Free games HTTP cache benchmark
+
+Serves a freeGamesPromotions document from the local stand-in server and
+points a FreeGamesTracker at it, with the cache in a temporary directory
+and a fake clock to step past the TTL. Walks through a cold fetch, warm
+reads, a 304 revalidation, a changed payload, a failing server and a
+stopped one, and reports requests, connections and timings next to
+fetching without a cache. Correctness is covered by tests/test_http_cache.py.
+
+Usage:
+    python benchmarks/bench_free_games_cache.py [--offers 500] [--reads 200]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from core.http import CachedHttpClient  # noqa: E402
+from free_games.archive import PromotionArchive  # noqa: E402
+from free_games.seen import SeenPromotions  # noqa: E402
+from free_games.tracker import FreeGamesTracker  # noqa: E402
+from standin_server import ConditionalResource, StandinServer, promotions_payload  # noqa: E402
+
+TTL = 3600.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--offers", type=int, default=500, help="elements in the payload")
+    parser.add_argument("--reads", type=int, default=200, help="warm reads to time")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    resource = ConditionalResource.json(promotions_payload(args.offers))
+    results = {"offers": args.offers, "payload_bytes": len(resource.body)}
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with StandinServer() as server:
+            server.add_route("/freeGamesPromotions", resource)
+            url = server.base_url + "/freeGamesPromotions"
+            clock = FakeClock()
+            seen = SeenPromotions(Path(cache_dir) / "seen.json")
+            archive = PromotionArchive(Path(cache_dir) / "archive.db")
+            tracker = FreeGamesTracker(client=CachedHttpClient(cache_dir, ttl=TTL, clock=clock),
+                                       api_url=url, seen=seen, archive=archive)
+
+            def requests():
+                return server.request_counts.get("/freeGamesPromotions", 0)
+
+            started = time.perf_counter()
+            tracker.get_current_free()
+            results["cold_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            started = time.perf_counter()
+            for _ in range(args.reads):
+                tracker.get_current_free()
+            results["warm_read_ms"] = round((time.perf_counter() - started) * 1000 / args.reads, 3)
+            results["warm_requests"] = requests() - 1
+
+            baseline = time.perf_counter()
+            for _ in range(min(args.reads, 50)):
+                with urllib.request.urlopen(url) as response:
+                    json.loads(response.read())
+            results["uncached_fetch_ms"] = round((time.perf_counter() - baseline) * 1000 / min(args.reads, 50), 3)
+
+            clock.now += TTL + 1
+            started = time.perf_counter()
+            tracker.get_current_free()
+            results["revalidate_304_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            resource.update(json.dumps(promotions_payload(args.offers, free_every=2)).encode())
+            clock.now += TTL + 1
+            started = time.perf_counter()
+            tracker.get_current_free()
+            results["changed_refetch_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            fresh = FreeGamesTracker(client=CachedHttpClient(cache_dir, ttl=TTL, clock=clock),
+                                     api_url=url, seen=seen, archive=archive)
+            started = time.perf_counter()
+            fresh.get_current_free()
+            results["other_process_read_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            resource.failing = True
+            clock.now += TTL + 1
+            started = time.perf_counter()
+            tracker.get_current_free()
+            results["server_error_stale_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            resource.failing = False
+            tracker.client.close()
+            results["tracker_connections"] = tracker.client.pool.connections_opened
+
+        # Server gone entirely: connection refused
+        started = time.perf_counter()
+        tracker.get_current_free()
+        results["offline_stale_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    results["uncached_to_warm_ratio"] = round(results["uncached_fetch_ms"] / max(results["warm_read_ms"], 1e-3), 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
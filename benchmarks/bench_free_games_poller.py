@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Free games poller benchmark
+
+Serves a freeGamesPromotions document from the local stand-in server and
+polls it the way PromotionPoller does. Times an unchanged poll, answered
+with 304 and never diffed, against one whose payload changed and is diffed
+against the seen-promotions index. Correctness is covered by
+tests/test_seen_promotions.py.
+
+Usage:
+    python benchmarks/bench_free_games_poller.py [--offers 500] [--runs 50]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from core.http import CachedHttpClient  # noqa: E402
+from free_games.archive import PromotionArchive  # noqa: E402
+from free_games.poller import PromotionPoller  # noqa: E402
+from free_games.seen import SeenPromotions  # noqa: E402
+from free_games.tracker import FreeGamesTracker  # noqa: E402
+from standin_server import ConditionalResource, StandinServer, promotions_payload  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--offers", type=int, default=500, help="elements in the payload")
+    parser.add_argument("--runs", type=int, default=50, help="polls timed per case")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    every_fourth = json.dumps(promotions_payload(args.offers, free_every=4, now=now)).encode()
+    every_second = json.dumps(promotions_payload(args.offers, free_every=2, now=now)).encode()
+    resource = ConditionalResource(every_fourth)
+    results = {"offers": args.offers, "runs": args.runs}
+
+    with tempfile.TemporaryDirectory() as directory, StandinServer() as server:
+        server.add_route("/freeGamesPromotions", resource)
+        tracker = FreeGamesTracker(client=CachedHttpClient(directory),
+                                   api_url=server.base_url + "/freeGamesPromotions",
+                                   seen=SeenPromotions(Path(directory) / "seen.json"),
+                                   archive=PromotionArchive(Path(directory) / "archive.db"))
+        poller = PromotionPoller(tracker)
+        poller.run_once()
+
+        started = time.perf_counter()
+        for _ in range(args.runs):
+            poller.run_once()
+        results["unchanged_poll_ms"] = round((time.perf_counter() - started) * 1000 / args.runs, 3)
+
+        started = time.perf_counter()
+        for i in range(args.runs):
+            resource.update(every_second if i % 2 == 0 else every_fourth)
+            poller.run_once()
+        results["changed_poll_ms"] = round((time.perf_counter() - started) * 1000 / args.runs, 3)
+        tracker.client.close()
+
+        results["polls"] = poller.polls
+        results["diffs"] = poller.changes
+        results["not_modified"] = resource.not_modified
+        results["full_responses"] = resource.full_responses
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the Epic Manifest Updater GUI
+
+Times how long the GUI takes from process launch until the main window is
+shown, for the plain script and for the PyInstaller one-file build produced
+by build_exe.py. Both are started with --startup-check, which makes the app
+exit as soon as its window is ready. A display is required for those runs;
+the module import time is measured separately and works headless.
+
+Usage:
+    python benchmarks/bench_gui_startup.py [--runs 10] [--exe dist/EpicManifestUpdater.exe]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SCRIPT = PROJECT_ROOT / "epic_manifest_updater.py"
+APP_NAME = "EpicManifestUpdater"
+
+
+def default_exe_path() -> Path:
+    """Location of the one-file build created by build_exe.py"""
+    suffix = ".exe" if os.name == "nt" else ""
+    return PROJECT_ROOT / "dist" / f"{APP_NAME}{suffix}"
+
+
+def time_command(cmd, runs):
+    """Run a command several times and return wall-clock seconds per run"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(cmd, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.PIPE)
+        elapsed = time.perf_counter() - started
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.decode(errors="replace").strip())
+        timings.append(elapsed)
+    return timings
+
+
+def summarize(timings):
+    """Reduce a list of timings to the figures worth comparing"""
+    return {
+        "runs": len(timings),
+        "min_s": round(min(timings), 4),
+        "median_s": round(statistics.median(timings), 4),
+        "max_s": round(max(timings), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GUI startup time")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per target")
+    parser.add_argument("--exe", type=Path, default=default_exe_path(),
+                        help="PyInstaller build to time (default: dist/)")
+    args = parser.parse_args()
+
+    targets = {
+        "import": [sys.executable, "-c", "import epic_manifest_updater"],
+        "script": [sys.executable, str(SCRIPT), "--startup-check"],
+    }
+    if args.exe.exists():
+        targets["exe"] = [str(args.exe), "--startup-check"]
+    else:
+        print(f"Skipping exe: {args.exe} not found (run build_exe.py first)", file=sys.stderr)
+
+    results = {}
+    for name, cmd in targets.items():
+        try:
+            results[name] = summarize(time_command(cmd, args.runs))
+        except RuntimeError as e:
+            reason = str(e).splitlines()[-1] if str(e) else "failed"
+            print(f"Skipping {name}: {reason}", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
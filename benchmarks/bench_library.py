@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+End-to-end library benchmark
+
+Generates synthetic libraries (see manifest_corpus.py) at each of --scales
+and times, against each one:
+- LibraryScanner.scan_manifests, cold and rescanned
+- get_game_by_name for a sample of display and app names
+- ManifestManager.validate_manifest and backup_manifest for every game
+- bulk_update_location onto the NewDrive copies
+- DownloadQueueManager add, prioritize, claim, complete and clear for
+  every game
+
+Results are machine-readable: --output writes them as JSON, tagged with
+the git revision, Python version and corpus parameters. --baseline compares
+against an earlier results file and fails when an operation got more than
+--tolerance slower per call, so two versions can be compared on the same
+machine. Correctness is covered by tests/test_library.py.
+
+Usage:
+    python benchmarks/bench_library.py [--scales 100,1000,5000] [--output results.json]
+                                       [--baseline old.json] [--tolerance 0.5]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from manifest_corpus import generate_library, parse_range  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+@contextlib.contextmanager
+def timed(results, name, count):
+    """Record total seconds and microseconds per operation for a block"""
+    started = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - started
+    results[name] = {
+        "ops": count,
+        "total_s": round(elapsed, 4),
+        "us_per_op": round(elapsed / max(count, 1) * 1e6, 2),
+    }
+
+
+def git_revision():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_scale(games, args, home):
+    """Time every operation on one freshly generated library"""
+    from downloads.queue_manager import DownloadQueueManager
+    from library.manifest import ManifestManager
+    from library.scanner import LibraryScanner
+
+    rng = random.Random(args.seed)
+    timings = {}
+    root = Path(home) / f"library-{games}"
+
+    with timed(timings, "generate", games):
+        corpus = generate_library(root, games, args.files, args.file_size, seed=args.seed)
+
+    scanner = LibraryScanner(corpus.manifest_dir)
+    with timed(timings, "scan_manifests_cold", games):
+        found = scanner.scan_manifests()
+    with timed(timings, "scan_manifests", games * args.repeat):
+        for _ in range(args.repeat):
+            scanner.scan_manifests()
+
+    names = rng.sample(corpus.display_names, min(args.lookups, len(corpus.display_names)))
+    names += [name.upper() for name in rng.sample(corpus.app_names, min(args.lookups, len(corpus.app_names)))]
+    with timed(timings, "get_game_by_name", len(names)):
+        for name in names:
+            scanner.get_game_by_name(name)
+
+    manager = ManifestManager(scanner)
+    with timed(timings, "validate_manifest", len(found)):
+        for game in found:
+            manager.validate_manifest(game)
+
+    with timed(timings, "backup_manifest", len(found)):
+        for game in found:
+            manager.backup_manifest(game)
+
+    with timed(timings, "bulk_update_location", len(found)):
+        manager.bulk_update_location(corpus.moved_root)
+
+    queue = DownloadQueueManager(root / "download_queue.json", durable=False)
+    order = list(found)
+    rng.shuffle(order)
+    # add_to_queue prints a line per call
+    with contextlib.redirect_stdout(io.StringIO()):
+        with timed(timings, "queue_add", len(order)):
+            for game in order:
+                queue.add_to_queue(game.app_name, game.display_name, game.install_size,
+                                   priority=rng.randint(0, 5))
+    favourites = rng.sample(order, min(100, len(order)))
+    with timed(timings, "queue_prioritize", len(favourites)):
+        for game in favourites:
+            queue.prioritize_game(game.app_name)
+    with timed(timings, "queue_claim_and_complete", len(order)):
+        while True:
+            item = queue.claim_next_download()
+            if item is None:
+                break
+            queue.update_status(item.game_id, "completed")
+    with timed(timings, "queue_clear_completed", 1):
+        queue.clear_completed()
+
+    summary = corpus.summary()
+    del summary["root"]
+    return {"corpus": summary, "timings": timings}
+
+
+def compare(results, baseline, tolerance, floor_us):
+    """Operations slower per call than in baseline by more than tolerance"""
+    regressions = []
+    for scale, current in results["scales"].items():
+        before = baseline.get("scales", {}).get(scale, {}).get("timings", {})
+        for name, timing in current["timings"].items():
+            if name == "generate" or name not in before:
+                continue
+            old, new = before[name]["us_per_op"], timing["us_per_op"]
+            if new > old * (1 + tolerance) and new - old > floor_us:
+                regressions.append({"scale": int(scale), "operation": name, "baseline_us": old,
+                                    "current_us": new, "ratio": round(new / old, 2) if old else None})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", default="100,1000,5000", help="comma-separated library sizes")
+    parser.add_argument("--files", type=parse_range, default=(20, 200), help="InstalledFiles per game, MIN:MAX")
+    parser.add_argument("--file-size", type=parse_range, default=(4 * 1024, 512 * 1024 ** 2),
+                        help="installed file size in bytes, MIN:MAX")
+    parser.add_argument("--lookups", type=int, default=200, help="names looked up by display and by app name")
+    parser.add_argument("--repeat", type=int, default=3, help="warm rescans to time")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="results file of the version to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown per call, as a fraction")
+    parser.add_argument("--floor-us", type=float, default=1.0,
+                        help="ignore slowdowns smaller than this many microseconds per call")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "started_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "files": list(args.files),
+            "file_size": list(args.file_size),
+            "seed": args.seed,
+        },
+        "scales": {},
+    }
+    with tempfile.TemporaryDirectory() as home:
+        # Backups and lock files go under HOME
+        os.environ["HOME"] = os.environ["APPDATA"] = home
+        for scale in (int(s) for s in args.scales.split(",")):
+            results["scales"][str(scale)] = run_scale(scale, args, home)
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.tolerance, args.floor_us)
+        results["baseline"] = {"file": str(args.baseline), "revision": baseline.get("meta", {}).get("revision"),
+                               "regressions": regressions}
+
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Library logging benchmark
+
+Scans a synthetic library (see manifest_corpus.py) and relocates it with
+bulk_update_location, logging at INFO to a JsonLogHandler file. It compares
+three setups:
+- the rate-limited loop logs with their summary lines
+- every per-game record logged, which is what the loops did before
+- INFO disabled
+It reports time and records written for each, and times the GUI's
+LogBuffer under concurrent writers. Correctness is covered by
+tests/test_logs.py.
+
+Usage:
+    python benchmarks/bench_logging.py [--games 5000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from core.logs import JsonLogHandler, LoopLog  # noqa: E402
+from manifest_corpus import generate_library  # noqa: E402
+
+
+def relocate(corpus_dir, work_dir, log_file, level, limit):
+    """Relocate a fresh copy of the corpus; returns (seconds, log records, updated, failed)"""
+    from library.manifest import ManifestManager
+    from library.scanner import LibraryScanner
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    shutil.copytree(corpus_dir, work_dir, symlinks=True)
+    root_logger = logging.getLogger()
+    handler = JsonLogHandler(log_file)
+    root_logger.addHandler(handler)
+    root_logger.setLevel(level)
+    default_limit, LoopLog.DEFAULT_LIMIT = LoopLog.DEFAULT_LIMIT, limit
+    try:
+        started = time.perf_counter()
+        # The manifests' InstallLocation points into the original corpus
+        manager = ManifestManager(LibraryScanner(Path(work_dir) / "Manifests"))
+        updated, failed = manager.bulk_update_location(Path(corpus_dir) / "NewDrive")
+        elapsed = time.perf_counter() - started
+    finally:
+        root_logger.removeHandler(handler)
+        handler.close()
+        LoopLog.DEFAULT_LIMIT = default_limit
+    with open(log_file, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    os.remove(log_file)
+    return elapsed, records, len(updated), len(failed)
+
+
+def time_log_buffer(threads=4, lines=25000):
+    from epic_manifest_updater import LogBuffer
+
+    buffer = LogBuffer()
+    drained = []
+    done = threading.Event()
+
+    def write(n):
+        for i in range(lines):
+            buffer.append(f"{n}:{i}\n")
+
+    def drain():
+        while not done.is_set():
+            drained.append(buffer.drain())
+            time.sleep(0.001)
+        drained.append(buffer.drain())
+
+    reader = threading.Thread(target=drain)
+    reader.start()
+    started = time.perf_counter()
+    writers = [threading.Thread(target=write, args=(n,)) for n in range(threads)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    reader.join()
+    return {"lines": threads * lines, "append_us": round(elapsed * 1e6 / (threads * lines), 3),
+            "drains": sum(1 for text in drained if text)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    results = {"games": args.games}
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = os.environ["APPDATA"] = home
+        corpus_dir = Path(home) / "corpus"
+        generate_library(corpus_dir, args.games, seed=args.seed)
+        log_file = Path(home) / "log.jsonl"
+        work_dir = Path(home) / "work"
+
+        runs = {
+            "rate_limited": (logging.INFO, 5),
+            "every_record": (logging.INFO, 10 ** 9),
+            "info_disabled": (logging.WARNING, 5),
+        }
+        for name, (level, limit) in runs.items():
+            elapsed, records, updated, failed = relocate(corpus_dir, work_dir, log_file, level, limit)
+            results[name] = {"seconds": round(elapsed, 3), "records": len(records),
+                             "updated": updated, "failed": failed}
+
+    results["speedup_vs_every_record"] = round(results["every_record"]["seconds"]
+                                               / results["rate_limited"]["seconds"], 2)
+    results["gui_log_buffer"] = time_log_buffer()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Instrumentation overhead benchmark
+
+Measures what core.metrics costs per call while disabled (incr, span and a
+@timed wrapper) and while enabled. Runs a scan, validation, relocation and
+queue workload on a synthetic library (see manifest_corpus.py) with metrics
+on to count the instrumented calls. From those counts it estimates the
+overhead the disabled instrumentation adds to the workload. Recording and
+export are covered by tests/test_metrics.py.
+
+Usage:
+    python benchmarks/bench_metrics.py [--games 2000] [--calls 1000000]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from core import metrics  # noqa: E402
+from manifest_corpus import generate_library  # noqa: E402
+
+def per_call_ns(function, calls):
+    started = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - started) * 1e9 / calls
+
+
+def call_costs(calls):
+    """Nanoseconds per incr, span and @timed call, beyond an empty call"""
+    def nothing():
+        pass
+
+    wrapped = metrics.timed("bench.wrapped")(nothing)
+
+    def spanned():
+        with metrics.span("bench.span"):
+            pass
+
+    base = per_call_ns(nothing, calls)
+    return {
+        "incr": round(per_call_ns(lambda: metrics.incr("bench.counter"), calls) - base, 1),
+        "span": round(per_call_ns(spanned, calls) - base, 1),
+        "timed": round(per_call_ns(wrapped, calls) - base, 1),
+    }
+
+
+def workload(corpus, home):
+    """Scan, validate, relocate and queue every game of the corpus"""
+    from downloads.queue_manager import DownloadQueueManager
+    from library.manifest import ManifestManager
+    from library.scanner import LibraryScanner
+
+    scanner = LibraryScanner(corpus.manifest_dir)
+    games = scanner.scan_manifests()
+    manager = ManifestManager(scanner)
+    for game in games:
+        manager.validate_manifest(game)
+    manager.bulk_update_location(corpus.moved_root)
+    queue = DownloadQueueManager(Path(home) / f"queue-{time.monotonic_ns()}.json", durable=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for game in games:
+            queue.add_to_queue(game.app_name, game.display_name, game.install_size)
+    while queue.claim_next_download() is not None:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=1000000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    results = {"games": args.games}
+    metrics.disable()
+    results["disabled_ns"] = call_costs(args.calls)
+    metrics.enable()
+    results["enabled_ns"] = call_costs(args.calls)
+    metrics.disable()
+    metrics.reset()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = os.environ["APPDATA"] = home
+        corpus = generate_library(Path(home) / "library", args.games)
+
+        started = time.perf_counter()
+        workload(corpus, home)
+        disabled_s = time.perf_counter() - started
+
+        # The relocation moved games onto NewDrive; start again from a fresh copy
+        corpus = generate_library(Path(home) / "library-2", args.games)
+        metrics.enable()
+        started = time.perf_counter()
+        workload(corpus, home)
+        enabled_s = time.perf_counter() - started
+        snapshot = metrics.snapshot()
+        metrics.disable()
+
+    counters, timings = snapshot["counters"], snapshot["timings"]
+    # Byte counters are updated once per manifest read and once per journal record;
+    # every other counter goes up by about one per update
+    byte_counters = {"library.bytes_read": "library.manifests_parsed", "queue.journal_bytes": "queue.changes"}
+    increments = int(sum(counters.get(byte_counters.get(name, name), 0) for name in counters))
+    spans = sum(timing["count"] for timing in timings.values())
+    estimated_s = (increments * results["disabled_ns"]["incr"]
+                   + spans * max(results["disabled_ns"]["span"], results["disabled_ns"]["timed"])) / 1e9
+    results.update({
+        "workload_disabled_s": round(disabled_s, 3),
+        "workload_enabled_s": round(enabled_s, 3),
+        "instrumented_calls": {"counter_updates": increments, "spans": spans},
+        "estimated_disabled_overhead": round(estimated_s / disabled_s, 5),
+        "counters": counters,
+        "timings": {name: timing["count"] for name, timing in timings.items()},
+    })
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
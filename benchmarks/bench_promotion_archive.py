@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Promotion archive benchmark
+
+Fills a PromotionArchive with --promotions synthetic promotions (titles
+built from a word list, weekly windows over many years, spread prices),
+then times history searches by title words, date range and price against
+filtering every row in Python, and prints the query plans to show which
+indexes are used. Correctness is covered by tests/test_promotion_archive.py.
+
+Usage:
+    python benchmarks/bench_promotion_archive.py [--promotions 50000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from free_games.archive import PromotionArchive, tokenize  # noqa: E402
+
+WORDS = ["dark", "shadow", "legend", "quest", "kingdom", "star", "city", "hollow", "rogue",
+         "dragon", "empire", "night", "ocean", "iron", "sky", "lost", "tactics", "racing",
+         "odyssey", "frontier", "galaxy", "ruins", "crown", "forge", "tales", "édition"]
+
+
+def make_promotions(count, seed):
+    rnd = random.Random(seed)
+    start = datetime(2018, 12, 13, 16, tzinfo=timezone.utc)
+    offers = []
+    for i in range(count):
+        starts = start + timedelta(weeks=i // 3, hours=rnd.randint(0, 24))
+        amount = round(rnd.choice([4.99, 9.99, 14.99, 19.99, 24.99, 29.99, 39.99, 59.99]), 2)
+        offers.append({
+            "id": f"{i:032x}",
+            "title": " ".join(rnd.sample(WORDS, rnd.randint(2, 4))).title() + f" {i}",
+            "starts_at": starts.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "ends_at": (starts + timedelta(days=7)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "original_price": f"${amount:.2f}",
+            "original_amount": amount,
+            "currency": "USD",
+        })
+    return offers
+
+
+def python_search(rows, title=None, since=None, until=None, min_price=None, max_price=None, limit=50):
+    tokens = tokenize(title or "")
+    until = until + "T23:59:59Z" if until and len(until) == 10 else until
+    found = []
+    for row in rows:
+        words = tokenize(row["title"])
+        if tokens and not all(any(word.startswith(token) for word in words) for token in tokens):
+            continue
+        if since and row["ends_at"] < since:
+            continue
+        if until and row["starts_at"] > until:
+            continue
+        if min_price is not None and row["original_amount"] < min_price:
+            continue
+        if max_price is not None and row["original_amount"] > max_price:
+            continue
+        found.append(row)
+    found.sort(key=lambda row: (row["starts_at"], row["rowid"]), reverse=True)
+    return found[:limit]
+
+
+QUERIES = {
+    "title_prefix": {"title": "holl drag"},
+    "date_range": {"since": "2021-03-01", "until": "2021-03-15"},
+    "price_range": {"min_price": 59.99, "max_price": 59.99},
+    "title_and_dates": {"title": "kingdom", "since": "2020-01-01", "until": "2020-12-31"},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--promotions", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    offers = make_promotions(args.promotions, args.seed)
+    results = {"promotions": args.promotions, "queries": {}}
+    with tempfile.TemporaryDirectory() as directory:
+        archive = PromotionArchive(Path(directory) / "archive.db")
+        started = time.perf_counter()
+        archive.record(offers)
+        results["record_s"] = round(time.perf_counter() - started, 2)
+        started = time.perf_counter()
+        archive.record(offers[:1000])
+        results["rerecord_1000_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+        rows = [dict(offer, rowid=i) for i, offer in enumerate(offers)]
+        queries = dict({"title_exact": {"title": offers[len(offers) // 2]["title"]}}, **QUERIES)
+        for name, query in queries.items():
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                found = archive.search(**query)
+            indexed_ms = (time.perf_counter() - started) * 1000 / args.repeat
+            started = time.perf_counter()
+            python_search(rows, **query)
+            scan_ms = (time.perf_counter() - started) * 1000
+            results["queries"][name] = {
+                "results": len(found),
+                "indexed_ms": round(indexed_ms, 3),
+                "full_scan_ms": round(scan_ms, 1),
+                "plan": archive.query_plan(**query),
+            }
+        archive.close()
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+freeGamesPromotions parsing benchmark
+
+Compares loading the whole payload with json.load and walking it against
+the streaming, projected parser in free_games.stream: wall time (best of
+--repeat) and peak traced memory, reading from a file. Uses --fixture if
+given (e.g. a saved response from the real endpoint), otherwise writes a
+synthetic payload of --offers elements shaped like the real one, with
+some non-ASCII titles. Checks both produce the same current and upcoming
+games, including with tiny chunks that split tokens and characters.
+
+Usage:
+    python benchmarks/bench_promotions_parse.py [--offers 10000] [--fixture payload.json]
+"""
+
+import argparse
+import gc
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from free_games import promotions, stream  # noqa: E402
+from standin_server import promotions_payload  # noqa: E402
+
+
+def full_parse(path, now):
+    with open(path, "rb") as f:
+        document = json.load(f)
+    return promotions.free_games(promotions.elements(document), now)
+
+
+def stream_parse(path, now, chunk_size):
+    with open(path, "rb") as f:
+        return stream.parse_free_games(f, now, chunk_size)
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 2)
+
+
+def peak_memory(function):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def write_fixture(path, offers):
+    document = promotions_payload(offers)
+    for i, element in enumerate(document["data"]["Catalog"]["searchStore"]["elements"][::7]):
+        element["title"] = f"Édition spéciale ✓ 🎮 {i}"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--offers", type=int, default=10000, help="elements in the synthetic payload")
+    parser.add_argument("--fixture", type=Path, help="parse this payload file instead")
+    parser.add_argument("--chunk-size", type=int, default=stream.CHUNK_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.fixture
+        if path is None:
+            path = Path(directory) / "freeGamesPromotions.json"
+            write_fixture(path, args.offers)
+
+        results = {"fixture": str(args.fixture) if args.fixture else "synthetic",
+                   "payload_bytes": path.stat().st_size}
+        expected = full_parse(path, now)
+        actual = stream_parse(path, now, args.chunk_size)
+        results["current"] = len(expected[0])
+        results["upcoming"] = len(expected[1])
+        results["results_match"] = actual == expected
+
+        if args.fixture is None:
+            small_path = Path(directory) / "small.json"
+            write_fixture(small_path, 60)
+            small = small_path.read_bytes()
+            results["small_chunks_match"] = all(
+                stream.parse_free_games(io.BytesIO(small), now, size) == full_parse(small_path, now)
+                for size in (1, 3, 7, 64))
+
+        results["full_load_ms"] = best_time(lambda: full_parse(path, now), args.repeat)
+        results["streaming_ms"] = best_time(lambda: stream_parse(path, now, args.chunk_size), args.repeat)
+        results["full_load_peak_bytes"] = peak_memory(lambda: full_parse(path, now))
+        results["streaming_peak_bytes"] = peak_memory(lambda: stream_parse(path, now, args.chunk_size))
+
+    results["speedup"] = round(results["full_load_ms"] / results["streaming_ms"], 2)
+    results["peak_memory_ratio"] = round(results["full_load_peak_bytes"] / results["streaming_peak_bytes"], 1)
+    print(json.dumps(results, indent=2))
+    ok = results["results_match"] and results.get("small_chunks_match", True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Download scheduler benchmark
+
+Queues downloads against the local stand-in server and drains them with
+DownloadScheduler under a global bandwidth limit. Reports the throughput
+achieved against the limit, how many retries the injected failures caused,
+and the mean completion position for each priority level. Completion,
+retries and priority order are checked by tests/test_scheduler.py.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--items 24] [--size-mb 2] [--limit-mb 16] [--workers 4]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from downloads.queue_manager import DownloadQueueManager  # noqa: E402
+from downloads.scheduler import DownloadScheduler  # noqa: E402
+from standin_server import StandinServer  # noqa: E402
+
+
+def run(items, size, limit, workers):
+    with StandinServer() as server, tempfile.TemporaryDirectory() as tmp:
+        queue = DownloadQueueManager(Path(tmp) / "download_queue.json", durable=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(items):
+                # Every fifth item fails once before succeeding
+                fail = 1 if i % 5 == 0 else 0
+                queue.add_to_queue(f"game-{i}", f"Game {i}", size, priority=i % 3,
+                                   url=f"{server.base_url}/files/game-{i}?size={size}&fail={fail}")
+
+        finished = []
+        queue.subscribe(lambda event: event.new_status == "completed" and finished.append(event.item.priority))
+
+        scheduler = DownloadScheduler(queue, Path(tmp) / "downloads", max_workers=workers,
+                                      bandwidth_limit=limit, backoff_base=0.05)
+        started = time.perf_counter()
+        scheduler.run_until_idle()
+        elapsed = time.perf_counter() - started
+
+        info = queue.get_queue_info()
+        transferred = info["completed"] * size
+        positions = {}
+        for position, priority in enumerate(finished):
+            positions.setdefault(priority, []).append(position)
+
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "limit_mb_s": limit / 1024 ** 2,
+            "achieved_mb_s": round(transferred / elapsed / 1024 ** 2, 2),
+            "completed": info["completed"],
+            "failed": sum(1 for item in info["items"] if item.status == "failed"),
+            "requests": sum(server.request_counts.values()),
+            "mean_finish_position_by_priority": {
+                str(p): round(statistics.mean(v), 1) for p, v in sorted(positions.items(), reverse=True)
+            },
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the download scheduler")
+    parser.add_argument("--items", type=int, default=24)
+    parser.add_argument("--size-mb", type=float, default=2)
+    parser.add_argument("--limit-mb", type=float, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    result = run(args.items, int(args.size_mb * 1024 ** 2), int(args.limit_mb * 1024 ** 2), args.workers)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Synthetic Epic Games library for benchmarks
+
+Writes a library shaped like a real launcher install into a directory:
+
+    <root>/Manifests/<InstallationGuid>.item   one launcher manifest per game
+    <root>/Games/<Folder>/.egstore/            the install, with its .mancpn
+    <root>/NewDrive/<Folder>/.egstore/         games that were moved elsewhere
+
+Manifests carry the fields the launcher writes plus an InstalledFiles list
+whose length and file sizes are configurable; InstallSize is their sum.
+Some installs are missing on disk, some games were copied to NewDrive (the
+case bulk_update_location repairs) and some manifests are broken, in the
+proportions given. Everything is derived from --seed, so a corpus can be
+rebuilt exactly to compare two versions.
+
+Usage as a script writes a corpus and prints its summary:
+    python benchmarks/manifest_corpus.py OUT_DIR [--games 1000] [--files 20:200]
+"""
+
+import argparse
+import json
+import random
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+WORDS = ["Dark", "Shadow", "Legend", "Quest", "Kingdom", "Star", "City", "Hollow", "Rogue", "Dragon",
+         "Empire", "Night", "Ocean", "Iron", "Sky", "Lost", "Tactics", "Racing", "Odyssey", "Frontier",
+         "Galaxy", "Ruins", "Crown", "Forge", "Tales", "Édition"]
+EXTENSIONS = [".pak", ".ucas", ".utoc", ".dll", ".exe", ".bin", ".json", ".bik"]
+
+
+@dataclass
+class Corpus:
+    """What generate_library wrote, for the benchmark to check against"""
+
+    root: Path
+    manifest_dir: Path
+    install_root: Path
+    moved_root: Path
+    display_names: List[str] = field(default_factory=list)  # of every valid manifest
+    app_names: List[str] = field(default_factory=list)
+    missing: int = 0  # valid manifests whose install folder does not exist
+    moved: int = 0  # installs also present under moved_root
+    broken: int = 0  # manifests the scanner must skip
+    installed_files: int = 0
+    install_bytes: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "root": str(self.root),
+            "manifests": len(self.display_names) + self.broken,
+            "valid": len(self.display_names),
+            "missing": self.missing,
+            "moved": self.moved,
+            "broken": self.broken,
+            "installed_files": self.installed_files,
+            "install_gb": round(self.install_bytes / 1024 ** 3, 1),
+        }
+
+
+def installed_files(rng: random.Random, count: int, size_range: Tuple[int, int]) -> List[Dict[str, Any]]:
+    """InstalledFiles entries with sizes drawn log-uniformly from size_range"""
+    low, high = size_range
+    files = []
+    for i in range(count):
+        size = int(low * (high / low) ** rng.random()) if high > low else low
+        folder = rng.choice(["Content/Paks", "Binaries/Win64", "Engine/Content", "Movies"])
+        files.append({
+            "Path": f"{folder}/file{i:05d}{rng.choice(EXTENSIONS)}",
+            "Size": size,
+            "Hash": f"{rng.getrandbits(160):040x}",
+        })
+    return files
+
+
+def make_manifest(rng: random.Random, index: int, install_root: Path, files: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One launcher .item document"""
+    title = " ".join(rng.sample(WORDS, rng.randint(1, 3))) + f" {index}"
+    folder = title.replace(" ", "")
+    app_name = f"{folder.lower()}{rng.getrandbits(24):06x}"
+    guid = uuid.UUID(int=rng.getrandbits(128)).hex.upper()
+    location = install_root / folder
+    return {
+        "FormatVersion": 0,
+        "bIsIncompleteInstall": rng.random() < 0.02,
+        "LaunchCommand": "",
+        "LaunchExecutable": f"{folder}.exe",
+        "ManifestLocation": str(location / ".egstore"),
+        "bIsApplication": True,
+        "bIsExecutable": True,
+        "bIsManaged": False,
+        "bNeedsValidation": rng.random() < 0.02,
+        "bRequiresAuth": True,
+        "bAllowMultipleInstances": False,
+        "bCanRunOffline": rng.random() < 0.5,
+        "AppCategories": ["public", "games", "applications"],
+        "DisplayName": title,
+        "InstallationGuid": guid,
+        "InstallLocation": str(location),
+        "InstallSessionId": uuid.UUID(int=rng.getrandbits(128)).hex.upper(),
+        "InstallTags": [],
+        "StagingLocation": str(location / ".egstore" / "bps"),
+        "InstallSize": sum(entry["Size"] for entry in files),
+        "MainWindowProcessName": "",
+        "CatalogNamespace": f"{rng.getrandbits(128):032x}",
+        "CatalogItemId": f"{rng.getrandbits(128):032x}",
+        "AppName": app_name,
+        "AppVersionString": f"{rng.randint(1, 9)}.{rng.randint(0, 40)}.{rng.randint(0, 999)}",
+        "MainGameCatalogNamespace": "",
+        "MainGameCatalogItemId": "",
+        "MainGameAppName": app_name,
+        "InstalledFiles": files,
+    }
+
+
+def generate_library(root: Path, games: int, files: Tuple[int, int] = (20, 200),
+                     file_size: Tuple[int, int] = (4 * 1024, 512 * 1024 ** 2), missing: float = 0.1,
+                     moved: float = 0.25, broken: float = 0.01, seed: int = 1) -> Corpus:
+    """Write a synthetic library of ``games`` manifests under ``root``.
+
+    Args:
+        root: Directory to write into; created if needed
+        games: Number of .item manifests
+        files: Range of InstalledFiles entries per game
+        file_size: Range of installed file sizes in bytes
+        missing: Fraction of games whose install folder is absent
+        moved: Fraction of installed games also present under NewDrive
+        broken: Fraction of manifests that are truncated or lack fields
+        seed: Seed for every random choice
+
+    Returns:
+        Corpus describing what was written
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    corpus = Corpus(root, root / "Manifests", root / "Games", root / "NewDrive")
+    for directory in (corpus.manifest_dir, corpus.install_root, corpus.moved_root):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    for index in range(games):
+        entries = installed_files(rng, rng.randint(*files), file_size)
+        manifest = make_manifest(rng, index, corpus.install_root, entries)
+        path = corpus.manifest_dir / f"{manifest['InstallationGuid']}.item"
+        text = json.dumps(manifest, indent=4, ensure_ascii=False)
+
+        if rng.random() < broken:
+            corpus.broken += 1
+            if rng.random() < 0.5:
+                text = text[: len(text) // 2]
+            else:
+                del manifest["InstallLocation"]
+                text = json.dumps(manifest, indent=4)
+            path.write_text(text, encoding="utf-8")
+            continue
+
+        path.write_text(text, encoding="utf-8")
+        corpus.display_names.append(manifest["DisplayName"])
+        corpus.app_names.append(manifest["AppName"])
+        corpus.installed_files += len(entries)
+        corpus.install_bytes += manifest["InstallSize"]
+
+        folder = Path(manifest["InstallLocation"]).name
+        if rng.random() < missing:
+            corpus.missing += 1
+            continue
+        mancpn = json.dumps({"FormatVersion": 0, "AppName": manifest["AppName"],
+                             "CatalogNamespace": manifest["CatalogNamespace"],
+                             "CatalogItemId": manifest["CatalogItemId"]})
+        targets = [corpus.install_root]
+        if rng.random() < moved:
+            corpus.moved += 1
+            targets.append(corpus.moved_root)
+        for base in targets:
+            egstore = base / folder / ".egstore"
+            egstore.mkdir(parents=True)
+            (egstore / f"{manifest['InstallationGuid']}.mancpn").write_text(mancpn, encoding="utf-8")
+    return corpus
+
+
+def parse_range(text: str) -> Tuple[int, int]:
+    low, _, high = text.partition(":")
+    return int(low), int(high or low)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic Epic Games library")
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--files", type=parse_range, default=(20, 200), help="InstalledFiles per game, MIN:MAX")
+    parser.add_argument("--file-size", type=parse_range, default=(4 * 1024, 512 * 1024 ** 2),
+                        help="installed file size in bytes, MIN:MAX")
+    parser.add_argument("--missing", type=float, default=0.1)
+    parser.add_argument("--moved", type=float, default=0.25)
+    parser.add_argument("--broken", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    corpus = generate_library(args.root, args.games, args.files, args.file_size, args.missing,
+                              args.moved, args.broken, args.seed)
+    print(json.dumps(corpus.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Local HTTP stand-in for the services Epic Games Manager talks to
+
+Runs a threaded HTTP server on 127.0.0.1 so the download scheduler and the
+HTTP clients can be exercised without touching Epic's servers.
+
+Built-in routes:
+    /files/<name>?size=N[&fail=K]   N deterministic bytes; the first K
+                                    requests for the path answer 503.
+                                    Honours Range requests.
+
+Further routes are added with StandinServer.add_route(path, handler), where
+handler(request) returns (status, headers, body_bytes). A path ending in "/"
+with prefix=True matches everything below it. ConditionalResource is such a
+handler for a document that answers conditional GETs with 304, and
+promotions_payload() builds a freeGamesPromotions-shaped document for it.
+
+Usage as a script serves until interrupted:
+    python benchmarks/standin_server.py [--port 8765]
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import socket
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def file_bytes(name: str, start: int, end: int) -> bytes:
+    """Deterministic content of /files/<name> between two offsets"""
+    pattern = hashlib.sha256(name.encode()).digest() * 128  # 4 KiB period
+    period = len(pattern)
+    length = end - start
+    offset = start % period
+    repeats = (offset + length) // period + 1
+    return (pattern * repeats)[offset:offset + length]
+
+
+def promotions_payload(offers: int = 12, free_every: int = 4, now: Optional[datetime] = None,
+                       description_size: int = 200) -> Dict[str, Any]:
+    """A freeGamesPromotions-shaped document with ``offers`` elements.
+
+    Every ``free_every``'th offer is free now, the one after it becomes free
+    in a week, and the rest are ordinary discounts.
+    """
+    now = now or datetime.now(timezone.utc)
+
+    def stamp(moment):
+        return moment.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    week = timedelta(days=7)
+    elements = []
+    for i in range(offers):
+        free_now = i % free_every == 0
+        free_next = i % free_every == 1
+        window = {"startDate": stamp(now - timedelta(days=1)), "endDate": stamp(now + week),
+                  "discountSetting": {"discountType": "PERCENTAGE",
+                                      "discountPercentage": 0 if free_now else 50}}
+        upcoming = {"startDate": stamp(now + week), "endDate": stamp(now + 2 * week),
+                    "discountSetting": {"discountType": "PERCENTAGE", "discountPercentage": 0}}
+        slug = f"game-{i:05d}"
+        elements.append({
+            "title": f"Game {i}",
+            "id": f"{i:032x}",
+            "namespace": f"ns{i:05d}",
+            "description": (f"Description of game {i}. " * (description_size // 24 + 1))[:description_size],
+            "effectiveDate": stamp(now - 30 * week),
+            "offerType": "BASE_GAME",
+            "status": "ACTIVE",
+            "isCodeRedemptionOnly": False,
+            "keyImages": [
+                {"type": "OfferImageWide", "url": f"https://cdn.example.invalid/{slug}/wide.jpg"},
+                {"type": "Thumbnail", "url": f"https://cdn.example.invalid/{slug}/thumb.jpg"},
+            ],
+            "seller": {"id": f"seller{i % 50}", "name": f"Publisher {i % 50}"},
+            "productSlug": None,
+            "urlSlug": slug,
+            "items": [{"id": f"{i:032x}", "namespace": f"ns{i:05d}"}],
+            "customAttributes": [{"key": "com.epicgames.app.productSlug", "value": slug}],
+            "categories": [{"path": "freegames"}, {"path": "games"}],
+            "tags": [{"id": str(1000 + i % 40)}],
+            "catalogNs": {"mappings": [{"pageSlug": slug, "pageType": "productHome"}]},
+            "offerMappings": [],
+            "price": {"totalPrice": {
+                "discountPrice": 0 if free_now else 999, "originalPrice": 1999 + i % 40 * 100,
+                "voucherDiscount": 0, "discount": 0, "currencyCode": "USD",
+                "currencyInfo": {"decimals": 2},
+                "fmtPrice": {"originalPrice": f"${(1999 + i % 40 * 100) / 100:.2f}",
+                             "discountPrice": "0" if free_now else "$9.99",
+                             "intermediatePrice": "0"}}},
+            "promotions": {
+                "promotionalOffers": [{"promotionalOffers": [window]}] if not free_next else [],
+                "upcomingPromotionalOffers": [{"promotionalOffers": [upcoming]}] if free_next else [],
+            },
+        })
+    return {"data": {"Catalog": {"searchStore": {
+        "elements": elements, "paging": {"count": offers, "total": offers}}}}, "extensions": {}}
+
+
+class ConditionalResource:
+    """Route handler for a document that supports conditional GETs.
+
+    Answers 304 when If-None-Match or If-Modified-Since match the current
+    version, and counts full and not-modified responses. ``update()``
+    publishes a new version.
+    """
+
+    def __init__(self, body: bytes, content_type: str = "application/json"):
+        self.content_type = content_type
+        self.full_responses = 0
+        self.not_modified = 0
+        self.failing = False
+        self._lock = threading.Lock()
+        self.update(body)
+
+    def update(self, body: bytes):
+        with self._lock:
+            self.body = body
+            self.etag = '"%s"' % hashlib.sha1(body).hexdigest()
+            self.last_modified = formatdate(usegmt=True)
+
+    def __call__(self, request) -> Response:
+        if self.failing:
+            return 503, {}, b"unavailable"
+        with self._lock:
+            body, etag, last_modified = self.body, self.etag, self.last_modified
+            validators = {"ETag": etag, "Last-Modified": last_modified}
+            if_none_match = request.headers.get("If-None-Match")
+            if (if_none_match == etag if if_none_match is not None
+                    else request.headers.get("If-Modified-Since") == last_modified):
+                self.not_modified += 1
+                return 304, validators, b""
+            self.full_responses += 1
+        return 200, dict(validators, **{"Content-Type": self.content_type}), body
+
+    @classmethod
+    def json(cls, document: Any) -> "ConditionalResource":
+        return cls(json.dumps(document).encode())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle's
+        # algorithm and delayed ACKs add ~40ms to every keep-alive response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # One handler instance serves every request on a keep-alive connection
+        with self.server.standin._lock:
+            self.server.standin.connection_count += 1
+
+    def do_GET(self):
+        self.server.standin.handle(self)
+
+    def do_HEAD(self):
+        self.server.standin.handle(self, head=True)
+
+
+class StandinServer:
+    """Threaded local HTTP server with pluggable routes"""
+
+    def __init__(self, port: int = 0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.standin = self
+        self.routes: Dict[str, Callable] = {}
+        self.prefix_routes: Dict[str, Callable] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_route(self, path: str, handler: Callable, prefix: bool = False):
+        """Serve handler(request) -> (status, headers, body) at a path.
+
+        With prefix=True the handler serves every path starting with ``path``.
+        """
+        if prefix:
+            self.prefix_routes[path] = handler
+        else:
+            self.routes[path] = handler
+
+    def _route(self, path: str):
+        if path in self.routes:
+            return self.routes[path]
+        for prefix, handler in self.prefix_routes.items():
+            if path.startswith(prefix):
+                return handler
+        return None
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def handle(self, request, head=False):
+        url = urlparse(request.path)
+        with self._lock:
+            count = self.request_counts.get(url.path, 0) + 1
+            self.request_counts[url.path] = count
+
+        route = self._route(url.path)
+        if route is not None:
+            status, headers, body = route(request)
+        elif url.path.startswith("/files/"):
+            status, headers, body = self._serve_file(request, url, count)
+        else:
+            status, headers, body = 404, {}, b"not found"
+
+        request.send_response(status)
+        headers.setdefault("Content-Length", str(len(body)))
+        for key, value in headers.items():
+            request.send_header(key, value)
+        request.end_headers()
+        if not head:
+            try:
+                request.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    def _serve_file(self, request, url, count) -> Response:
+        query = parse_qs(url.query)
+        name = url.path[len("/files/"):]
+        size = int(query.get("size", ["1048576"])[0])
+        if count <= int(query.get("fail", ["0"])[0]):
+            return 503, {}, b"try again"
+
+        headers = {"Accept-Ranges": "bytes", "ETag": f'"{name}-{size}"'}
+        match = re.match(r"bytes=(\d+)-(\d*)$", request.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = min(size, int(match.group(2)) + 1) if match.group(2) else size
+            if start >= size:
+                return 416, {"Content-Range": f"bytes */{size}"}, b""
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+            return 206, headers, file_bytes(name, start, end)
+        return 200, headers, file_bytes(name, 0, size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local HTTP stand-in server")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    server = StandinServer(args.port)
+    print(f"Serving on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
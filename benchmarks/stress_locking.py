@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Cross-process locking stress test
+
+Starts several processes that hammer the same config, license and download
+queue files at once, the way the GUI and CLI do when both are open, then
+checks that no update was lost and every file still parses. HOME and
+APPDATA point at a temporary directory, so real settings are never touched.
+tests/test_locking.py runs a small version of this with pytest.
+
+Usage:
+    python benchmarks/stress_locking.py [--processes 8] [--ops 50]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = str(Path(__file__).resolve().parent.parent / "src")
+sys.path.insert(0, SRC_DIR)
+
+
+def worker(index, ops, queue_file, start):
+    """One competing process: interleave config, license and queue changes"""
+    sys.path.insert(0, SRC_DIR)
+    from core.config import Config
+    from core.license import LicenseValidator
+    from downloads.queue_manager import DownloadQueueManager
+
+    sys.stdout = open(os.devnull, "w")  # The queue manager prints every add
+    start.wait()
+    config = Config()
+    license_validator = LicenseValidator()
+    queue = DownloadQueueManager(queue_file=Path(queue_file), durable=False)
+    for op in range(ops):
+        config.set(f"worker{index}_key{op}", op)
+        config.add_game_directory(f"/games/{index}/{op}")
+        queue.add_to_queue(f"game-{index}-{op}", f"Game {index}/{op}", size_bytes=op)
+        if op % 5 == 0:
+            license_validator.activate(f"EPIC-PRO-{index:04d}-{op:08d}")
+            license_validator.get_tier()
+        if op % 7 == 0:
+            claimed = queue.claim_next_download()
+            if claimed is not None:
+                queue.update_status(claimed.game_id, 'completed')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=50, help="changes per process")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        os.environ["HOME"] = home
+        os.environ["APPDATA"] = home
+        queue_file = Path(home) / "queue" / "download_queue.json"
+        queue_file.parent.mkdir()
+
+        ctx = multiprocessing.get_context("spawn")
+        start = ctx.Event()
+        processes = [ctx.Process(target=worker, args=(i, args.ops, str(queue_file), start))
+                     for i in range(args.processes)]
+        for process in processes:
+            process.start()
+        started = time.perf_counter()
+        start.set()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+        from core.config import Config
+        from core.license import LicenseValidator
+        from downloads.queue_manager import DownloadQueueManager
+
+        config = Config()
+        with open(config.config_file) as f:
+            raw_config = json.load(f)
+        expected = args.processes * args.ops
+        keys = [k for k in raw_config if k.startswith("worker")]
+        directories = raw_config.get("game_directories", [])
+        with open(LicenseValidator().license_file) as f:
+            license_ok = json.load(f).get("tier") == "pro"
+
+        info = DownloadQueueManager(queue_file=queue_file, durable=False).get_queue_info(include_items=False)
+
+        results = {
+            "processes": args.processes,
+            "ops_per_process": args.ops,
+            "elapsed_s": round(elapsed, 3),
+            "worker_exit_codes": sorted({p.exitcode for p in processes}),
+            "config_keys": {"expected": expected, "found": len(keys)},
+            "game_directories": {"expected": expected, "found": len(set(directories))},
+            "queue_items": {"expected": expected, "found": info["total_items"]},
+            "queue_by_status": info["by_status"],
+            "license_readable": license_ok,
+        }
+        ok = (results["worker_exit_codes"] == [0]
+              and len(keys) == expected
+              and len(set(directories)) == expected
+              and info["total_items"] == expected
+              and license_ok)
+        results["ok"] = ok
+        print(json.dumps(results, indent=2))
+        return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -37,6 +37,8 @@ def build_exe():
         "--onefile",  # Single executable
         "--windowed",  # GUI application (no console)
         "--clean",
+        # Shared library code imported by the GUI
+        "--paths", str(PROJECT_ROOT / "src"),
         # Hidden imports
         "--hidden-import", "tkinter",
         "--hidden-import", "psutil",
@@ -9,23 +9,89 @@ A modern Python GUI application to update Epic Games manifest files
 after moving your game installations to a new location.
 """
 
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
-import json
+import logging
 import os
 import sys
-import subprocess
 import time
 import threading
 from pathlib import Path
 from datetime import datetime
-import psutil
+
+# The tkinter stack and psutil are imported on first use rather than at module
+# load, so importing this module (PyInstaller analysis, tooling, the startup
+# benchmark) stays cheap and the splash can be painted as early as possible.
+tk = ttk = filedialog = messagebox = scrolledtext = None
+
+WINDOW_WIDTH = 800
+WINDOW_HEIGHT = 600
+
+# The activity log is redrawn in batches and keeps only the newest lines
+LOG_FLUSH_MS = 100
+MAX_LOG_LINES = 5000
+
+# Share the Epic Games Manager library code under src/ (bundled via --paths
+# in build_exe.py for the standalone executable)
+SRC_DIR = Path(__file__).resolve().parent / "src"
+if SRC_DIR.is_dir() and str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+def load_tk():
+    """Import the tkinter modules used by the GUI into this module's namespace"""
+    global tk, ttk, filedialog, messagebox, scrolledtext
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as _ttk, filedialog as _filedialog
+        from tkinter import messagebox as _messagebox, scrolledtext as _scrolledtext
+        ttk, filedialog = _ttk, _filedialog
+        messagebox, scrolledtext = _messagebox, _scrolledtext
+        tk = tkinter
+
+
+class LogBuffer:
+    """Log lines waiting to be shown, filled from any thread.
+    
+    Worker threads only append; the Tk thread drains everything pending in
+    one go, so a burst of lines costs a single widget update.
+    """
+    
+    def __init__(self):
+        self._lines = []
+        self._lock = threading.Lock()
+        
+    def append(self, line):
+        with self._lock:
+            self._lines.append(line)
+            
+    def drain(self):
+        """All pending lines as one string, oldest first ('' if none)"""
+        with self._lock:
+            lines, self._lines = self._lines, []
+        return "".join(lines)
+
+
+class ActivityLogHandler(logging.Handler):
+    """Forwards library log records to the activity log.
+    
+    The library code rate-limits its per-game records with LoopLog and ends
+    each batch with summary lines, so the activity log gets the same view.
+    """
+    
+    def __init__(self, log_message):
+        super().__init__(logging.INFO)
+        self.log_message = log_message
+        
+    def emit(self, record):
+        level = "SUCCESS" if getattr(record, 'category', None) == 'updated' else record.levelname
+        self.log_message(record.getMessage(), level)
+
 
 class EpicManifestUpdater:
     def __init__(self, root):
+        load_tk()
         self.root = root
         self.root.title("Epic Games Manifest Updater v2.0")
-        self.root.geometry("800x600")
+        self.root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         self.root.resizable(True, True)
         
         # Set icon if available
@@ -41,6 +107,7 @@ class EpicManifestUpdater:
         # Variables
         self.selected_path = tk.StringVar()
         self.is_processing = False
+        self.log_buffer = LogBuffer()
         
         # Create GUI
         self.create_widgets()
@@ -48,11 +115,17 @@ class EpicManifestUpdater:
         # Center window
         self.center_window()
         
+        self.root.after(LOG_FLUSH_MS, self.flush_log)
+        
     def center_window(self):
         """Center the window on screen"""
         self.root.update_idletasks()
-        width = self.root.winfo_width()
-        height = self.root.winfo_height()
+        if self.root.winfo_ismapped():
+            width = self.root.winfo_width()
+            height = self.root.winfo_height()
+        else:
+            # Built while the splash is showing; the window has no real size yet
+            width, height = WINDOW_WIDTH, WINDOW_HEIGHT
         pos_x = (self.root.winfo_screenwidth() // 2) - (width // 2)
         pos_y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f"{width}x{height}+{pos_x}+{pos_y}")
@@ -116,9 +189,12 @@ class EpicManifestUpdater:
         self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
         self.progress.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=10)
         
-        # Log area
-        log_frame = ttk.LabelFrame(main_frame, text="Activity Log", padding="10")
-        log_frame.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
+        # Log and library tabs
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.grid(row=5, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=10)
+        
+        log_frame = ttk.Frame(self.notebook, padding="10")
+        self.notebook.add(log_frame, text="Activity Log")
         log_frame.columnconfigure(0, weight=1)
         log_frame.rowconfigure(0, weight=1)
         
@@ -126,6 +202,11 @@ class EpicManifestUpdater:
                                                  font=("Consolas", 9))
         self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        # Library table, scanned the first time its tab is opened
+        self.library_view = LibraryView(self.notebook)
+        self.notebook.add(self.library_view.frame, text="Library")
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        
         # Status bar
         self.status_var = tk.StringVar(value="Ready")
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, 
@@ -136,14 +217,30 @@ class EpicManifestUpdater:
         self.log_message("Epic Games Manifest Updater initialized", "INFO")
         self.log_message("Select your new games folder to begin", "INFO")
         
+    def on_tab_changed(self, event=None):
+        """Load the library the first time its tab is shown"""
+        if self.notebook.select() == str(self.library_view.frame):
+            self.library_view.load()
+            
     def log_message(self, message, level="INFO"):
-        """Add a message to the log with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {level}: {message}\n"
+        """Add a message to the log with timestamp
         
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)
-        self.root.update_idletasks()
+        Safe to call from worker threads; the line is shown by the next
+        flush_log on the Tk thread.
+        """
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        self.log_buffer.append(f"[{timestamp}] {level}: {message}\n")
+        
+    def flush_log(self):
+        """Show the pending log lines in one update, then reschedule"""
+        text = self.log_buffer.drain()
+        if text:
+            self.log_text.insert(tk.END, text)
+            lines = int(self.log_text.index("end-1c").split(".")[0])
+            if lines > MAX_LOG_LINES:
+                self.log_text.delete("1.0", f"{lines - MAX_LOG_LINES + 1}.0")
+            self.log_text.see(tk.END)
+        self.root.after(LOG_FLUSH_MS, self.flush_log)
         
     def browse_folder(self):
         """Open folder browser dialog"""
@@ -188,6 +285,8 @@ class EpicManifestUpdater:
         
     def close_epic_games(self):
         """Close Epic Games Launcher processes"""
+        import psutil
+
         self.log_message("Attempting to close Epic Games Launcher...", "INFO")
         processes_to_close = ["EpicGamesLauncher", "EpicWebHelper", "UnrealEngineLauncher"]
         closed_count = 0
@@ -210,17 +309,10 @@ class EpicManifestUpdater:
             
     def find_manifests_directory(self):
         """Find the Epic Games manifests directory"""
-        possible_paths = [
-            "C:\\ProgramData\\Epic\\EpicGamesLauncher\\Data\\Manifests",
-            os.path.expanduser("~\\AppData\\Local\\EpicGamesLauncher\\Saved\\Config\\Windows"),
-            "D:\\ProgramData\\Epic\\EpicGamesLauncher\\Data\\Manifests",
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-                
-        return None
+        from core.discovery import find_manifest_directory
+        
+        path = find_manifest_directory()
+        return str(path) if path else None
         
     def start_update_process(self):
         """Start the manifest update process in a separate thread"""
@@ -264,52 +356,29 @@ class EpicManifestUpdater:
                 
             self.log_message(f"Found {len(manifest_files)} manifest files", "INFO")
             
-            update_count = 0
-            error_count = 0
+            # The manager holds the manifest lock for the whole batch, backs up
+            # each manifest and replaces it atomically
+            from library.manifest import ManifestManager
+            from library.scanner import LibraryScanner
             
-            for manifest_file in manifest_files:
-                try:
-                    manifest_path = os.path.join(manifests_dir, manifest_file)
-                    
-                    # Read and parse JSON
-                    with open(manifest_path, 'r', encoding='utf-8') as f:
-                        content = json.load(f)
-                    
-                    old_path = content.get('InstallLocation', '')
-                    if not old_path:
-                        continue
-                        
-                    # Extract game name from old path
-                    game_name = os.path.basename(old_path.rstrip('\\'))
-                    new_path = os.path.join(new_location, game_name)
-                    
-                    # Check if game folder exists in new location
-                    if os.path.exists(new_path) and old_path != new_path:
-                        # Update the paths
-                        content['InstallLocation'] = new_path
-                        content['ManifestLocation'] = os.path.join(new_path, '.egstore')
-                        content['StagingLocation'] = os.path.join(new_path, '.egstore', 'bps')
-                        
-                        # Write back to file
-                        with open(manifest_path, 'w', encoding='utf-8') as f:
-                            json.dump(content, f, indent=2)
-                            
-                        self.log_message(f"✓ Updated: {game_name}", "SUCCESS")
-                        update_count += 1
-                    else:
-                        if not os.path.exists(new_path):
-                            self.log_message(f"⚠ Game folder not found: {game_name}", "WARNING")
-                        
-                except Exception as e:
-                    self.log_message(f"✗ Error processing {manifest_file}: {str(e)}", "ERROR")
-                    error_count += 1
+            # Show the per-game records and the 'updated', 'skipped' and
+            # 'failed' summaries the library logs for the batch
+            library_logger = logging.getLogger("library")
+            handler = ActivityLogHandler(self.log_message)
+            previous_level = library_logger.level
+            library_logger.addHandler(handler)
+            library_logger.setLevel(logging.INFO)
+            try:
+                manager = ManifestManager(LibraryScanner(Path(manifests_dir)))
+                updated, failed = manager.bulk_update_location(Path(new_location))
+            finally:
+                library_logger.removeHandler(handler)
+                library_logger.setLevel(previous_level)
+            update_count = len(updated)
                     
             # Summary
             self.log_message("=" * 50, "INFO")
             self.log_message(f"UPDATE COMPLETE!", "SUCCESS")
-            self.log_message(f"Successfully updated: {update_count} manifest(s)", "SUCCESS")
-            if error_count > 0:
-                self.log_message(f"Errors encountered: {error_count}", "WARNING")
             self.log_message("You can now start Epic Games Launcher", "SUCCESS")
             
             # Show completion dialog
@@ -328,10 +397,252 @@ class EpicManifestUpdater:
             self.status_var.set("Ready")
 
 
+class LibraryView:
+    """Sortable, filterable table of the installed library.
+    
+    Only the rows that fit on screen exist as Treeview items. Scrolling and
+    filtering rebind those few items to different games, so the cost of a
+    redraw does not depend on the size of the library.
+    """
+    
+    ROW_HEIGHT = 20
+    HEADING_HEIGHT = 24
+    FILTER_DELAY_MS = 120
+    COLUMNS = (
+        ("name", "Name", 420),
+        ("size", "Size", 110),
+        ("status", "Status", 110),
+    )
+    
+    def __init__(self, parent):
+        load_tk()
+        self.rows = []          # (name, size_bytes, status, name_lower) per game
+        self.view = []          # rows matching the filter, in sort order
+        self.offset = 0
+        self.visible_count = 0
+        self.sort_column = "name"
+        self.sort_descending = False
+        self.applied_filter = ""
+        self.loaded = False
+        self._loading = False
+        self._load_result = None
+        self._filter_job = None
+        self.visible = []       # rows bound to the pooled items, top to bottom
+        self.selected_name = None
+        
+        self.frame = ttk.Frame(parent, padding="10")
+        self.frame.columnconfigure(1, weight=1)
+        self.frame.rowconfigure(1, weight=1)
+        
+        ttk.Label(self.frame, text="Filter:").grid(row=0, column=0, sticky=tk.W)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", self.on_filter_changed)
+        ttk.Entry(self.frame, textvariable=self.filter_var).grid(
+            row=0, column=1, sticky=(tk.W, tk.E), padx=(10, 10), pady=(0, 5))
+        ttk.Button(self.frame, text="Refresh", command=lambda: self.load(force=True)).grid(
+            row=0, column=2, pady=(0, 5))
+        
+        style = ttk.Style()
+        style.configure("Library.Treeview", rowheight=self.ROW_HEIGHT)
+        self.tree = ttk.Treeview(self.frame, columns=[c[0] for c in self.COLUMNS],
+                                 show="headings", selectmode="browse",
+                                 style="Library.Treeview")
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading,
+                              command=lambda c=column: self.sort_by(c))
+            self.tree.column(column, width=width, anchor=tk.W if column == "name" else tk.E,
+                             stretch=(column == "name"))
+        self.tree.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.grid(row=1, column=3, sticky=(tk.N, tk.S))
+        
+        self.count_var = tk.StringVar(value="")
+        ttk.Label(self.frame, textvariable=self.count_var).grid(
+            row=2, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+        
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.offset + 3))
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.offset - self.visible_count))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.offset + self.visible_count))
+        
+    def load(self, force=False):
+        """Scan the library in the background and show the result"""
+        if self._loading or (self.loaded and not force):
+            return
+        self._loading = True
+        self.count_var.set("Scanning library...")
+        
+        thread = threading.Thread(target=self._scan_library)
+        thread.daemon = True
+        thread.start()
+        self.frame.after(100, self._poll_load)
+        
+    def _scan_library(self):
+        """Build the table rows off the UI thread"""
+        try:
+            from library.scanner import LibraryScanner
+            
+            rows = []
+            for game in LibraryScanner().scan_manifests():
+                status = "Installed" if game.is_installed() else "Missing"
+                rows.append((game.display_name, game.install_size or 0, status,
+                             game.display_name.lower()))
+            self._load_result = rows
+        except Exception as e:
+            self._load_result = e
+            
+    def _poll_load(self):
+        """Pick up the scan result on the UI thread"""
+        if self._load_result is None:
+            self.frame.after(100, self._poll_load)
+            return
+        result, self._load_result = self._load_result, None
+        self._loading = False
+        if isinstance(result, Exception):
+            self.count_var.set(f"Could not scan library: {result}")
+            return
+        self.loaded = True
+        self.set_rows(result)
+        
+    def set_rows(self, rows):
+        """Replace the table contents"""
+        self.rows = rows
+        self._sort_rows()
+        self.applied_filter = ""
+        self.apply_filter()
+        
+    def _sort_key(self):
+        if self.sort_column == "size":
+            return lambda row: (row[1], row[3])
+        if self.sort_column == "status":
+            return lambda row: (row[2], row[3])
+        return lambda row: row[3]
+        
+    def _sort_rows(self):
+        self.rows.sort(key=self._sort_key(), reverse=self.sort_descending)
+        
+    def sort_by(self, column):
+        """Sort by a column, toggling direction when it is already the sort column"""
+        if column == self.sort_column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        self._sort_rows()
+        self.view.sort(key=self._sort_key(), reverse=self.sort_descending)
+        self.scroll_to(0)
+        
+    def on_filter_changed(self, *args):
+        """Apply the filter once typing pauses"""
+        if self._filter_job is not None:
+            self.frame.after_cancel(self._filter_job)
+        self._filter_job = self.frame.after(self.FILTER_DELAY_MS, self.apply_filter)
+        
+    def apply_filter(self):
+        """Narrow the view to games whose name contains the filter text"""
+        self._filter_job = None
+        text = self.filter_var.get().strip().lower()
+        if not text:
+            self.view = list(self.rows)
+        else:
+            # Typing more characters can only narrow the previous result
+            if self.applied_filter and text.startswith(self.applied_filter):
+                source = self.view
+            else:
+                source = self.rows
+            self.view = [row for row in source if text in row[3]]
+        self.applied_filter = text
+        self.scroll_to(0)
+        
+    def on_resize(self, event):
+        """Keep exactly enough Treeview items to fill the visible area"""
+        count = max(1, (event.height - self.HEADING_HEIGHT) // self.ROW_HEIGHT)
+        if count != self.visible_count:
+            self.visible_count = count
+            self.scroll_to(self.offset)
+            
+    def on_mousewheel(self, event):
+        if sys.platform == "darwin":
+            # macOS reports a few units per notch or trackpad step, not multiples of 120
+            steps = (event.delta > 0) - (event.delta < 0)
+        else:
+            steps = int(event.delta / 120)
+        self.scroll_to(self.offset - steps * 3)
+        
+    def on_select(self, event):
+        """Remember the selected game, since its pooled item shows another game after scrolling"""
+        selection = self.tree.selection()
+        if not selection:
+            return  # cleared by _render because the game scrolled out of view
+        index = int(selection[0][len("row"):])
+        if index < len(self.visible):
+            self.selected_name = self.visible[index][0]
+        
+    def on_scrollbar(self, action, value, unit=None):
+        """Translate scrollbar commands into a row offset"""
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.view)))
+        elif action == "scroll":
+            step = self.visible_count if unit == "pages" else 1
+            self.scroll_to(self.offset + int(value) * step)
+            
+    def scroll_to(self, offset):
+        """Show the rows starting at the given offset"""
+        total = len(self.view)
+        self.offset = max(0, min(offset, total - self.visible_count))
+        self._render()
+        
+        if total:
+            first = self.offset / total
+            last = min(1.0, (self.offset + self.visible_count) / total)
+            self.scrollbar.set(first, last)
+            self.count_var.set(f"{total:,} of {len(self.rows):,} games")
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            if self.loaded:
+                self.count_var.set(f"0 of {len(self.rows):,} games")
+                
+    def _render(self):
+        """Rebind the pooled Treeview items to the rows in view"""
+        visible = self.view[self.offset:self.offset + self.visible_count]
+        items = self.tree.get_children()
+        
+        for index in range(len(items), len(visible)):
+            self.tree.insert("", tk.END, iid=f"row{index}")
+        for iid in items[len(visible):]:
+            self.tree.delete(iid)
+            
+        selected = None
+        for index, (name, size, status, _) in enumerate(visible):
+            self.tree.item(f"row{index}", values=(name, self.format_size(size), status))
+            if name == self.selected_name:
+                selected = f"row{index}"
+        self.visible = visible
+        
+        # Keep the selection on the game rather than on the pooled item
+        current = self.tree.selection()
+        if selected is not None:
+            if current != (selected,):
+                self.tree.selection_set(selected)
+        elif current:
+            self.tree.selection_remove(*current)
+            
+    @staticmethod
+    def format_size(size_bytes):
+        if size_bytes >= 1024 ** 3:
+            return f"{size_bytes / 1024 ** 3:.1f} GB"
+        return f"{size_bytes / 1024 ** 2:.0f} MB"
+
+
 class SplashScreen:
     """Show a splash screen while the app loads"""
-    def __init__(self):
-        self.splash = tk.Toplevel()
+    def __init__(self, root=None):
+        load_tk()
+        self.splash = tk.Toplevel(root)
         self.splash.title("")
         self.splash.geometry("400x300")
         self.splash.resizable(False, False)
@@ -344,11 +655,9 @@ class SplashScreen:
         self.center_splash()
         
         # Create splash content
+        self._animation_id = None
         self.create_splash_content()
         
-        # Auto-close after 3 seconds
-        self.splash.after(3000, self.close_splash)
-        
     def center_splash(self):
         """Center the splash screen"""
         self.splash.update_idletasks()
@@ -381,7 +690,7 @@ class SplashScreen:
         self.loading_label.pack(pady=20)
         
         # Start loading animation
-        self.animate_loading()
+        self._animation_id = self.splash.after(200, self.animate_loading)
         
     def animate_loading(self):
         """Animate the loading text"""
@@ -395,26 +704,45 @@ class SplashScreen:
         elif current_text == "Loading..":
             self.loading_label.config(text="Loading...")
             
-        self.splash.after(200, self.animate_loading)
+        self._animation_id = self.splash.after(200, self.animate_loading)
         
     def close_splash(self):
         """Close the splash screen"""
+        if self._animation_id is not None:
+            self.splash.after_cancel(self._animation_id)
+            self._animation_id = None
         self.splash.destroy()
 
 
-def main():
-    """Main application entry point"""
+def main(argv=None):
+    """Main application entry point
+
+    Pass ``--startup-check`` to print the time taken until the main window is
+    shown and exit immediately; ``benchmarks/bench_gui_startup.py`` uses it to
+    time both the script and the PyInstaller build.
+    """
+    started = time.perf_counter()
+    argv = sys.argv[1:] if argv is None else argv
+    load_tk()
+    
     # Create root window (hidden initially)
     root = tk.Tk()
     root.withdraw()  # Hide main window
     
-    # Show splash screen
-    splash = SplashScreen()
-    root.wait_window(splash.splash)  # Wait for splash to close
+    # Show splash screen and paint it before doing any real work
+    splash = SplashScreen(root)
+    splash.splash.update()
     
-    # Show main window
-    root.deiconify()
+    # Build the main window behind the splash, then swap them over
     app = EpicManifestUpdater(root)
+    splash.close_splash()
+    root.deiconify()
+    
+    if "--startup-check" in argv:
+        def report_ready():
+            print(f"startup_seconds={time.perf_counter() - started:.4f}", flush=True)
+            root.destroy()
+        root.after_idle(report_ready)
     
     # Start the application
     root.mainloop()
@@ -0,0 +1,80 @@
+"""Streaming export of achievement data"""
+
+import csv
+import json
+import logging
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional, TextIO, Union
+
+from .store import AchievementStore
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+EXPORT_FIELDS = ['game_id', 'game_name', 'achievement_id', 'name', 'description',
+                 'rarity', 'unlocked', 'unlock_date']
+
+
+class AchievementExporter:
+    """Writes achievements from the store row by row as CSV or JSON Lines.
+
+    Rows are streamed from AchievementStore.iter_achievements and written as
+    they are read, so memory use does not depend on the size of the export.
+    """
+
+    def __init__(self, store: AchievementStore):
+        self.store = store
+
+    def export(self, destination: Union[Path, str, TextIO], format: str = 'csv',
+               game_ids: Optional[Iterable[str]] = None,
+               since: Optional[str] = None, until: Optional[str] = None) -> int:
+        """Export achievements.
+
+        Args:
+            destination: File path, '-' for stdout, or an open text stream
+            format: 'csv' or 'jsonl'
+            game_ids: Only these games
+            since: Only achievements unlocked on or after this ISO date
+            until: Only achievements unlocked on or before this ISO date
+
+        Returns:
+            Number of achievements written
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format {format!r}; use one of {', '.join(EXPORT_FORMATS)}")
+
+        rows = self.store.iter_achievements(game_ids=game_ids, since=since, until=until)
+        count = 0
+        with self._open(destination) as out:
+            if format == 'csv':
+                writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                for row in rows:
+                    row['unlocked'] = bool(row['unlocked'])
+                    writer.writerow(row)
+                    count += 1
+            else:
+                for row in rows:
+                    row['unlocked'] = bool(row['unlocked'])
+                    out.write(json.dumps({field: row[field] for field in EXPORT_FIELDS},
+                                         ensure_ascii=False))
+                    out.write('\n')
+                    count += 1
+        logger.info("Exported %d achievement(s) as %s", count, format)
+        return count
+
+    @staticmethod
+    @contextmanager
+    def _open(destination: Union[Path, str, TextIO]):
+        if hasattr(destination, 'write'):
+            yield destination
+        elif str(destination) == '-':
+            yield sys.stdout
+        else:
+            with open(destination, 'w', encoding='utf-8', newline='') as f:
+                yield f
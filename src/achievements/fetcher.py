@@ -0,0 +1,216 @@
+"""Concurrent, batched fetching of achievement data"""
+
+import asyncio
+import http.client
+import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import quote, urlencode, urlsplit
+
+from core.http import ConnectionPool
+
+from .store import AchievementStore
+from .sync import AchievementSource, AchievementSync, SyncBatch
+
+logger = logging.getLogger(__name__)
+
+
+class AchievementFetchError(Exception):
+    """Raised when the achievement service answers with an error"""
+
+    def __init__(self, message: str, retryable: bool = True, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class HttpAchievementSource(AchievementSource):
+    """Achievement service reached over HTTP.
+
+    ``GET {base_url}/games`` lists games as ``{"games": [...]}``, and
+    ``GET {base_url}/achievements/<game_id>?since=<token>`` returns a batch
+    as ``{"name", "achievements", "token", "full"}``.
+    """
+
+    def __init__(self, base_url: str, pool: Optional[ConnectionPool] = None, timeout: float = 15.0):
+        self.base_url = base_url.rstrip('/')
+        self.pool = pool or ConnectionPool(timeout=timeout)
+        self.host = urlsplit(self.base_url).netloc
+
+    def _get_json(self, path: str, params: Optional[Dict[str, str]] = None) -> Any:
+        url = self.base_url + path
+        if params:
+            url += '?' + urlencode(params)
+        status, headers, body = self.pool.request('GET', url, {'Accept': 'application/json'})
+        if status != 200:
+            retry_after = headers.get('Retry-After')
+            raise AchievementFetchError(
+                f"HTTP {status} for {url}",
+                retryable=status >= 500 or status in (408, 429),
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None)
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise AchievementFetchError(f"Invalid JSON from {url}: {e}") from e
+
+    def list_games(self) -> List[Dict[str, str]]:
+        return self._get_json('/games').get('games', [])
+
+    def fetch_changes(self, game_id: str, since: Optional[str] = None) -> SyncBatch:
+        payload = self._get_json(f"/achievements/{quote(game_id, safe='')}",
+                                 {'since': since} if since else None)
+        return SyncBatch(game_id=game_id, name=payload.get('name', game_id),
+                         achievements=payload.get('achievements', []),
+                         token=payload.get('token', since),
+                         full=payload.get('full', since is None))
+
+
+class HostRateLimiter:
+    """Token bucket per host for asyncio tasks.
+
+    Each host gets ``rate`` requests per second with bursts up to ``burst``;
+    tasks for a busy host wait without blocking requests to other hosts.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._clock = clock
+        self._buckets: Dict[str, List[float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, host: str):
+        """Wait until a request to ``host`` is allowed"""
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            bucket = self._buckets.setdefault(host, [self.burst, self._clock()])
+            while True:
+                now = self._clock()
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+                if bucket[0] >= 1.0:
+                    bucket[0] -= 1.0
+                    return
+                await asyncio.sleep((1.0 - bucket[0]) / self.rate)
+
+
+class BatchAchievementFetcher:
+    """Fetches achievements for many games at once and stores them as they arrive.
+
+    Requests run concurrently up to ``concurrency`` at a time, limited per
+    host by a HostRateLimiter, and failed requests are retried with
+    exponential backoff. The blocking source and store calls run on a thread
+    pool, so any AchievementSource works; HttpAchievementSource shares
+    keep-alive connections across those threads.
+    """
+
+    def __init__(self, store: AchievementStore, source: AchievementSource,
+                 concurrency: int = 8, requests_per_second: float = 10.0,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0):
+        """Initialize the fetcher.
+
+        Args:
+            store: Store the results are written to
+            source: Where achievements are fetched from
+            concurrency: Requests in flight at once
+            requests_per_second: Limit per host
+            max_retries: Retries after the first failed request of a game
+            backoff_base: Delay before the first retry in seconds
+            backoff_max: Upper bound on the retry delay in seconds
+        """
+        self.store = store
+        self.source = source
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.host = getattr(source, 'host', '')
+
+    def fetch_all(self, game_ids: Optional[Iterable[str]] = None, full: bool = False) -> Dict[str, int]:
+        """Blocking wrapper around fetch_many for callers without an event loop"""
+        if game_ids is None:
+            game_ids = [game['game_id'] for game in self.source.list_games()]
+        return asyncio.run(self.fetch_many(game_ids, full=full))
+
+    async def fetch_many(self, game_ids: Iterable[str], full: bool = False,
+                         on_result: Optional[Callable[[str, int], None]] = None) -> Dict[str, int]:
+        """Fetch and store achievements for several games concurrently.
+
+        A game that still fails after its retries is logged and counted, and
+        does not stop the others.
+
+        Args:
+            game_ids: Games to fetch
+            full: Ignore the stored sync tokens and fetch everything
+            on_result: Called with (game_id, changed) as each game is stored
+
+        Returns:
+            Counts of games synced, games failed and achievements changed
+        """
+        loop = asyncio.get_running_loop()
+        # Created per run: asyncio primitives must belong to the running loop
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limiter = HostRateLimiter(self.requests_per_second)
+        syncer = AchievementSync(self.store, self.source)
+        result = {'games': 0, 'failed': 0, 'changed': 0}
+
+        with ThreadPoolExecutor(max_workers=self.concurrency,
+                                thread_name_prefix='achievement-fetch') as executor:
+            async def fetch_one(game_id: str):
+                async with semaphore:
+                    try:
+                        since = None if full else await loop.run_in_executor(
+                            executor, self.store.sync_token, game_id)
+                        batch = await self._fetch(loop, executor, limiter, game_id, since)
+                        changed = await loop.run_in_executor(executor, syncer.apply, batch)
+                        return game_id, changed, None
+                    except Exception as e:
+                        return game_id, 0, e
+
+            tasks = [asyncio.ensure_future(fetch_one(game_id)) for game_id in game_ids]
+            for finished in asyncio.as_completed(tasks):
+                game_id, changed, error = await finished
+                if error is not None:
+                    logger.warning("Achievement fetch failed for %s: %s", game_id, error)
+                    result['failed'] += 1
+                    continue
+                result['games'] += 1
+                result['changed'] += changed
+                if on_result is not None:
+                    on_result(game_id, changed)
+        return result
+
+    async def _fetch(self, loop, executor, limiter: HostRateLimiter, game_id: str,
+                     since: Optional[str]) -> SyncBatch:
+        attempt = 0
+        while True:
+            await limiter.acquire(self.host)
+            retry_after = None
+            try:
+                return await loop.run_in_executor(executor, self.source.fetch_changes, game_id, since)
+            except AchievementFetchError as e:
+                if not e.retryable or attempt >= self.max_retries:
+                    raise
+                retry_after = e.retry_after
+                error = e
+            except (OSError, http.client.HTTPException) as e:
+                if attempt >= self.max_retries:
+                    raise
+                error = e
+            attempt += 1
+            delay = retry_after if retry_after is not None else self.backoff_delay(attempt)
+            logger.debug("Fetching achievements for %s failed (%s), retrying in %.2fs",
+                         game_id, error, delay)
+            await asyncio.sleep(delay)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given retry number"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.5, 1.0)
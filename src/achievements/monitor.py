@@ -1,140 +1,194 @@
 """Achievement monitoring for Epic Games"""
 
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import Dict, Iterable, List, Optional, TextIO, Union
+from datetime import datetime, timedelta
+import csv
+import io
 import json
 from pathlib import Path
 
+from core.cache import TTLCache
+
+from .export import AchievementExporter
+from .fetcher import BatchAchievementFetcher
+from .ranking import EasyAchievementRanker
+from .store import AchievementStore
+from .sync import AchievementSource
+
 class AchievementMonitor:
-    """Monitors and tracks game achievements"""
+    """Monitors and tracks game achievements
+    
+    Achievement data lives in a local SQLite store that sync() keeps up to
+    date from an AchievementSource; reads are answered from the store through
+    a short-lived cache, so they never wait on the network.
+    """
     
-    def __init__(self):
+    def __init__(self, store: Optional[AchievementStore] = None,
+                 source: Optional[AchievementSource] = None, cache_ttl: float = 300.0):
         self.data_dir = Path.home() / '.epic-games-manager' / 'achievements'
         self.data_dir.mkdir(parents=True, exist_ok=True)
-        self.achievements_cache = {}
+        self.store = store or AchievementStore(self.data_dir / 'achievements.db')
+        self.source = source
+        self.achievements_cache = TTLCache(cache_ttl, max_entries=256)
+        self.ranker = EasyAchievementRanker(self.store)
+    
+    def sync(self, game_ids: Optional[List[str]] = None, full: bool = False,
+             concurrency: int = 8) -> Dict[str, int]:
+        """Pull achievement changes from the source into the local store
         
-    def get_stats(self) -> Dict[str, any]:
-        """Get overall achievement statistics"""
-        # In a real implementation, this would connect to Epic's achievement API
-        # For now, return mock data
+        Games are fetched concurrently and stored as each one arrives.
+        """
+        if self.source is None:
+            raise RuntimeError("No achievement source configured")
+        fetcher = BatchAchievementFetcher(self.store, self.source, concurrency=concurrency)
+        result = fetcher.fetch_all(game_ids, full=full)
+        self.achievements_cache.clear()
+        return result
+    
+    def unlock(self, game_id: str, achievement_id: str, unlock_date: Optional[str] = None) -> bool:
+        """Record a newly unlocked achievement"""
+        changed = self.store.set_unlocked(game_id, achievement_id, True,
+                                          unlock_date or datetime.now().strftime('%Y-%m-%d'))
+        if changed:
+            self.achievements_cache.clear()
+        return changed
+        
+    def get_summary(self) -> Dict[str, any]:
+        """Get library-wide achievement totals
+        
+        Read from aggregates the store keeps current on every change, so the
+        cost does not grow with the size of the library.
+        """
+        stats = self.store.library_stats()
         return {
-            'total_games': 15,
-            'total_achievements': 342,
-            'unlocked': 156,
-            'completion_rate': 45.6,
-            'perfect_games': 3,
-            'games_with_achievements': [
-                {
-                    'name': 'Fortnite',
-                    'total': 85,
-                    'unlocked': 42,
-                    'percentage': 49.4
-                },
-                {
-                    'name': 'Rocket League',
-                    'total': 88,
-                    'unlocked': 88,
-                    'percentage': 100.0
-                },
-                {
-                    'name': 'Control',
-                    'total': 67,
-                    'unlocked': 15,
-                    'percentage': 22.4
-                }
-            ]
+            'total_games': stats['games'],
+            'total_achievements': stats['total'],
+            'unlocked': stats['unlocked'],
+            'completion_rate': round(stats['unlocked'] / stats['total'] * 100, 1) if stats['total'] else 0.0,
+            'perfect_games': stats['perfect']
         }
     
+    def get_stats(self) -> Dict[str, any]:
+        """Get overall achievement statistics"""
+        return self.achievements_cache.get_or_compute('stats', self._compute_stats)
+    
+    def _compute_stats(self) -> Dict[str, any]:
+        stats = self.get_summary()
+        stats['games_with_achievements'] = [
+            {
+                'name': summary['name'],
+                'total': summary['total'],
+                'unlocked': summary['unlocked'],
+                'percentage': round(summary['unlocked'] / summary['total'] * 100, 1)
+            }
+            for summary in self.store.game_summaries()
+        ]
+        return stats
+    
+    def check_consistency(self, repair: bool = True) -> List[str]:
+        """Verify the stored aggregates against a full recount, rebuilding them if needed"""
+        problems = self.store.check_aggregates(repair=repair)
+        if problems and repair:
+            self.achievements_cache.clear()
+        return problems
+    
     def get_game_achievements(self, game_id: str) -> Dict[str, any]:
         """Get achievements for a specific game"""
-        # Mock data for demonstration
-        mock_achievements = {
+        return self.achievements_cache.get_or_compute(('game', game_id),
+                                                      lambda: self._load_game(game_id))
+    
+    def _load_game(self, game_id: str) -> Dict[str, any]:
+        game = self.store.get_game(game_id) or {'name': '', 'achievements': []}
+        achievements = game['achievements']
+        counts = self.store.game_stats(game_id) or {'total': 0, 'unlocked': 0}
+        return {
             'game_id': game_id,
-            'game_name': 'Example Game',
-            'total_achievements': 50,
-            'unlocked': 23,
-            'locked': 27,
-            'achievements': [
-                {
-                    'id': 'ach_001',
-                    'name': 'First Steps',
-                    'description': 'Complete the tutorial',
-                    'unlocked': True,
-                    'unlock_date': '2024-01-15',
-                    'rarity': 95.2
-                },
-                {
-                    'id': 'ach_002',
-                    'name': 'Master Explorer',
-                    'description': 'Discover all hidden areas',
-                    'unlocked': False,
-                    'rarity': 12.5
-                }
-            ]
+            'game_name': game['name'],
+            'total_achievements': counts['total'],
+            'unlocked': counts['unlocked'],
+            'locked': counts['total'] - counts['unlocked'],
+            'achievements': achievements
         }
-        return mock_achievements
     
     def track_progress(self, game_id: str) -> Dict[str, any]:
         """Track achievement progress for a game"""
         current = self.get_game_achievements(game_id)
         
         # Calculate progress metrics
-        completion = (current['unlocked'] / current['total_achievements']) * 100
+        total = current['total_achievements']
+        completion = (current['unlocked'] / total) * 100 if total else 0.0
+        week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+        remaining = [a['estimated_minutes'] for a in current['achievements']
+                     if not a['unlocked'] and a.get('estimated_minutes') is not None]
         
         return {
             'game_id': game_id,
             'completion_percentage': round(completion, 1),
-            'unlocked_this_week': 3,
-            'estimated_completion_time': '12 hours',
+            'unlocked_this_week': self.store.count_unlocks(week_ago, game_id=game_id),
+            'estimated_completion_time': self._format_minutes(sum(remaining)) if remaining else 'unknown',
             'next_easy_achievements': [
                 {
-                    'name': 'Collector',
-                    'description': 'Collect 100 items',
-                    'progress': '87/100',
-                    'estimated_time': '30 minutes'
+                    'name': achievement['name'],
+                    'description': achievement['description'],
+                    'progress': (f"{achievement['progress'] * 100:.0f}%"
+                                 if achievement['progress'] is not None else None),
+                    'estimated_time': (self._format_minutes(achievement['estimated_minutes'])
+                                       if achievement['estimated_minutes'] is not None else None)
                 }
+                for achievement in self.ranker.top_for_game(game_id, k=3)
             ]
         }
     
+    def get_next_easy_achievements(self, k: int = 10) -> List[Dict[str, any]]:
+        """Get the easiest locked achievements across the whole library"""
+        return self.ranker.top(k)
+    
+    @staticmethod
+    def _format_minutes(minutes: float) -> str:
+        if minutes < 60:
+            return f"{max(1, round(minutes))} minutes"
+        return f"{minutes / 60:.0f} hours" if minutes >= 600 else f"{minutes / 60:.1f} hours"
+    
     def get_recent_unlocks(self, days: int = 7) -> List[Dict[str, any]]:
         """Get recently unlocked achievements"""
-        # Mock data
-        return [
-            {
-                'game': 'Fortnite',
-                'achievement': 'Victory Royale',
-                'unlock_date': datetime.now().strftime('%Y-%m-%d'),
-                'rarity': 25.5
-            },
-            {
-                'game': 'Rocket League',
-                'achievement': 'Season Champion',
-                'unlock_date': datetime.now().strftime('%Y-%m-%d'),
-                'rarity': 5.2
-            }
-        ]
+        since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return self.store.recent_unlocks(since)
     
     def export_achievements(self, format: str = 'json') -> str:
-        """Export achievement data"""
+        """Export per-game achievement statistics
+        
+        For the achievements themselves, use export_to, which streams.
+        """
         stats = self.get_stats()
         
         if format == 'json':
             return json.dumps(stats, indent=2)
         elif format == 'csv':
-            # Simple CSV export
-            lines = ['Game,Total,Unlocked,Percentage']
+            out = io.StringIO()
+            writer = csv.writer(out, lineterminator='\n')
+            writer.writerow(['Game', 'Total', 'Unlocked', 'Percentage'])
             for game in stats['games_with_achievements']:
-                lines.append(f"{game['name']},{game['total']},{game['unlocked']},{game['percentage']}")
-            return '\n'.join(lines)
+                writer.writerow([game['name'], game['total'], game['unlocked'], game['percentage']])
+            return out.getvalue()
         else:
             return str(stats)
     
+    def export_to(self, destination: Union[Path, str, TextIO], format: str = 'csv',
+                  game_ids: Optional[Iterable[str]] = None,
+                  since: Optional[str] = None, until: Optional[str] = None) -> int:
+        """Stream every matching achievement to a file, '-' (stdout) or a stream
+        
+        Returns the number of achievements written.
+        """
+        return AchievementExporter(self.store).export(destination, format, game_ids=game_ids,
+                                                      since=since, until=until)
+    
     def compare_with_friends(self, friend_id: str) -> Dict[str, any]:
         """Compare achievements with a friend (Pro feature)"""
         # This would be a pro feature
         return {
             'friend': friend_id,
             'comparison': 'This feature requires Pro version',
-            'your_score': 156,
+            'your_score': self.get_stats()['unlocked'],
             'friend_score': 0
         }
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""Ranking of locked achievements by how easy they are to get next"""
+
+import heapq
+import logging
+import math
+import threading
+from array import array
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Optional; the pure-Python path gives the same results
+    np = None
+
+from .store import AchievementStore
+
+logger = logging.getLogger(__name__)
+
+NAN = float('nan')
+
+
+class AchievementColumns:
+    """Locked achievements held column-wise, grouped by game.
+
+    Numeric attributes are contiguous ``array('d')`` buffers (NaN for
+    unknown values), so they can be scored without per-row objects and
+    viewed zero-copy as numpy arrays. Rows of one game are adjacent;
+    ``offsets[g]:offsets[g + 1]`` is the slice of game ``g``.
+    """
+
+    def __init__(self):
+        self.game_ids: List[str] = []
+        self.game_names: List[str] = []
+        self.game_positions: Dict[str, int] = {}
+        self.offsets = array('q', [0])
+        self.game_index = array('l')
+        self.achievement_ids: List[str] = []
+        self.names: List[str] = []
+        self.descriptions: List[str] = []
+        self.rarity = array('d')
+        self.progress = array('d')
+        self.minutes = array('d')
+
+    def __len__(self) -> int:
+        return len(self.rarity)
+
+    @classmethod
+    def from_store(cls, store: AchievementStore) -> 'AchievementColumns':
+        columns = cls()
+        current = None
+        for game_id, game_name, achievement_id, name, description, rarity, progress, minutes in store.iter_locked():
+            if game_id != current:
+                if current is not None:
+                    columns.offsets.append(len(columns.rarity))
+                current = game_id
+                columns.game_positions[game_id] = len(columns.game_ids)
+                columns.game_ids.append(game_id)
+                columns.game_names.append(game_name)
+            columns.game_index.append(len(columns.game_ids) - 1)
+            columns.achievement_ids.append(achievement_id)
+            columns.names.append(name)
+            columns.descriptions.append(description)
+            columns.rarity.append(NAN if rarity is None else rarity)
+            columns.progress.append(NAN if progress is None else progress)
+            columns.minutes.append(NAN if minutes is None else minutes)
+        if current is not None:
+            columns.offsets.append(len(columns.rarity))
+        return columns
+
+    def row(self, index: int, score: float) -> Dict[str, Any]:
+        game = self.game_index[index]
+
+        def known(value):
+            return None if math.isnan(value) else value
+
+        return {
+            'game_id': self.game_ids[game],
+            'game_name': self.game_names[game],
+            'id': self.achievement_ids[index],
+            'name': self.names[index],
+            'description': self.descriptions[index],
+            'rarity': known(self.rarity[index]),
+            'progress': known(self.progress[index]),
+            'estimated_minutes': known(self.minutes[index]),
+            'score': round(float(score), 4),
+        }
+
+
+class EasyAchievementRanker:
+    """Ranks locked achievements across the library by how easy they look.
+
+    The score mixes how common an achievement is (rarity is the percentage
+    of players who have it), how far along the player already is, and the
+    estimated time left; unknown inputs count as neutral. Columns and scores
+    are rebuilt only when the store changed since the last ranking. Scoring
+    uses numpy when it is installed.
+    """
+
+    def __init__(self, store: AchievementStore, rarity_weight: float = 0.4,
+                 progress_weight: float = 0.4, time_weight: float = 0.2,
+                 use_numpy: Optional[bool] = None):
+        """Initialize the ranker.
+
+        Args:
+            store: Store holding the achievements
+            rarity_weight: Weight of how common the achievement is
+            progress_weight: Weight of the progress fraction
+            time_weight: Weight of the (short) estimated time left
+            use_numpy: Force the numpy (True) or pure-Python (False) path
+        """
+        self.store = store
+        self.weights = (rarity_weight, progress_weight, time_weight)
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        if self.use_numpy and np is None:
+            raise RuntimeError("numpy is not installed")
+        self._lock = threading.Lock()
+        self._version = None
+        self.columns = AchievementColumns()
+        self.scores = None
+
+    def refresh(self, force: bool = False):
+        """Reload columns and scores if the store changed"""
+        self._snapshot(force)
+
+    def _snapshot(self, force: bool = False):
+        """Current (columns, scores), rebuilt first if the store changed"""
+        with self._lock:
+            version = self.store.version()
+            if force or version != self._version:
+                self.columns = AchievementColumns.from_store(self.store)
+                self.scores = self._score(self.columns)
+                self._version = version
+                logger.debug("Ranked %d locked achievements", len(self.columns))
+            return self.columns, self.scores
+
+    def _score(self, columns: AchievementColumns):
+        rarity_weight, progress_weight, time_weight = self.weights
+        if self.use_numpy:
+            rarity = np.frombuffer(columns.rarity, dtype=np.float64)
+            progress = np.frombuffer(columns.progress, dtype=np.float64)
+            minutes = np.frombuffer(columns.minutes, dtype=np.float64)
+            rarity_score = np.nan_to_num(rarity / 100.0, nan=0.5)
+            progress_score = np.nan_to_num(np.clip(progress, 0.0, 1.0), nan=0.0)
+            time_score = np.nan_to_num(1.0 / (1.0 + np.maximum(minutes, 0.0) / 60.0), nan=0.5)
+            return rarity_weight * rarity_score + progress_weight * progress_score + time_weight * time_score
+
+        scores = array('d', bytes(8 * len(columns)))
+        for i, (rarity, progress, minutes) in enumerate(zip(columns.rarity, columns.progress, columns.minutes)):
+            rarity_score = 0.5 if rarity != rarity else rarity / 100.0
+            progress_score = 0.0 if progress != progress else min(max(progress, 0.0), 1.0)
+            time_score = 0.5 if minutes != minutes else 1.0 / (1.0 + max(minutes, 0.0) / 60.0)
+            scores[i] = rarity_weight * rarity_score + progress_weight * progress_score + time_weight * time_score
+        return scores
+
+    def _top_indices(self, scores, start: int, stop: int, k: int) -> List[int]:
+        """Indices of the k best scores in rows start:stop, best first; ties by position"""
+        if k <= 0 or stop <= start:
+            return []
+        if self.use_numpy:
+            window = scores[start:stop]
+            if k < len(window):
+                candidates = np.argpartition(-window, k - 1)[:k]
+            else:
+                candidates = np.arange(len(window))
+            ordered = candidates[np.lexsort((candidates, -window[candidates]))]
+            return (ordered + start).tolist()
+        return heapq.nsmallest(k, range(start, stop), key=lambda i: (-scores[i], i))
+
+    def top(self, k: int = 10) -> List[Dict[str, Any]]:
+        """The k easiest locked achievements across the whole library"""
+        columns, scores = self._snapshot()
+        return [columns.row(i, scores[i]) for i in self._top_indices(scores, 0, len(columns), k)]
+
+    def top_for_game(self, game_id: str, k: int = 3) -> List[Dict[str, Any]]:
+        """The k easiest locked achievements of one game"""
+        columns, scores = self._snapshot()
+        game = columns.game_positions.get(game_id)
+        if game is None:
+            return []
+        indices = self._top_indices(scores, columns.offsets[game], columns.offsets[game + 1], k)
+        return [columns.row(i, scores[i]) for i in indices]
+
+    def top_per_game(self, k: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+        """The k easiest locked achievements of every game"""
+        columns, scores = self._snapshot()
+        if self.use_numpy and len(columns):
+            game_index = np.frombuffer(columns.game_index, dtype=np.dtype('l'))
+            positions = np.arange(len(columns))
+            # Sort by game, then score descending, then position; games stay in
+            # their original blocks, so a row's rank is its distance from the block start
+            order = np.lexsort((positions, -scores, game_index))
+            starts = np.frombuffer(columns.offsets, dtype=np.int64)[:-1]
+            rank = positions - np.repeat(starts, np.diff(columns.offsets))
+            result: Dict[str, List[Dict[str, Any]]] = {game_id: [] for game_id in columns.game_ids}
+            chosen = order[rank < k]
+            for i, score in zip(chosen.tolist(), scores[chosen].tolist()):
+                result[columns.game_ids[columns.game_index[i]]].append(columns.row(i, score))
+            return result
+        return {
+            game_id: [columns.row(i, scores[i])
+                      for i in self._top_indices(scores, columns.offsets[g], columns.offsets[g + 1], k)]
+            for g, game_id in enumerate(columns.game_ids)
+        }
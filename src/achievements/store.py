@@ -0,0 +1,446 @@
+"""Local SQLite store for Epic Games achievement data"""
+
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Recompute every aggregate from the achievements themselves
+REBUILD_AGGREGATES = [
+    """UPDATE game_stats SET
+        total = (SELECT COUNT(*) FROM achievements a WHERE a.game_id = game_stats.game_id),
+        unlocked = (SELECT COALESCE(SUM(unlocked), 0) FROM achievements a
+                    WHERE a.game_id = game_stats.game_id)""",
+    """UPDATE library_stats SET
+        games = (SELECT COUNT(*) FROM game_stats WHERE total > 0),
+        total = (SELECT COALESCE(SUM(total), 0) FROM game_stats),
+        unlocked = (SELECT COALESCE(SUM(unlocked), 0) FROM game_stats),
+        perfect = (SELECT COUNT(*) FROM game_stats WHERE total > 0 AND unlocked = total)
+    WHERE id = 1""",
+]
+
+
+def _rebuild_aggregates(conn: sqlite3.Connection):
+    for statement in REBUILD_AGGREGATES:
+        conn.execute(statement)
+
+
+# Applied in order, one list of statements (or callables taking the
+# connection) per schema version; PRAGMA user_version records how many have run
+MIGRATIONS = [
+    [
+        """CREATE TABLE games (
+            game_id     TEXT PRIMARY KEY,
+            name        TEXT NOT NULL,
+            sync_token  TEXT,
+            synced_at   TEXT
+        )""",
+        """CREATE TABLE achievements (
+            game_id         TEXT NOT NULL REFERENCES games(game_id) ON DELETE CASCADE,
+            achievement_id  TEXT NOT NULL,
+            name            TEXT NOT NULL,
+            description     TEXT NOT NULL DEFAULT '',
+            rarity          REAL,
+            unlocked        INTEGER NOT NULL DEFAULT 0,
+            unlock_date     TEXT,
+            PRIMARY KEY (game_id, achievement_id)
+        ) WITHOUT ROWID""",
+        """CREATE INDEX idx_achievements_unlock_date
+            ON achievements(unlock_date) WHERE unlocked = 1""",
+    ],
+    [
+        # Aggregates kept current by triggers, so summaries never scan achievements
+        """CREATE TABLE game_stats (
+            game_id   TEXT PRIMARY KEY REFERENCES games(game_id) ON DELETE CASCADE,
+            total     INTEGER NOT NULL DEFAULT 0,
+            unlocked  INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID""",
+        """CREATE TABLE library_stats (
+            id        INTEGER PRIMARY KEY CHECK (id = 1),
+            games     INTEGER NOT NULL DEFAULT 0,
+            total     INTEGER NOT NULL DEFAULT 0,
+            unlocked  INTEGER NOT NULL DEFAULT 0,
+            perfect   INTEGER NOT NULL DEFAULT 0
+        )""",
+        "INSERT INTO library_stats (id) VALUES (1)",
+        """CREATE TRIGGER games_stats_insert AFTER INSERT ON games BEGIN
+            INSERT INTO game_stats (game_id) VALUES (NEW.game_id);
+        END""",
+        """CREATE TRIGGER achievements_stats_insert AFTER INSERT ON achievements BEGIN
+            UPDATE game_stats SET total = total + 1, unlocked = unlocked + NEW.unlocked
+            WHERE game_id = NEW.game_id;
+        END""",
+        """CREATE TRIGGER achievements_stats_delete AFTER DELETE ON achievements BEGIN
+            UPDATE game_stats SET total = total - 1, unlocked = unlocked - OLD.unlocked
+            WHERE game_id = OLD.game_id;
+        END""",
+        """CREATE TRIGGER achievements_stats_unlock AFTER UPDATE OF unlocked ON achievements
+        WHEN NEW.unlocked != OLD.unlocked BEGIN
+            UPDATE game_stats SET unlocked = unlocked + NEW.unlocked - OLD.unlocked
+            WHERE game_id = NEW.game_id;
+        END""",
+        """CREATE TRIGGER game_stats_library_update AFTER UPDATE ON game_stats BEGIN
+            UPDATE library_stats SET
+                games = games + (NEW.total > 0) - (OLD.total > 0),
+                total = total + NEW.total - OLD.total,
+                unlocked = unlocked + NEW.unlocked - OLD.unlocked,
+                perfect = perfect + (NEW.total > 0 AND NEW.unlocked = NEW.total)
+                                  - (OLD.total > 0 AND OLD.unlocked = OLD.total)
+            WHERE id = 1;
+        END""",
+        """CREATE TRIGGER game_stats_library_delete AFTER DELETE ON game_stats BEGIN
+            UPDATE library_stats SET
+                games = games - (OLD.total > 0),
+                total = total - OLD.total,
+                unlocked = unlocked - OLD.unlocked,
+                perfect = perfect - (OLD.total > 0 AND OLD.unlocked = OLD.total)
+            WHERE id = 1;
+        END""",
+        # Fill the new tables for data stored before they existed
+        "INSERT INTO game_stats (game_id) SELECT game_id FROM games",
+        _rebuild_aggregates,
+    ],
+    [
+        # Inputs for ranking locked achievements by how close they are
+        "ALTER TABLE achievements ADD COLUMN progress REAL",  # 0..1
+        "ALTER TABLE achievements ADD COLUMN estimated_minutes REAL",
+    ],
+]
+
+ACHIEVEMENT_COLUMNS = ('achievement_id', 'name', 'description', 'rarity', 'unlocked', 'unlock_date',
+                       'progress', 'estimated_minutes')
+
+
+class AchievementStore:
+    """Per-game achievement definitions and unlock state in one SQLite file.
+
+    Lookups by game and recent unlocks are served from indexes. One
+    connection is shared by all threads and serialized with a lock; WAL mode
+    lets other processes read while we write.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        """Open (and if needed create or upgrade) the store.
+
+        Args:
+            path: Database file, or ':memory:'
+        """
+        self.path = path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA busy_timeout = 10000")
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for index in range(version, len(MIGRATIONS)):
+                logger.debug("Applying achievement store migration %d", index + 1)
+                for statement in MIGRATIONS[index]:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+            if version < len(MIGRATIONS):
+                conn.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements as one atomic write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def upsert_game(self, game_id: str, name: str):
+        """Add a game or rename it"""
+        with self.transaction() as conn:
+            self._upsert_game(conn, game_id, name)
+
+    @staticmethod
+    def _upsert_game(conn, game_id: str, name: str):
+        conn.execute("INSERT INTO games (game_id, name) VALUES (?, ?) "
+                     "ON CONFLICT(game_id) DO UPDATE SET name = excluded.name",
+                     (game_id, name))
+
+    def apply_changes(self, game_id: str, name: str, achievements: Iterable[Dict[str, Any]],
+                      sync_token: Optional[str] = None, replace: bool = False,
+                      synced_at: Optional[str] = None) -> int:
+        """Write a batch of achievement changes for one game atomically.
+
+        Args:
+            game_id: Game the achievements belong to
+            name: Display name of the game
+            achievements: Achievement dicts (id, name, description, rarity,
+                unlocked, unlock_date); ``deleted: True`` removes one
+            sync_token: Source position to resume the next incremental sync from
+            replace: Drop stored achievements that are not in the batch
+            synced_at: ISO timestamp of the sync
+
+        Returns:
+            Number of achievements written or removed
+        """
+        changed = 0
+        with self.transaction() as conn:
+            self._upsert_game(conn, game_id, name)
+            seen = set()
+            for achievement in achievements:
+                achievement_id = str(achievement['id'])
+                seen.add(achievement_id)
+                if achievement.get('deleted'):
+                    conn.execute("DELETE FROM achievements WHERE game_id = ? AND achievement_id = ?",
+                                 (game_id, achievement_id))
+                else:
+                    conn.execute(
+                        "INSERT INTO achievements (game_id, achievement_id, name, description, "
+                        "rarity, unlocked, unlock_date, progress, estimated_minutes) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(game_id, achievement_id) DO UPDATE SET "
+                        "name = excluded.name, description = excluded.description, "
+                        "rarity = excluded.rarity, unlocked = excluded.unlocked, "
+                        "unlock_date = excluded.unlock_date, progress = excluded.progress, "
+                        "estimated_minutes = excluded.estimated_minutes",
+                        (game_id, achievement_id, achievement.get('name', achievement_id),
+                         achievement.get('description', ''), achievement.get('rarity'),
+                         1 if achievement.get('unlocked') else 0, achievement.get('unlock_date'),
+                         achievement.get('progress'), achievement.get('estimated_minutes')))
+                changed += 1
+            if replace:
+                stale = [(game_id, row[0]) for row in conn.execute(
+                    "SELECT achievement_id FROM achievements WHERE game_id = ?", (game_id,))
+                    if row[0] not in seen]
+                conn.executemany("DELETE FROM achievements WHERE game_id = ? AND achievement_id = ?", stale)
+                changed += len(stale)
+            conn.execute("UPDATE games SET sync_token = ?, synced_at = ? WHERE game_id = ?",
+                         (sync_token, synced_at, game_id))
+        return changed
+
+    def set_unlocked(self, game_id: str, achievement_id: str, unlocked: bool = True,
+                     unlock_date: Optional[str] = None) -> bool:
+        """Record that an achievement was unlocked (or locked again).
+
+        Returns:
+            True if the stored state changed
+        """
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE achievements SET unlocked = ?, unlock_date = ? "
+                "WHERE game_id = ? AND achievement_id = ? AND unlocked != ?",
+                (1 if unlocked else 0, unlock_date if unlocked else None,
+                 game_id, achievement_id, 1 if unlocked else 0))
+            return cursor.rowcount > 0
+
+    def remove_game(self, game_id: str):
+        """Forget a game and all of its achievements"""
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
+
+    def sync_token(self, game_id: str) -> Optional[str]:
+        """Token the last sync of a game ended at, or None if never synced"""
+        with self._lock:
+            row = self._conn.execute("SELECT sync_token FROM games WHERE game_id = ?",
+                                     (game_id,)).fetchone()
+        return row['sync_token'] if row else None
+
+    def game_ids(self) -> List[str]:
+        """Ids of all stored games"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT game_id FROM games ORDER BY game_id")]
+
+    def get_game(self, game_id: str) -> Optional[Dict[str, Any]]:
+        """A game's name and achievements, or None if it is not stored"""
+        with self._lock:
+            game = self._conn.execute("SELECT name FROM games WHERE game_id = ?", (game_id,)).fetchone()
+            if game is None:
+                return None
+            rows = self._conn.execute(
+                f"SELECT {', '.join(ACHIEVEMENT_COLUMNS)} FROM achievements "
+                "WHERE game_id = ? ORDER BY achievement_id", (game_id,)).fetchall()
+        return {'game_id': game_id, 'name': game['name'],
+                'achievements': [self._achievement(row) for row in rows]}
+
+    @staticmethod
+    def _achievement(row: sqlite3.Row) -> Dict[str, Any]:
+        achievement = {
+            'id': row['achievement_id'],
+            'name': row['name'],
+            'description': row['description'],
+            'unlocked': bool(row['unlocked']),
+            'rarity': row['rarity'],
+        }
+        if row['unlocked']:
+            achievement['unlock_date'] = row['unlock_date']
+        else:
+            achievement['progress'] = row['progress']
+            achievement['estimated_minutes'] = row['estimated_minutes']
+        return achievement
+
+    def game_summaries(self) -> List[Dict[str, Any]]:
+        """Total and unlocked counts per game that has achievements"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT g.game_id, g.name, s.total, s.unlocked "
+                "FROM game_stats s JOIN games g ON g.game_id = s.game_id "
+                "WHERE s.total > 0 ORDER BY g.name").fetchall()
+        return [dict(row) for row in rows]
+
+    def game_stats(self, game_id: str) -> Optional[Dict[str, int]]:
+        """Materialized total and unlocked counts for one game"""
+        with self._lock:
+            row = self._conn.execute("SELECT total, unlocked FROM game_stats WHERE game_id = ?",
+                                     (game_id,)).fetchone()
+        return dict(row) if row else None
+
+    def library_stats(self) -> Dict[str, int]:
+        """Materialized library-wide counts: games, total, unlocked and perfect"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT games, total, unlocked, perfect FROM library_stats WHERE id = 1").fetchone()
+        return dict(row)
+
+    def check_aggregates(self, repair: bool = False) -> List[str]:
+        """Compare the materialized aggregates with a full recount.
+
+        Args:
+            repair: Rebuild the aggregates if they disagree
+
+        Returns:
+            A description of each mismatch found (empty if consistent)
+        """
+        with self.transaction() as conn:
+            problems = [
+                f"game {row['game_id']}: stored {row['total']}/{row['unlocked']}, "
+                f"actual {row['actual_total']}/{row['actual_unlocked']}"
+                for row in conn.execute(
+                    "SELECT g.game_id, s.total, s.unlocked, "
+                    "       COUNT(a.achievement_id) AS actual_total, "
+                    "       COALESCE(SUM(a.unlocked), 0) AS actual_unlocked "
+                    "FROM games g LEFT JOIN game_stats s ON s.game_id = g.game_id "
+                    "LEFT JOIN achievements a ON a.game_id = g.game_id "
+                    "GROUP BY g.game_id "
+                    "HAVING s.total IS NOT actual_total OR s.unlocked IS NOT actual_unlocked")
+            ]
+            stored = dict(conn.execute(
+                "SELECT games, total, unlocked, perfect FROM library_stats WHERE id = 1").fetchone())
+            actual = dict(conn.execute(
+                "SELECT COUNT(*) AS games, COALESCE(SUM(total), 0) AS total, "
+                "       COALESCE(SUM(unlocked), 0) AS unlocked, "
+                "       COALESCE(SUM(unlocked = total), 0) AS perfect "
+                "FROM (SELECT COUNT(*) AS total, SUM(unlocked) AS unlocked "
+                "      FROM achievements GROUP BY game_id)").fetchone())
+            if stored != actual:
+                problems.append(f"library: stored {stored}, actual {actual}")
+            if problems and repair:
+                conn.execute("INSERT INTO game_stats (game_id) SELECT game_id FROM games "
+                             "WHERE game_id NOT IN (SELECT game_id FROM game_stats)")
+                _rebuild_aggregates(conn)
+                logger.warning("Rebuilt achievement aggregates after %d mismatch(es)", len(problems))
+        return problems
+
+    def count_unlocks(self, since: str, game_id: Optional[str] = None) -> int:
+        """Number of achievements unlocked on or after ``since`` (ISO date)"""
+        sql = "SELECT COUNT(*) FROM achievements WHERE unlocked = 1 AND unlock_date >= ?"
+        params = [since]
+        if game_id is not None:
+            sql += " AND game_id = ?"
+            params.append(game_id)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def version(self) -> tuple:
+        """Token that changes whenever the stored data changes, from any connection"""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return self._conn.total_changes, data_version
+
+    def iter_locked(self) -> Iterator[tuple]:
+        """Yield every locked achievement as a tuple, grouped by game.
+        
+        Tuples are (game_id, game_name, achievement_id, name, description,
+        rarity, progress, estimated_minutes). The store stays locked until
+        the iterator is exhausted, so consume it promptly.
+        """
+        with self._lock:
+            yield from self._conn.execute(
+                "SELECT a.game_id, g.name, a.achievement_id, a.name, a.description, "
+                "a.rarity, a.progress, a.estimated_minutes "
+                "FROM achievements a JOIN games g ON g.game_id = a.game_id "
+                "WHERE a.unlocked = 0 ORDER BY a.game_id")
+
+    def iter_achievements(self, game_ids: Optional[Iterable[str]] = None,
+                          since: Optional[str] = None, until: Optional[str] = None,
+                          page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Yield achievements in (game_id, achievement_id) order, a page at a time.
+        
+        Pages are read with keyset pagination, so memory stays constant and the
+        store is only locked while a page is read. With a date filter only
+        achievements unlocked in that range are returned.
+        
+        Args:
+            game_ids: Only these games
+            since: Earliest unlock date (inclusive, ISO)
+            until: Latest unlock date (inclusive, ISO)
+            page_size: Rows fetched per query
+        """
+        conditions = ["(a.game_id, a.achievement_id) > (?, ?)"]
+        filters: List[Any] = []
+        if game_ids is not None:
+            game_ids = list(game_ids)
+            conditions.append(f"a.game_id IN ({','.join('?' * len(game_ids))})")
+            filters.extend(game_ids)
+        if since is not None or until is not None:
+            conditions.append("a.unlocked = 1")
+        if since is not None:
+            conditions.append("a.unlock_date >= ?")
+            filters.append(since)
+        if until is not None:
+            # Dates may carry a time; anything on the final day still counts
+            conditions.append("substr(a.unlock_date, 1, 10) <= ?")
+            filters.append(until)
+        sql = (f"SELECT a.game_id, g.name AS game_name, {', '.join('a.' + c for c in ACHIEVEMENT_COLUMNS)} "
+               "FROM achievements a JOIN games g ON g.game_id = a.game_id "
+               f"WHERE {' AND '.join(conditions)} "
+               "ORDER BY a.game_id, a.achievement_id LIMIT ?")
+        
+        last = ('', '')
+        while True:
+            with self._lock:
+                rows = self._conn.execute(sql, [*last, *filters, page_size]).fetchall()
+            for row in rows:
+                yield dict(row)
+            if len(rows) < page_size:
+                return
+            last = (rows[-1]['game_id'], rows[-1]['achievement_id'])
+
+    def recent_unlocks(self, since: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Achievements unlocked on or after ``since`` (ISO date), newest first"""
+        sql = ("SELECT g.name AS game, a.name AS achievement, a.unlock_date, a.rarity "
+               "FROM achievements a JOIN games g ON g.game_id = a.game_id "
+               "WHERE a.unlocked = 1 AND a.unlock_date >= ? ORDER BY a.unlock_date DESC")
+        params: List[Any] = [since]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
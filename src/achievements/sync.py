@@ -0,0 +1,129 @@
+"""Incremental synchronization of achievement data into the local store"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .store import AchievementStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncBatch:
+    """Achievement changes for one game since a sync token"""
+    game_id: str
+    name: str
+    achievements: List[Dict[str, Any]] = field(default_factory=list)
+    token: Optional[str] = None  # Where the next incremental sync continues from
+    full: bool = False  # The batch is the complete list; drop anything not in it
+
+
+class AchievementSource(ABC):
+    """Where achievement data comes from.
+
+    Implementations return only what changed since the token they handed out
+    last time, so a sync of an unchanged library transfers almost nothing.
+    """
+
+    @abstractmethod
+    def list_games(self) -> List[Dict[str, str]]:
+        """Games with achievements, as dicts with 'game_id' and 'name'"""
+
+    @abstractmethod
+    def fetch_changes(self, game_id: str, since: Optional[str] = None) -> SyncBatch:
+        """Achievements of a game that changed after ``since`` (all if None)"""
+
+
+class LocalAchievementSource(AchievementSource):
+    """Source reading one ``<game_id>.json`` file per game from a directory.
+
+    Stands in for the Epic achievement service offline and in tests. Each
+    file holds ``{"name": ..., "achievements": [...]}``; an achievement's
+    ``updated_at`` (ISO timestamp) decides whether it changed since a token.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _read(self, game_id: str) -> Dict[str, Any]:
+        with open(self.directory / f"{game_id}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def list_games(self) -> List[Dict[str, str]]:
+        games = []
+        for path in sorted(self.directory.glob('*.json')):
+            try:
+                games.append({'game_id': path.stem, 'name': self._read(path.stem).get('name', path.stem)})
+            except (OSError, ValueError) as e:
+                logger.warning("Skipping unreadable achievement file %s: %s", path, e)
+        return games
+
+    def fetch_changes(self, game_id: str, since: Optional[str] = None) -> SyncBatch:
+        data = self._read(game_id)
+        achievements = data.get('achievements', [])
+        token = max((a.get('updated_at', '') for a in achievements), default='') or since
+        if since is not None:
+            achievements = [a for a in achievements if a.get('updated_at', '') > since]
+        return SyncBatch(game_id=game_id, name=data.get('name', game_id),
+                         achievements=achievements, token=token, full=since is None)
+
+
+class AchievementSync:
+    """Pulls changes from an AchievementSource into an AchievementStore"""
+
+    def __init__(self, store: AchievementStore, source: AchievementSource):
+        self.store = store
+        self.source = source
+
+    def sync_game(self, game_id: str, full: bool = False) -> int:
+        """Bring one game up to date.
+
+        Args:
+            game_id: Game to sync
+            full: Ignore the stored token and fetch everything
+
+        Returns:
+            Number of achievements that changed
+        """
+        since = None if full else self.store.sync_token(game_id)
+        batch = self.source.fetch_changes(game_id, since)
+        return self.apply(batch)
+
+    def apply(self, batch: SyncBatch) -> int:
+        """Write a fetched batch into the store"""
+        changed = self.store.apply_changes(batch.game_id, batch.name, batch.achievements,
+                                           sync_token=batch.token, replace=batch.full,
+                                           synced_at=datetime.now().isoformat(timespec='seconds'))
+        if changed:
+            logger.debug("Synced %d achievement change(s) for %s", changed, batch.game_id)
+        return changed
+
+    def sync(self, game_ids: Optional[Iterable[str]] = None, full: bool = False) -> Dict[str, int]:
+        """Bring several games (default: every game the source knows) up to date.
+
+        A game that fails is logged and skipped so one bad response does not
+        stop the rest.
+
+        Args:
+            game_ids: Games to sync
+            full: Ignore the stored tokens and fetch everything
+
+        Returns:
+            Counts of games synced, games failed and achievements changed
+        """
+        if game_ids is None:
+            game_ids = [game['game_id'] for game in self.source.list_games()]
+        result = {'games': 0, 'failed': 0, 'changed': 0}
+        for game_id in game_ids:
+            try:
+                result['changed'] += self.sync_game(game_id, full=full)
+                result['games'] += 1
+            except Exception as e:
+                logger.warning("Achievement sync failed for %s: %s", game_id, e)
+                result['failed'] += 1
+        return result
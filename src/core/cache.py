@@ -0,0 +1,87 @@
+"""In-memory caching helpers for Epic Games Manager"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe mapping whose entries expire after a fixed time.
+
+    Holds at most ``max_entries`` values; when full, the least recently used
+    entry is evicted. Expired entries are dropped lazily on access and when
+    making room.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl: float, max_entries: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid
+            max_entries: Entries kept before the least recently used is evicted
+            clock: Monotonic clock, replaceable for testing
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a live entry, or ``default`` if it is missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting expired and then least recently used entries"""
+        with self._lock:
+            now = self._clock()
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._evict(now)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Get a live entry, computing and storing it on a miss"""
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Drop one entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self, now: float):
+        for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, self._MISSING) is not self._MISSING
@@ -1,19 +1,77 @@
 """Configuration management for Epic Games Manager"""
 
+import copy
 import json
+import logging
 import os
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+from .discovery import default_manifest_dir, find_manifest_directory
+from .fileio import atomic_write_json, quarantine
+from .locking import FileLock
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# Type of every known key; set() rejects values of another type
+CONFIG_SCHEMA: Dict[str, type] = {
+    'license_key': str,
+    'tier': str,
+    'auto_backup': bool,
+    'backup_dir': str,
+    'check_updates': bool,
+    'theme': str,
+    'language': str,
+    'last_scan': str,
+    'manifest_dir': str,
+    'game_directories': list,
+}
+
+
+def _migrate_to_v1(config: Dict[str, Any]):
+    # Unversioned files could hold a single directory as a plain string
+    directories = config.get('game_directories')
+    if isinstance(directories, str):
+        config['game_directories'] = [directories] if directories else []
+
+
+# MIGRATIONS[n] upgrades a version-n file to version n + 1
+MIGRATIONS = [_migrate_to_v1]
+
+
+class ConfigError(ValueError):
+    """Raised for an unreadable config file or a value of the wrong type"""
+
 
 class Config:
-    """Manages application configuration"""
+    """Manages application configuration
+    
+    The GUI and CLI may run at the same time, so every change re-reads the
+    file under an exclusive lock, applies itself and replaces the file
+    atomically; concurrent writers never lose each other's keys. Changes
+    made inside transaction() are written once, when the outermost block
+    ends. Edits by other processes are picked up when the file's mtime
+    changes, checked at most every ``reload_interval`` seconds.
+    """
     
-    def __init__(self):
+    def __init__(self, reload_interval: float = 1.0):
         self.config_dir = self._get_config_dir()
         self.config_file = self.config_dir / "config.json"
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        self.reload_interval = reload_interval
+        self._lock = FileLock.for_file(self.config_file)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._defaults = None
+        self._signature = None
+        self._checked_at = 0.0
         self._config = self._load_config()
-        
+    
     def _get_config_dir(self) -> Path:
         """Get platform-specific config directory"""
         if os.name == 'nt':  # Windows
@@ -21,75 +79,251 @@ class Config:
         else:  # macOS/Linux
             base = Path.home() / '.config'
         return base / 'epic-games-manager'
+    
+    def _file_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self.config_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+    
+    def _read(self) -> Optional[Dict[str, Any]]:
+        """Parse the file as stored, or None if there is none.
         
+        Raises:
+            ConfigError: If the file is not a JSON object
+        """
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            raise ConfigError(f"Cannot read {self.config_file}: {e}") from e
+        if not isinstance(data, dict):
+            raise ConfigError(f"{self.config_file} does not hold a JSON object")
+        return data
+    
+    def _normalize(self, data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Upgrade a stored config to the current schema and fill in defaults"""
+        config = self._get_default_config()
+        if data is None:
+            return config
+        version = data.get('schema_version', 0)
+        if not isinstance(version, int) or version < 0:
+            version = 0
+        for migration in MIGRATIONS[version:]:
+            migration(data)
+        if version > SCHEMA_VERSION:
+            logger.warning("%s was written by a newer version (schema %d); unknown keys are kept",
+                           self.config_file, version)
+        for key, value in data.items():
+            expected = CONFIG_SCHEMA.get(key)
+            if expected is not None and not self._is_type(value, expected):
+                logger.warning("Ignoring %s=%r in %s: expected %s", key, value, self.config_file,
+                               expected.__name__)
+                continue
+            config[key] = value
+        config['schema_version'] = max(version, SCHEMA_VERSION)
+        return config
+    
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from file"""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        return self._get_default_config()
+        """Load configuration from file.
         
+        A file that cannot be parsed is moved aside (see fileio.quarantine)
+        and reported, rather than silently replaced by defaults.
+        """
+        with self._lock.shared():
+            signature = self._file_signature()
+            try:
+                data = self._read()
+            except ConfigError as e:
+                data = None
+                moved = quarantine(self.config_file)
+                logger.error("%s; using defaults, the file was moved to %s", e, moved)
+                signature = self._file_signature()
+        self._signature = signature
+        self._checked_at = time.monotonic()
+        return self._normalize(data)
+    
     def _get_default_config(self) -> Dict[str, Any]:
         """Get default configuration"""
-        return {
-            'license_key': '',
-            'tier': 'free',
-            'auto_backup': True,
-            'backup_dir': str(Path.home() / 'EpicGamesBackups'),
-            'check_updates': True,
-            'theme': 'dark',
-            'language': 'en',
-            'last_scan': '',
-            'manifest_dir': self._get_default_manifest_dir(),
-            'game_directories': []
-        }
-        
+        if self._defaults is None:
+            self._defaults = {
+                'schema_version': SCHEMA_VERSION,
+                'license_key': '',
+                'tier': 'free',
+                'auto_backup': True,
+                'backup_dir': str(Path.home() / 'EpicGamesBackups'),
+                'check_updates': True,
+                'theme': 'dark',
+                'language': 'en',
+                'last_scan': '',
+                'manifest_dir': self._get_default_manifest_dir(),
+                'game_directories': []
+            }
+        return copy.deepcopy(self._defaults)
+    
     def _get_default_manifest_dir(self) -> str:
         """Get default Epic Games manifest directory"""
-        if os.name == 'nt':  # Windows
-            return r'C:\ProgramData\Epic\EpicGamesLauncher\Data\Manifests'
-        elif os.name == 'posix':
-            if 'darwin' in os.sys.platform:  # macOS
-                return str(Path.home() / 'Library/Application Support/Epic/EpicGamesLauncher/Data/Manifests')
-            else:  # Linux
-                return str(Path.home() / '.config/Epic/EpicGamesLauncher/Data/Manifests')
-        return ''
-        
+        default = default_manifest_dir()
+        return str(default) if default else ''
+    
+    @staticmethod
+    def _is_type(value: Any, expected: type) -> bool:
+        if expected is int and isinstance(value, bool):
+            return False
+        return isinstance(value, expected)
+    
+    def _write(self):
+        """Replace the file with the in-memory config; the caller holds the exclusive lock"""
+        atomic_write_json(self.config_file, self._config)
+        self._signature = self._file_signature()
+        self._checked_at = time.monotonic()
+    
     def save(self):
         """Save configuration to file"""
-        with open(self.config_file, 'w') as f:
-            json.dump(self._config, f, indent=2)
+        with self._thread_lock, self._lock.exclusive():
+            self._write()
+    
+    def reload(self, force: bool = False) -> bool:
+        """Re-read the file if another process changed it.
+        
+        A file that cannot be parsed (for example while it is being edited
+        by hand) is reported and the last good configuration is kept.
+        
+        Returns:
+            True if the configuration was reloaded
+        """
+        with self._thread_lock:
+            if self._depth:
+                return False
+            self._checked_at = time.monotonic()
+            signature = self._file_signature()
+            if not force and signature == self._signature:
+                return False
+            try:
+                with self._lock.shared():
+                    signature = self._file_signature()
+                    data = self._read()
+            except ConfigError as e:
+                logger.error("%s; keeping the previous configuration", e)
+                self._signature = signature
+                return False
+            self._config = self._normalize(data)
+            self._signature = signature
+            logger.debug("Reloaded %s", self.config_file)
+            return True
+    
+    def _maybe_reload(self):
+        if time.monotonic() - self._checked_at >= self.reload_interval:
+            self.reload()
+    
+    @contextmanager
+    def transaction(self):
+        """Group changes into one read-modify-write of the file.
+        
+        Yields the configuration dict. The file is re-read under an
+        exclusive lock when the outermost transaction starts and written
+        once when it ends, and only if something changed; nested
+        transactions and set()/add_game_directory()/... calls inside join
+        the outer one. If the block raises, its changes are discarded.
+        
+        Raises:
+            ConfigError: If the file on disk cannot be parsed; it is left
+                untouched rather than overwritten
+        """
+        with self._thread_lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self._config
+                finally:
+                    self._depth -= 1
+                return
             
+            with self._lock.exclusive():
+                self._config = self._normalize(self._read())
+                before = copy.deepcopy(self._config)
+                self._depth = 1
+                try:
+                    yield self._config
+                except BaseException:
+                    self._config = before
+                    raise
+                finally:
+                    self._depth = 0
+                if self._config != before or self._file_signature() is None:
+                    self._write()
+                else:
+                    self._signature = self._file_signature()
+    
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
+        self._maybe_reload()
         return self._config.get(key, default)
-        
+    
     def set(self, key: str, value: Any):
-        """Set configuration value"""
-        self._config[key] = value
-        self.save()
+        """Set configuration value
         
+        Raises:
+            ConfigError: If ``key`` is a known setting and ``value`` has the wrong type
+        """
+        expected = CONFIG_SCHEMA.get(key)
+        if expected is not None and not self._is_type(value, expected):
+            raise ConfigError(f"{key} must be a {expected.__name__}, not {type(value).__name__}")
+        with self.transaction() as config:
+            config[key] = value
+    
+    def _typed(self, key: str, expected: type, default: Any) -> Any:
+        value = self.get(key)
+        if value is None:
+            return default
+        if not self._is_type(value, expected):
+            raise ConfigError(f"{key} is a {type(value).__name__}, not a {expected.__name__}")
+        return value
+    
+    def get_str(self, key: str, default: str = '') -> str:
+        """Get a text setting"""
+        return self._typed(key, str, default)
+    
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        """Get an on/off setting"""
+        return self._typed(key, bool, default)
+    
+    def get_int(self, key: str, default: int = 0) -> int:
+        """Get a whole-number setting"""
+        return self._typed(key, int, default)
+    
+    def get_list(self, key: str, default: Optional[List[Any]] = None) -> List[Any]:
+        """Get a list setting (a copy, so changing it does not change the config)"""
+        return list(self._typed(key, list, default or []))
+    
     def get_backup_dir(self) -> Path:
         """Get backup directory path"""
-        return Path(self.get('backup_dir', str(Path.home() / 'EpicGamesBackups')))
-        
+        return Path(self.get_str('backup_dir') or str(Path.home() / 'EpicGamesBackups'))
+    
     def get_manifest_dir(self) -> Path:
         """Get Epic Games manifest directory"""
-        return Path(self.get('manifest_dir', self._get_default_manifest_dir()))
-        
+        found = find_manifest_directory(self)
+        if found:
+            return found
+        return Path(self.get_str('manifest_dir') or self._get_default_manifest_dir())
+    
+    def get_game_directories(self) -> List[str]:
+        """Get the directories games are installed to"""
+        return self.get_list('game_directories')
+    
     def add_game_directory(self, path: str):
         """Add a game directory to scan list"""
-        dirs = self.get('game_directories', [])
-        if path not in dirs:
-            dirs.append(path)
-            self.set('game_directories', dirs)
-            
+        with self.transaction() as config:
+            dirs = config.setdefault('game_directories', [])
+            if path not in dirs:
+                dirs.append(path)
+    
     def remove_game_directory(self, path: str):
         """Remove a game directory from scan list"""
-        dirs = self.get('game_directories', [])
-        if path in dirs:
-            dirs.remove(path)
-            self.set('game_directories', dirs)
\ No newline at end of file
+        with self.transaction() as config:
+            dirs = config.setdefault('game_directories', [])
+            if path in dirs:
+                dirs.remove(path)
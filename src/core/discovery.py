@@ -0,0 +1,184 @@
+"""Manifest directory discovery for Epic Games Manager"""
+
+import glob
+import os
+import string
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+# Location of the manifests below a Windows system drive or Wine drive_c
+MANIFESTS_SUBPATH = Path('ProgramData') / 'Epic' / 'EpicGamesLauncher' / 'Data' / 'Manifests'
+
+# Wine/Proton prefix locations used by the common Linux launchers
+WINE_PREFIX_PATTERNS = [
+    '~/.wine',
+    '~/Games/*',                                               # Lutris
+    '~/Games/Heroic/Prefixes/*',                               # Heroic
+    '~/.local/share/Steam/steamapps/compatdata/*/pfx',         # Proton
+    '~/.steam/steam/steamapps/compatdata/*/pfx',
+    '~/.var/app/com.usebottles.bottles/data/bottles/bottles/*',
+]
+
+# Where other operating systems' partitions usually get mounted
+MOUNT_PATTERNS = ['/mnt/*', '/media/*', '/media/*/*', '/run/media/*/*', '/Volumes/*']
+
+
+def _windows_drives() -> List[str]:
+    """Get the root of every mounted Windows drive, e.g. ``['C:\\\\', 'D:\\\\']``"""
+    try:
+        import ctypes
+        bitmask = ctypes.windll.kernel32.GetLogicalDrives()
+    except (ImportError, AttributeError, OSError):
+        return [f'{letter}:\\' for letter in 'CD']
+    return [f'{letter}:\\' for i, letter in enumerate(string.ascii_uppercase) if bitmask & (1 << i)]
+
+
+def _wine_prefixes() -> List[Path]:
+    """Get every Wine prefix that looks like it could hold the launcher"""
+    prefixes = []
+    if os.environ.get('WINEPREFIX'):
+        prefixes.append(Path(os.environ['WINEPREFIX']))
+    for pattern in WINE_PREFIX_PATTERNS:
+        prefixes.extend(Path(p) for p in sorted(glob.glob(os.path.expanduser(pattern))))
+    return prefixes
+
+
+def candidate_manifest_dirs() -> List[Path]:
+    """Get every place the manifest directory may live, most likely first.
+
+    Returns:
+        Ordered, de-duplicated list of candidate directories
+    """
+    candidates: List[Path] = []
+
+    if os.name == 'nt':
+        program_data = os.environ.get('PROGRAMDATA')
+        if program_data:
+            candidates.append(Path(program_data) / MANIFESTS_SUBPATH.relative_to('ProgramData'))
+        candidates.extend(Path(drive) / MANIFESTS_SUBPATH for drive in _windows_drives())
+    elif sys.platform == 'darwin':
+        candidates.append(Path.home() / 'Library' / 'Application Support' / 'Epic'
+                          / 'EpicGamesLauncher' / 'Data' / 'Manifests')
+    elif os.name == 'posix':
+        candidates.append(Path.home() / '.config' / 'Epic' / 'EpicGamesLauncher' / 'Data' / 'Manifests')
+        candidates.extend(prefix / 'drive_c' / MANIFESTS_SUBPATH for prefix in _wine_prefixes())
+
+    if os.name == 'posix':
+        # Windows partitions mounted alongside the running system
+        for pattern in MOUNT_PATTERNS:
+            candidates.extend(Path(p) / MANIFESTS_SUBPATH for p in sorted(glob.glob(pattern)))
+
+    seen = set()
+    unique = []
+    for candidate in candidates:
+        if candidate not in seen:
+            seen.add(candidate)
+            unique.append(candidate)
+    return unique
+
+
+def default_manifest_dir() -> Optional[Path]:
+    """Get the conventional manifest directory for this platform, existing or not"""
+    candidates = candidate_manifest_dirs()
+    return candidates[0] if candidates else None
+
+
+class ManifestDirectoryLocator:
+    """Finds the Epic Games manifest directory and remembers it in config.
+
+    A directory remembered from an earlier run is revalidated with a single
+    stat. Only when that fails is every candidate probed, in parallel, with the
+    most likely existing candidate winning.
+    """
+
+    CONFIG_KEY = 'manifest_dir'
+
+    def __init__(self, config=None, max_workers: int = 16):
+        """Initialize the locator.
+
+        Args:
+            config: Optional Config instance used to remember the result
+            max_workers: Maximum number of candidates probed concurrently
+        """
+        self.config = config
+        self.max_workers = max_workers
+
+    def locate(self, refresh: bool = False) -> Optional[Path]:
+        """Find the manifest directory.
+
+        Args:
+            refresh: Ignore the remembered directory and probe again
+
+        Returns:
+            Path to the manifest directory or None if none was found
+        """
+        if not refresh and self.config is not None:
+            remembered = self.config.get(self.CONFIG_KEY)
+            if remembered and os.path.isdir(remembered):
+                return Path(remembered)
+
+        found = self.probe(candidate_manifest_dirs())
+        if found is not None and self.config is not None:
+            if self.config.get(self.CONFIG_KEY) != str(found):
+                self.config.set(self.CONFIG_KEY, str(found))
+        return found
+
+    def probe(self, candidates: List[Path]) -> Optional[Path]:
+        """Check candidates concurrently and return the first one that exists.
+
+        Candidates on slow or sleeping drives and network mounts are checked
+        at the same time, so the slowest one bounds the total cost.
+
+        Args:
+            candidates: Directories in order of preference
+
+        Returns:
+            The first existing directory or None
+        """
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0] if candidates[0].is_dir() else None
+
+        workers = min(self.max_workers, len(candidates))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            exists = list(executor.map(os.path.isdir, candidates))
+        for candidate, found in zip(candidates, exists):
+            if found:
+                return candidate
+        return None
+
+
+# Not probed yet; a probe that found nothing is remembered as None
+_UNRESOLVED = object()
+_resolved = _UNRESOLVED
+_resolved_lock = threading.Lock()
+
+
+def find_manifest_directory(config=None, refresh: bool = False) -> Optional[Path]:
+    """Get the manifest directory, shared by every entry point in the process.
+
+    The result is probed for once per process, including when nothing was
+    found, so a machine without the launcher does not re-run the probe on
+    every call.
+
+    Args:
+        config: Config instance to remember the result in; a new one is
+            created when omitted
+        refresh: Discard any remembered result and probe again
+
+    Returns:
+        Path to the manifest directory or None if none was found
+    """
+    global _resolved
+    with _resolved_lock:
+        if _resolved is not _UNRESOLVED and not refresh:
+            return _resolved
+        if config is None:
+            from .config import Config
+            config = Config()
+        _resolved = ManifestDirectoryLocator(config).locate(refresh=refresh)
+        return _resolved
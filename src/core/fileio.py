@@ -0,0 +1,79 @@
+"""Crash-safe file helpers for Epic Games Manager"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+
+def fsync_directory(directory: Path):
+    """Flush a directory entry so a rename inside it survives a crash"""
+    if os.name == 'nt':  # Directories cannot be opened for fsync on Windows
+        return
+    fd = os.open(str(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = 'utf-8', durable: bool = True):
+    """Replace a file's contents so readers see either the old or new version.
+
+    The text goes to a temporary file in the same directory, which is then
+    renamed over the target.
+
+    Args:
+        path: File to write
+        text: New contents
+        encoding: Text encoding
+        durable: fsync the data and the directory before returning
+    """
+    atomic_write_bytes(path, text.encode(encoding), durable=durable)
+
+
+def atomic_write_bytes(path: Path, data: bytes, durable: bool = True):
+    """Binary counterpart of atomic_write_text"""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, str(path))
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    if durable:
+        fsync_directory(path.parent)
+
+
+def atomic_write_json(path: Path, data: Any, durable: bool = True, **dump_kwargs):
+    """Serialize data as JSON and write it with atomic_write_text"""
+    dump_kwargs.setdefault('indent', 2)
+    atomic_write_text(path, json.dumps(data, **dump_kwargs), durable=durable)
+
+
+def quarantine(path: Path) -> Optional[Path]:
+    """Move an unreadable file aside instead of silently losing it.
+
+    Args:
+        path: File that failed to parse
+
+    Returns:
+        Where the file was moved, or None if it could not be moved
+    """
+    path = Path(path)
+    target = path.with_name(f"{path.name}.corrupt-{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    try:
+        os.replace(str(path), str(target))
+        return target
+    except OSError:
+        return None
@@ -0,0 +1,303 @@
+"""HTTP helpers: keep-alive connection pooling and a revalidating response cache"""
+
+import hashlib
+import http.client
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .fileio import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class HttpError(Exception):
+    """Raised when a server answers with an unexpected status"""
+
+    def __init__(self, message: str, status: int):
+        super().__init__(message)
+        self.status = status
+
+
+class ConnectionPool:
+    """Keep-alive HTTP connections per host, shared by worker threads.
+
+    A request takes an idle connection for its host (or opens one) and
+    returns it afterwards, so a batch of requests to one service reuses a
+    handful of connections instead of connecting once per request.
+    """
+
+    def __init__(self, timeout: float = 15.0, max_idle_per_host: int = 16):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.connections_opened = 0
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        with self._lock:
+            self.connections_opened += 1
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None
+                ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a request and read the whole response.
+
+        Returns:
+            Tuple of (status, headers, body)
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        reused = connection is not None
+        if connection is None:
+            connection = self._connect(*key)
+
+        try:
+            connection.request(method, path, headers=headers or {})
+            response = connection.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            if not reused:
+                raise
+            # The server closed an idle keep-alive connection; try a fresh one once
+            connection = self._connect(*key)
+            try:
+                connection.request(method, path, headers=headers or {})
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+        return response.status, response.headers, body
+
+    def close(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+
+@dataclass
+class CachedResponse:
+    """A response served by CachedHttpClient.
+
+    ``source`` tells where the body came from: 'network' (a full response),
+    'revalidated' (the server answered 304 Not Modified), 'cache' (still
+    fresh, no request made) or 'stale' (the server was unreachable or
+    failing and an expired copy was served).
+    """
+
+    url: str
+    status: int
+    body: bytes
+    fetched_at: float
+    source: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def stale(self) -> bool:
+        return self.source == 'stale'
+
+    @property
+    def changed(self) -> bool:
+        """True if the body was (re)downloaded rather than reused"""
+        return self.source == 'network'
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class CachedHttpClient:
+    """GET client with an on-disk response cache and conditional revalidation.
+
+    A cached response younger than ``ttl`` is returned without touching the
+    network. Older ones are revalidated with If-None-Match/If-Modified-Since,
+    so an unchanged resource costs a 304 with an empty body. If the server
+    cannot be reached or answers with a server error, the expired copy is
+    served instead of failing. Requests go through a ConnectionPool, so
+    repeated checks reuse one keep-alive connection.
+
+    Each URL is cached as one file (a JSON metadata line followed by the raw
+    body) replaced atomically, so concurrent processes never read a torn
+    entry. The last entry read per URL is also kept in memory and reused
+    while the file is unchanged.
+    """
+
+    CACHEABLE_HEADERS = ('Content-Type', 'Date', 'Cache-Control')
+
+    def __init__(self, cache_dir: Optional[Path] = None, ttl: float = 3600.0,
+                 pool: Optional[ConnectionPool] = None, timeout: float = 15.0,
+                 clock: Callable[[], float] = time.time):
+        """Initialize the client.
+
+        Args:
+            cache_dir: Directory for cached responses
+            ttl: Seconds a response is used without revalidating it
+            pool: Connection pool to send requests through
+            timeout: Socket timeout for a new pool
+            clock: Wall clock, replaceable for testing
+        """
+        self.cache_dir = Path(cache_dir or Path.home() / '.epic-games-manager' / 'http-cache')
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.pool = pool or ConnectionPool(timeout=timeout)
+        self._clock = clock
+        self._memory: Dict[str, Tuple[Tuple[int, int, int], CachedResponse]] = {}
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.cache"
+
+    @staticmethod
+    def _signature(path: Path) -> Tuple[int, int, int]:
+        stat = path.stat()
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _load(self, url: str) -> Optional[CachedResponse]:
+        path = self._entry_path(url)
+        try:
+            signature = self._signature(path)
+            remembered = self._memory.get(url)
+            if remembered is not None and remembered[0] == signature:
+                return replace(remembered[1])
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except FileNotFoundError:
+            self._memory.pop(url, None)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+            return None
+        if meta.get('url') != url or meta.get('size') != len(body):
+            return None
+        response = CachedResponse(url=url, status=meta['status'], body=body,
+                                  fetched_at=meta['fetched_at'], source='cache',
+                                  etag=meta.get('etag'), last_modified=meta.get('last_modified'),
+                                  headers=meta.get('headers', {}))
+        self._memory[url] = (signature, response)
+        return replace(response)
+
+    def _store(self, response: CachedResponse):
+        meta = {
+            'url': response.url,
+            'status': response.status,
+            'fetched_at': response.fetched_at,
+            'etag': response.etag,
+            'last_modified': response.last_modified,
+            'headers': response.headers,
+            'size': len(response.body),
+        }
+        data = json.dumps(meta).encode('utf-8') + b'\n' + response.body
+        path = self._entry_path(response.url)
+        try:
+            atomic_write_bytes(path, data, durable=False)
+            self._memory[response.url] = (self._signature(path), replace(response, source='cache'))
+        except OSError as e:
+            logger.warning("Could not cache response for %s: %s", response.url, e)
+
+    def cached(self, url: str) -> Optional[CachedResponse]:
+        """The cached response for a URL, however old, without any request"""
+        return self._load(url)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            ttl: Optional[float] = None, allow_stale: bool = True) -> CachedResponse:
+        """Fetch a URL through the cache.
+
+        Args:
+            url: URL to fetch
+            headers: Extra request headers
+            ttl: Override the client's freshness lifetime (0 always revalidates)
+            allow_stale: Serve an expired copy when the server is unreachable
+
+        Returns:
+            The response
+
+        Raises:
+            HttpError: If the server answers with an error and nothing usable is cached
+            OSError: If the server cannot be reached and nothing usable is cached
+        """
+        ttl = self.ttl if ttl is None else ttl
+        cached = self._load(url)
+        now = self._clock()
+        if cached is not None and 0 <= now - cached.fetched_at < ttl:
+            return cached
+
+        request_headers = dict(headers or {})
+        if cached is not None:
+            if cached.etag:
+                request_headers['If-None-Match'] = cached.etag
+            if cached.last_modified:
+                request_headers['If-Modified-Since'] = cached.last_modified
+
+        try:
+            status, response_headers, body = self.pool.request('GET', url, request_headers)
+        except (OSError, http.client.HTTPException) as e:
+            if cached is None or not allow_stale:
+                raise
+            logger.warning("Serving cached %s from %s: %s", url,
+                           time.strftime('%Y-%m-%d %H:%M', time.localtime(cached.fetched_at)), e)
+            cached.source = 'stale'
+            return cached
+
+        if status == 304 and cached is not None:
+            cached.fetched_at = now
+            cached.source = 'revalidated'
+            cached.etag = response_headers.get('ETag') or cached.etag
+            cached.last_modified = response_headers.get('Last-Modified') or cached.last_modified
+            self._store(cached)
+            return cached
+
+        if status == 200:
+            response = CachedResponse(
+                url=url, status=status, body=body, fetched_at=now, source='network',
+                etag=response_headers.get('ETag'),
+                last_modified=response_headers.get('Last-Modified'),
+                headers={name: response_headers[name] for name in self.CACHEABLE_HEADERS
+                         if response_headers.get(name) is not None})
+            if 'no-store' not in response.headers.get('Cache-Control', ''):
+                self._store(response)
+            return response
+
+        if cached is not None and allow_stale and status >= 500:
+            logger.warning("Serving cached %s: server answered HTTP %d", url, status)
+            cached.source = 'stale'
+            return cached
+        raise HttpError(f"HTTP {status} for {url}", status)
+
+    def invalidate(self, url: str):
+        """Drop the cached response for a URL"""
+        self._memory.pop(url, None)
+        try:
+            self._entry_path(url).unlink()
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        self.pool.close()
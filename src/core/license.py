@@ -3,9 +3,162 @@
 import hashlib
 import json
 import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, FrozenSet, Tuple
+
+from .fileio import atomic_write_json
+from .locking import FileLock
+
+FEATURES = ('scan_library', 'repair_single', 'view_free_games', 'basic_backup', 'batch_repair',
+            'auto_sync', 'cloud_backup', 'automation', 'priority_support')
+
+FREE_FEATURES = frozenset({'scan_library', 'repair_single', 'view_free_games', 'basic_backup'})
+
+# Features enabled by each tier; unknown tiers get the free ones
+TIER_FEATURES: Dict[str, FrozenSet[str]] = {
+    'free': FREE_FEATURES,
+    'pro': frozenset(FEATURES),
+    'team': frozenset(FEATURES),
+}
+
+
+def _config_dir() -> Path:
+    """Get platform-specific config directory"""
+    if os.name == 'nt':  # Windows
+        base = Path(os.environ.get('APPDATA', ''))
+    else:  # macOS/Linux
+        base = Path.home() / '.config'
+    return base / 'epic-games-manager'
+
+
+def _parse_expiry(data: Dict[str, Any]) -> Tuple[bool, Optional[datetime]]:
+    """Whether the expiry date is readable, and the date (None for lifetime licenses)"""
+    if not data.get('valid_until'):
+        return True, None
+    try:
+        return True, datetime.fromisoformat(data['valid_until'])
+    except (TypeError, ValueError):
+        return False, None
+
+
+def validate_license_data(data: Optional[Dict[str, Any]]) -> bool:
+    """Validate license data integrity"""
+    if not data or 'key' not in data or 'checksum' not in data:
+        return False
+        
+    # Verify checksum
+    expected_checksum = hashlib.sha256(data['key'].encode()).hexdigest()
+    if expected_checksum != data['checksum']:
+        return False
+        
+    # Check expiration if set
+    readable, expiry = _parse_expiry(data)
+    if not readable:
+        return False
+    return expiry is None or datetime.now() <= expiry
+
+
+# Signature that never matches a file, forcing the next check to read it
+_UNREAD = object()
+
+
+class Entitlements:
+    """Cached tier and features of the license in one license file.
+    
+    The file is read and validated once; after that it is only stat()ed,
+    at most every ``check_interval`` seconds, and re-read when its size or
+    mtime changes. Feature checks are set lookups, cheap enough for hot
+    paths. Use get_entitlements() to share one instance per file across
+    the process.
+    """
+    
+    def __init__(self, license_file: Path, check_interval: float = 1.0):
+        self.license_file = Path(license_file)
+        self.check_interval = check_interval
+        self._lock = FileLock.for_file(self.license_file)
+        self._thread_lock = threading.Lock()
+        self._signature = _UNREAD
+        self._checked_at = None
+        self._tier = 'free'
+        self._features = FREE_FEATURES
+        self._expires_at: Optional[datetime] = None
+        
+    def _file_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = self.license_file.stat()
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+        
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with self._lock.shared():
+                with open(self.license_file, 'r') as f:
+                    data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return data if isinstance(data, dict) else None
+        
+    def _refresh(self):
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._thread_lock:
+            self._checked_at = now
+            signature = self._file_signature()
+            if signature != self._signature:
+                self._signature = signature
+                data = self._load() if signature is not None else None
+                if validate_license_data(data):
+                    self._tier = data.get('tier', 'free')
+                    self._expires_at = _parse_expiry(data)[1]
+                else:
+                    self._tier = 'free'
+                    self._expires_at = None
+            if self._expires_at is not None and datetime.now() > self._expires_at:
+                self._tier = 'free'
+                self._expires_at = None
+            self._features = TIER_FEATURES.get(self._tier, FREE_FEATURES)
+            
+    def invalidate(self):
+        """Re-read the file on the next check, e.g. after writing it"""
+        with self._thread_lock:
+            self._signature = _UNREAD
+            self._checked_at = None
+            
+    @property
+    def tier(self) -> str:
+        """Tier of the active license, 'free' if there is no valid one"""
+        self._refresh()
+        return self._tier
+        
+    def has(self, feature: str) -> bool:
+        """Whether the active license enables a feature"""
+        self._refresh()
+        return feature in self._features
+        
+    def features(self) -> Dict[str, bool]:
+        """Every known feature and whether it is enabled"""
+        self._refresh()
+        return {feature: feature in self._features for feature in FEATURES}
+
+
+_services: Dict[Path, Entitlements] = {}
+_services_lock = threading.Lock()
+
+
+def get_entitlements(license_file: Optional[Path] = None) -> Entitlements:
+    """The process-wide Entitlements for a license file (default: the user's)"""
+    path = Path(license_file) if license_file else _config_dir() / "license.json"
+    with _services_lock:
+        service = _services.get(path)
+        if service is None:
+            service = _services[path] = Entitlements(path)
+        return service
+
 
 class LicenseValidator:
     """Handles license validation and tier management"""
@@ -14,25 +167,20 @@ class LicenseValidator:
         self.config_dir = self._get_config_dir()
         self.license_file = self.config_dir / "license.json"
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = FileLock.for_file(self.license_file)
+        self.entitlements = get_entitlements(self.license_file)
         
     def _get_config_dir(self) -> Path:
         """Get platform-specific config directory"""
-        if os.name == 'nt':  # Windows
-            base = Path(os.environ.get('APPDATA', ''))
-        else:  # macOS/Linux
-            base = Path.home() / '.config'
-        return base / 'epic-games-manager'
+        return _config_dir()
         
     def get_tier(self) -> str:
         """Get current license tier"""
-        license_data = self._load_license()
-        if not license_data:
-            return "free"
-            
-        # Validate license is still valid
-        if self._validate_license_data(license_data):
-            return license_data.get('tier', 'free')
-        return "free"
+        return self.entitlements.tier
+        
+    def has_feature(self, feature: str) -> bool:
+        """Whether the current license enables a feature"""
+        return self.entitlements.has(feature)
         
     def activate(self, license_key: str) -> Dict[str, Any]:
         """Activate a license key"""
@@ -76,8 +224,10 @@ class LicenseValidator:
         
     def deactivate(self):
         """Deactivate current license"""
-        if self.license_file.exists():
-            self.license_file.unlink()
+        with self._lock.exclusive():
+            if self.license_file.exists():
+                self.license_file.unlink()
+        self.entitlements.invalidate()
             
     def _load_license(self) -> Optional[Dict[str, Any]]:
         """Load license data from file"""
@@ -85,65 +235,25 @@ class LicenseValidator:
             return None
             
         try:
-            with open(self.license_file, 'r') as f:
-                return json.load(f)
+            with self._lock.shared():
+                with open(self.license_file, 'r') as f:
+                    return json.load(f)
         except:
             return None
             
     def _save_license(self, data: Dict[str, Any]):
         """Save license data to file"""
-        with open(self.license_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        with self._lock.exclusive():
+            atomic_write_json(self.license_file, data)
+        self.entitlements.invalidate()
             
     def _validate_license_data(self, data: Dict[str, Any]) -> bool:
         """Validate license data integrity"""
-        if not data or 'key' not in data or 'checksum' not in data:
-            return False
-            
-        # Verify checksum
-        expected_checksum = hashlib.sha256(data['key'].encode()).hexdigest()
-        if expected_checksum != data['checksum']:
-            return False
-            
-        # Check expiration if set
-        if data.get('valid_until'):
-            try:
-                expiry = datetime.fromisoformat(data['valid_until'])
-                if datetime.now() > expiry:
-                    return False
-            except:
-                return False
-                
-        return True
+        return validate_license_data(data)
         
     def get_features(self, tier: Optional[str] = None) -> Dict[str, bool]:
         """Get available features for a tier"""
         if tier is None:
-            tier = self.get_tier()
-            
-        features = {
-            'free': {
-                'scan_library': True,
-                'repair_single': True,
-                'view_free_games': True,
-                'basic_backup': True,
-                'batch_repair': False,
-                'auto_sync': False,
-                'cloud_backup': False,
-                'automation': False,
-                'priority_support': False
-            },
-            'pro': {
-                'scan_library': True,
-                'repair_single': True,
-                'view_free_games': True,
-                'basic_backup': True,
-                'batch_repair': True,
-                'auto_sync': True,
-                'cloud_backup': True,
-                'automation': True,
-                'priority_support': True
-            }
-        }
-        
-        return features.get(tier, features['free'])
\ No newline at end of file
+            return self.entitlements.features()
+        enabled = TIER_FEATURES.get(tier, FREE_FEATURES)
+        return {feature: feature in enabled for feature in FEATURES}
\ No newline at end of file
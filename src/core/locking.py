@@ -0,0 +1,140 @@
+"""Cross-process file locking for Epic Games Manager"""
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a lock cannot be acquired within its timeout"""
+
+
+# Locks held by each thread, keyed by lock file, so nested acquisitions by the
+# same thread (a Config.set inside a Config transaction) do not deadlock
+_held = threading.local()
+
+
+def _holdings() -> Dict[str, Tuple[str, int]]:
+    if not hasattr(_held, 'locks'):
+        _held.locks = {}
+    return _held.locks
+
+
+class FileLock:
+    """Advisory reader/writer lock shared between processes and threads.
+
+    The lock lives in a separate ``.lock`` file so the protected file can be
+    replaced atomically while the lock is held. Uses ``flock`` on POSIX; on
+    Windows ``msvcrt.locking`` has no shared mode, so readers lock
+    exclusively there.
+    """
+
+    def __init__(self, lock_path: Path, timeout: float = 10.0, poll_interval: float = 0.01):
+        """Initialize the lock.
+
+        Args:
+            lock_path: Lock file to use; created on first acquisition
+            timeout: Seconds to wait before raising LockTimeout
+            poll_interval: Initial delay between attempts, doubled up to 0.02s
+        """
+        self.lock_path = Path(lock_path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    @classmethod
+    def for_file(cls, path: Path, **kwargs) -> 'FileLock':
+        """Lock guarding a file, kept next to it as ``<name>.lock``"""
+        path = Path(path)
+        return cls(path.with_name(path.name + '.lock'), **kwargs)
+
+    @classmethod
+    def for_directory(cls, directory: Path, **kwargs) -> 'FileLock':
+        """Lock guarding a directory we do not own, kept in our own lock folder.
+
+        Keeps lock files out of directories such as the Epic manifest folder.
+        """
+        digest = hashlib.sha1(str(Path(directory).resolve()).encode('utf-8')).hexdigest()[:16]
+        lock_dir = Path.home() / '.epic-games-manager' / 'locks'
+        return cls(lock_dir / f"{Path(directory).name or 'root'}-{digest}.lock", **kwargs)
+
+    @contextmanager
+    def shared(self, timeout: Optional[float] = None):
+        """Hold the lock for reading; other readers may hold it at the same time"""
+        with self._acquire('shared', timeout):
+            yield self
+
+    @contextmanager
+    def exclusive(self, timeout: Optional[float] = None):
+        """Hold the lock for writing; no other holder is allowed"""
+        with self._acquire('exclusive', timeout):
+            yield self
+
+    @contextmanager
+    def _acquire(self, mode: str, timeout: Optional[float]):
+        key = str(self.lock_path)
+        holdings = _holdings()
+        held = holdings.get(key)
+        if held is not None:
+            held_mode, depth = held
+            if mode == 'exclusive' and held_mode == 'shared':
+                raise RuntimeError(f"Cannot upgrade a shared lock on {key} to exclusive")
+            holdings[key] = (held_mode, depth + 1)
+            try:
+                yield
+            finally:
+                holdings[key] = (held_mode, depth)
+            return
+
+        fd = self._lock(mode, self.timeout if timeout is None else timeout)
+        holdings[key] = (mode, 1)
+        try:
+            yield
+        finally:
+            del holdings[key]
+            self._unlock(fd)
+
+    def _lock(self, mode: str, timeout: float) -> int:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + timeout
+        delay = self.poll_interval
+        while True:
+            try:
+                self._try_lock(fd, mode)
+                return fd
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"Timed out after {timeout}s waiting for {self.lock_path}")
+                time.sleep(delay)
+                # Keep retrying often so a busy lock does not starve late arrivals
+                delay = min(delay * 2, 0.02)
+
+    @staticmethod
+    def _try_lock(fd: int, mode: str):
+        if os.name == 'nt':
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            flag = fcntl.LOCK_SH if mode == 'shared' else fcntl.LOCK_EX
+            fcntl.flock(fd, flag | fcntl.LOCK_NB)
+
+    @staticmethod
+    def _unlock(fd: int):
+        try:
+            if os.name == 'nt':
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
@@ -0,0 +1,180 @@
+"""Structured, rate-limited logging for loops over a whole library
+
+A scan or relocation touches every game, and a line per game per step
+floods the log (and the GUI's log view) on large libraries. LoopLog logs
+the first few records of each category in full and only counts the rest,
+then logs one summary line per category, e.g. "Skipped 4,812 games not
+found in new location". Records are lazy (%-style arguments are formatted
+only if a handler takes the record) and carry their category and fields
+as attributes, which JsonFormatter writes out as JSON lines.
+"""
+
+import json
+import logging
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Union
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class LoopLog:
+    """Per-category rate limiting and summaries for log records in a loop.
+
+    Example::
+
+        with LoopLog(logger, summaries={
+                'skipped': "Skipped {count:,} games not found in new location"}) as log:
+            for game in games:
+                log.info('skipped', "Skipping %s: not found in new location", game.display_name,
+                         app_name=game.app_name)
+    """
+
+    # Records logged in full per category unless a limit is given; raise it
+    # to see every record while debugging
+    DEFAULT_LIMIT = 5
+
+    def __init__(self, logger: logging.Logger, limit: Optional[int] = None,
+                 summaries: Optional[Dict[str, str]] = None, summary_level: int = logging.INFO):
+        """Initialize the loop log.
+
+        Args:
+            logger: Logger the records go to
+            limit: Records logged in full per category (default DEFAULT_LIMIT);
+                later ones are only counted
+            summaries: Summary line per category, formatted with ``count`` and
+                ``suppressed``; logged by close() when the category occurred
+            summary_level: Level of the summary lines
+        """
+        self.logger = logger
+        self.limit = self.DEFAULT_LIMIT if limit is None else limit
+        self.summaries = summaries or {}
+        self.summary_level = summary_level
+        self.counts: Counter = Counter()
+        self.suppressed: Counter = Counter()
+
+    def log(self, category: str, level: int, msg: str, *args: Any, **fields: Any):
+        """Count a record and log it if its category is still under the limit"""
+        self._log(category, level, msg, args, fields)
+
+    def debug(self, category: str, msg: str, *args: Any, **fields: Any):
+        self._log(category, logging.DEBUG, msg, args, fields)
+
+    def info(self, category: str, msg: str, *args: Any, **fields: Any):
+        self._log(category, logging.INFO, msg, args, fields)
+
+    def warning(self, category: str, msg: str, *args: Any, **fields: Any):
+        self._log(category, logging.WARNING, msg, args, fields)
+
+    def error(self, category: str, msg: str, *args: Any, **fields: Any):
+        self._log(category, logging.ERROR, msg, args, fields)
+
+    def _log(self, category: str, level: int, msg: str, args: tuple, fields: Dict[str, Any]):
+        self.counts[category] += 1
+        if self.counts[category] > self.limit:
+            self.suppressed[category] += 1
+            return
+        if self.logger.isEnabledFor(level):
+            fields['category'] = category
+            # Attribute the record to whoever called log()/info()/...
+            self.logger.log(level, msg, *args, extra=fields, stacklevel=3)
+
+    def close(self):
+        """Log the summary line of every category that occurred.
+
+        Categories without a summary line get a generic note if some of
+        their records were suppressed.
+        """
+        for category, count in self.counts.items():
+            template = self.summaries.get(category)
+            suppressed = self.suppressed[category]
+            if template is None:
+                if not suppressed:
+                    continue
+                template = "{suppressed:,} more '{category}' records not logged"
+            if self.logger.isEnabledFor(self.summary_level):
+                self.logger.log(self.summary_level,
+                                template.format(count=count, suppressed=suppressed, category=category),
+                                extra={'category': category, 'summary': True, 'count': count,
+                                       'suppressed': suppressed})
+        self.counts.clear()
+        self.suppressed.clear()
+
+    def __enter__(self) -> 'LoopLog':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line.
+
+    Carries the time, level, logger, message, exception text and every
+    field passed through ``extra`` (such as a LoopLog category).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class JsonLogHandler(logging.StreamHandler):
+    """Writes JSON-line records to a file or stream.
+
+    Writes are buffered, and the stream is flushed only for records at or
+    above ``flush_level`` and on close, so a run logging a line per game
+    is not slowed down by a flush per line.
+    """
+
+    def __init__(self, target: Union[Path, str, TextIO, None] = None, flush_level: int = logging.WARNING):
+        """Initialize the handler.
+
+        Args:
+            target: File to append to, or an open text stream; default stderr
+            flush_level: Lowest level that flushes the stream immediately
+        """
+        self._owns_stream = isinstance(target, (str, Path))
+        if self._owns_stream:
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            stream = open(target, 'a', encoding='utf-8')
+        else:
+            stream = target or sys.stderr
+        super().__init__(stream)
+        self.flush_level = flush_level
+        self.setFormatter(JsonFormatter())
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.stream.write(self.format(record) + '\n')
+            if record.levelno >= self.flush_level:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.acquire()
+        try:
+            try:
+                self.flush()
+                if self._owns_stream:
+                    self.stream.close()
+                    self.stream = None
+            finally:
+                super().close()
+        finally:
+            self.release()
@@ -0,0 +1,194 @@
+"""Timing spans and counters for the hot paths of Epic Games Manager
+
+Instrumentation is off by default. While it is off, span() hands back a
+shared no-op context manager, @timed calls straight through and incr()
+returns at once, so instrumented code costs a global lookup per call.
+enable() starts recording into process-wide tables; snapshot() reads them
+and to_json()/to_prometheus() export them. Names are dotted, e.g.
+``library.manifests_parsed`` or ``queue.journal_write``.
+"""
+
+import functools
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .fileio import atomic_write_text
+
+# Read directly by instrumented code to skip work entirely when off
+enabled = False
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_timings: Dict[str, List[float]] = {}  # name -> [count, total seconds, max seconds]
+_started_at = time.time()
+
+PROMETHEUS_PREFIX = 'epic_games_manager'
+
+
+def enable():
+    """Start recording spans and counters"""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """Stop recording; what was recorded so far is kept"""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Forget everything recorded so far"""
+    global _started_at
+    with _lock:
+        _counters.clear()
+        _timings.clear()
+        _started_at = time.time()
+
+
+def incr(name: str, value: float = 1):
+    """Add to a counter"""
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, seconds: float):
+    """Record one duration under a timing name"""
+    if not enabled:
+        return
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            _timings[name] = [1, seconds, seconds]
+        else:
+            timing[0] += 1
+            timing[1] += seconds
+            if seconds > timing[2]:
+                timing[2] = seconds
+
+
+class _Span:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    """Context manager timing its block under ``name``"""
+    return _Span(name) if enabled else _NULL_SPAN
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of a function under ``name``"""
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def snapshot() -> Dict[str, Any]:
+    """Copy of everything recorded so far.
+
+    Returns:
+        Dict with ``counters`` (name -> value) and ``timings`` (name ->
+        count, total_s, mean_ms, max_ms), plus the recording window
+    """
+    with _lock:
+        counters = dict(sorted(_counters.items()))
+        timings = {
+            name: {
+                'count': count,
+                'total_s': round(total, 6),
+                'mean_ms': round(total / count * 1000, 4),
+                'max_ms': round(longest * 1000, 4),
+            }
+            for name, (count, total, longest) in sorted(_timings.items())
+        }
+        started_at = _started_at
+    return {
+        'started_at': started_at,
+        'duration_s': round(time.time() - started_at, 6),
+        'counters': counters,
+        'timings': timings,
+    }
+
+
+def to_json(data: Optional[Dict[str, Any]] = None) -> str:
+    """A snapshot as indented JSON"""
+    return json.dumps(data or snapshot(), indent=2)
+
+
+def _metric_name(name: str) -> str:
+    return PROMETHEUS_PREFIX + '_' + re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def to_prometheus(data: Optional[Dict[str, Any]] = None) -> str:
+    """A snapshot in the Prometheus text exposition format.
+
+    Counters become ``<name>_total`` counters; timings become
+    ``<name>_seconds`` summaries (``_sum`` and ``_count``) with a
+    ``<name>_seconds_max`` gauge.
+    """
+    data = data or snapshot()
+    lines = []
+    for name, value in data['counters'].items():
+        metric = _metric_name(name) + '_total'
+        lines += [f'# TYPE {metric} counter', f'{metric} {value}']
+    for name, timing in data['timings'].items():
+        metric = _metric_name(name) + '_seconds'
+        lines += [f'# TYPE {metric} summary',
+                  f"{metric}_sum {timing['total_s']}",
+                  f"{metric}_count {timing['count']}",
+                  f'# TYPE {metric}_max gauge',
+                  f"{metric}_max {timing['max_ms'] / 1000}"]
+    return '\n'.join(lines) + '\n'
+
+
+def write_json(path: Union[Path, str]):
+    """Write a snapshot as JSON"""
+    atomic_write_text(Path(path), to_json() + '\n', durable=False)
+
+
+def write_prometheus(path: Union[Path, str]):
+    """Write a snapshot for the node exporter's textfile collector.
+
+    The file is replaced atomically, as the collector requires, so it never
+    reads a partly written file.
+    """
+    atomic_write_text(Path(path), to_prometheus(), durable=False)
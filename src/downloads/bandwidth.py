@@ -0,0 +1,82 @@
+"""Bandwidth shaping for Epic Games downloads"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all concurrent downloads.
+
+    Tokens are bytes. They refill at ``rate`` per second up to ``capacity``.
+    When several downloads are waiting, the highest-priority waiter is served
+    first, so a saturated link never starves a high-priority item.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the bucket.
+
+        Args:
+            rate: Sustained rate in bytes per second
+            capacity: Largest burst in bytes (defaults to one second's worth)
+            clock: Monotonic clock, replaceable for testing
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def consume(self, amount: int, priority: int = 0, timeout: Optional[float] = None) -> bool:
+        """Wait until ``amount`` bytes may be transferred.
+
+        Requests larger than the capacity are allowed once the bucket is full
+        and leave it in debt, so callers may use any chunk size.
+
+        Args:
+            amount: Bytes about to be transferred
+            priority: Higher values are served first
+            timeout: Give up after this many seconds
+
+        Returns:
+            True if the tokens were taken, False on timeout
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        ticket = (-priority, next(self._sequence))
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    self._refill()
+                    needed = min(amount, self.capacity)
+                    if self._waiters[0] == ticket and self._tokens >= needed:
+                        self._tokens -= amount
+                        return True
+
+                    if self._waiters[0] == ticket:
+                        wait = (needed - self._tokens) / self.rate
+                    else:
+                        wait = None  # Woken when the waiter ahead is served
+                    if deadline is not None:
+                        remaining = deadline - self._clock()
+                        if remaining <= 0:
+                            return False
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
@@ -0,0 +1,442 @@
+"""Chunked, resumable transfers for Epic Games downloads"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .bandwidth import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+CONTENT_RANGE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)$')
+
+# Bytes hashed per read while verifying chunks already on disk
+VERIFY_BLOCK_SIZE = 1024 * 1024
+
+
+class ChunkError(Exception):
+    """Raised when a chunk cannot be fetched or fails verification"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class DownloadPaused(Exception):
+    """Raised when a transfer stops because it was paused or cancelled"""
+
+
+def allocated_bytes(path: Path) -> int:
+    """Disk space a file takes up, 0 if it does not exist.
+
+    A sparse file takes up only the blocks written so far. Where no block
+    count is reported (Windows) the full size is taken, as NTFS allocates a
+    preallocated file in full.
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return 0
+    blocks = getattr(st, 'st_blocks', None)
+    return st.st_size if blocks is None else min(st.st_size, blocks * 512)
+
+
+class ChunkDatabase:
+    """Persistent record of which chunks of one download are complete.
+
+    Stored next to the partial file as ``<target>.chunks``: a JSON header
+    describing the remote file, then one line per finished chunk with its
+    SHA-256. Finishing a chunk is a single append, and the in-memory bitmap is
+    rebuilt from those lines on load. A torn final line from a crash is
+    ignored, so that chunk is simply fetched again.
+    """
+
+    def __init__(self, path: Path, on_done: Optional[Callable[[int], None]] = None):
+        """Initialize the database.
+
+        Args:
+            path: File the database is kept in
+            on_done: Called with a chunk's length whenever one is recorded
+        """
+        self.path = Path(path)
+        self.on_done = on_done
+        self.header: Dict[str, Any] = {}
+        self.bitmap = bytearray()
+        self.digests: Dict[int, str] = {}
+        self._handle = None
+        self._lock = threading.Lock()
+
+    @property
+    def chunk_count(self) -> int:
+        size, chunk_size = self.header['size'], self.header['chunk_size']
+        return -(-size // chunk_size)
+
+    def chunk_range(self, index: int) -> Tuple[int, int]:
+        """Start and end offset of a chunk"""
+        start = index * self.header['chunk_size']
+        return start, min(self.header['size'], start + self.header['chunk_size'])
+
+    def open(self, header: Dict[str, Any]) -> bool:
+        """Load the database if it matches ``header``, otherwise start afresh.
+
+        Args:
+            header: Description of the remote file (url, size, validators, chunk_size)
+
+        Returns:
+            True if earlier progress was found and kept
+        """
+        self.close()
+        if self._load() and self.header == header:
+            self._handle = open(self.path, 'ab')
+            return True
+        self.reset(header)
+        return False
+
+    def reset(self, header: Dict[str, Any]):
+        """Discard all progress and start a database for ``header``"""
+        self.close()
+        self.header = header
+        self.bitmap = bytearray(-(-self.chunk_count // 8))
+        self.digests = {}
+        self._rewrite()
+
+    def _rewrite(self):
+        """Write the header and every finished chunk to a fresh file"""
+        temp = self.path.with_name(self.path.name + '.tmp')
+        with open(temp, 'wb') as f:
+            f.write(json.dumps(self.header).encode('utf-8') + b'\n')
+            for index, digest in sorted(self.digests.items()):
+                f.write(json.dumps({'chunk': index, 'sha256': digest}).encode('utf-8') + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(str(temp), str(self.path))
+        self._handle = open(self.path, 'ab')
+
+    def _load(self) -> bool:
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, 'rb') as f:
+                self.header = json.loads(f.readline())
+                self.bitmap = bytearray(-(-self.chunk_count // 8))
+                self.digests = {}
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    self._set(record['chunk'], record['sha256'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return True
+
+    def _set(self, index: int, digest: str):
+        self.bitmap[index >> 3] |= 1 << (index & 7)
+        self.digests[index] = digest
+
+    def is_done(self, index: int) -> bool:
+        return bool(self.bitmap[index >> 3] & (1 << (index & 7)))
+
+    def missing(self):
+        """Indices of chunks that still need to be fetched"""
+        return [i for i in range(self.chunk_count) if not self.is_done(i)]
+
+    def mark_done(self, index: int, digest: str):
+        """Durably record a verified chunk"""
+        with self._lock:
+            self._handle.write(json.dumps({'chunk': index, 'sha256': digest}).encode('utf-8') + b'\n')
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self._set(index, digest)
+        if self.on_done is not None:
+            start, end = self.chunk_range(index)
+            self.on_done(end - start)
+
+    def discard(self, indices: Iterable[int]):
+        """Forget finished chunks so they are fetched again"""
+        with self._lock:
+            for index in indices:
+                self.bitmap[index >> 3] &= ~(1 << (index & 7))
+                self.digests.pop(index, None)
+            self.close()
+            self._rewrite()
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def remove(self):
+        self.close()
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ChunkedDownloader:
+    """Fetches a file as parallel HTTP Range requests that survive restarts.
+
+    Chunks are written in place into a preallocated ``<target>.part`` file.
+    Each chunk's SHA-256 is checked against the expected digest when one is
+    known, then recorded in the ChunkDatabase once the data is on disk. Every
+    Range response must cover exactly the requested bytes of the same remote
+    file, so a file that changes on the server is never mixed into chunks of
+    the old one. Chunks kept from an earlier run are re-hashed before the
+    download resumes, and the whole partial file is re-hashed before it is
+    renamed into place; chunks that no longer match are fetched again.
+    Servers without Range support fall back to a single, non-resumable stream.
+    """
+
+    def __init__(self, opener: Callable = urllib.request.urlopen, chunk_size: int = 8 * 1024 * 1024,
+                 connections: int = 4, block_size: int = 64 * 1024, timeout: float = 30.0,
+                 bucket: Optional[TokenBucket] = None):
+        """Initialize the downloader.
+
+        Args:
+            opener: urlopen-compatible callable used for requests
+            chunk_size: Bytes per Range request
+            connections: Chunks fetched in parallel per download
+            block_size: Bytes read per call to the bandwidth limiter
+            timeout: Socket timeout per request in seconds
+            bucket: Optional shared bandwidth limiter
+        """
+        self.opener = opener
+        self.chunk_size = chunk_size
+        self.connections = connections
+        self.block_size = block_size
+        self.timeout = timeout
+        self.bucket = bucket
+
+    def download(self, url: str, target: Path, priority: int = 0,
+                 should_stop: Callable[[], bool] = lambda: False,
+                 expected_digests: Optional[Sequence[str]] = None, sha256: Optional[str] = None,
+                 chunk_size: Optional[int] = None, on_allocated: Optional[Callable[[int], None]] = None):
+        """Download ``url`` to ``target``, resuming any earlier progress.
+
+        Args:
+            url: Source URL
+            target: Final file path
+            priority: Priority passed to the bandwidth limiter
+            should_stop: Polled between blocks; True pauses the transfer
+            expected_digests: Optional SHA-256 hex digest per chunk
+            sha256: Optional SHA-256 hex digest of the whole file
+            chunk_size: Bytes per chunk, when expected_digests were computed
+                for another size than the downloader's
+            on_allocated: Called with the disk space the partial file takes
+                up, after it is preallocated and after every chunk
+
+        Raises:
+            DownloadPaused: If should_stop returned True
+            ChunkError: If the server misbehaves or a chunk fails verification
+            urllib.error.URLError, OSError: On network or disk errors
+        """
+        target = Path(target)
+        partial = target.with_name(target.name + '.part')
+        size, etag, last_modified, ranges = self._probe(url)
+        if size is None or not ranges:
+            digest = self._stream(url, partial, priority, should_stop)
+            if sha256 is not None and digest != sha256:
+                partial.unlink()
+                raise ChunkError(f"checksum mismatch in {target.name}")
+            os.replace(str(partial), str(target))
+            return
+
+        chunk_size = chunk_size or self.chunk_size
+        if expected_digests is not None and len(expected_digests) != -(-size // chunk_size):
+            raise ChunkError(f"{len(expected_digests)} chunk digests given for {size} bytes "
+                             f"in chunks of {chunk_size}", retryable=False)
+
+        def report_allocation(*_):
+            if on_allocated is not None:
+                on_allocated(allocated_bytes(partial))
+
+        database = ChunkDatabase(target.with_name(target.name + '.chunks'), on_done=report_allocation)
+        header = {'url': url, 'size': size, 'etag': etag, 'last_modified': last_modified,
+                  'chunk_size': chunk_size}
+        resumed = database.open(header)
+        if resumed and not partial.exists():
+            database.reset(header)
+            resumed = False
+
+        # The first failing chunk stops the others instead of letting them run on
+        failed = threading.Event()
+
+        def stop_requested():
+            return failed.is_set() or should_stop()
+
+        try:
+            if resumed:
+                corrupt = self._verify(partial, database, sorted(database.digests),
+                                       expected_digests, should_stop)
+                if corrupt:
+                    logger.warning("Fetching %d corrupt chunks of %s again", len(corrupt), target.name)
+                    database.discard(corrupt)
+                logger.info("Resuming %s: %d of %d chunks already present",
+                            target.name, len(database.digests), database.chunk_count)
+            else:
+                with open(partial, 'wb') as f:
+                    f.truncate(size)
+            report_allocation()
+
+            missing = database.missing()
+            if missing:
+                errors = []
+                workers = min(self.connections, len(missing))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [executor.submit(self._fetch_chunk, url, partial, database, index,
+                                               priority, stop_requested, expected_digests)
+                               for index in missing]
+                    for future in futures:
+                        try:
+                            future.result()
+                        except Exception as e:
+                            failed.set()
+                            errors.append(e)
+                # Report the root cause rather than the pauses it triggered
+                for error in errors:
+                    if not isinstance(error, DownloadPaused):
+                        raise error
+                if errors:
+                    raise errors[0]
+
+            # Check what is on disk before it replaces the target
+            whole = hashlib.sha256()
+            corrupt = self._verify(partial, database, range(database.chunk_count),
+                                   expected_digests, should_stop, whole)
+            if corrupt:
+                database.discard(corrupt)
+                raise ChunkError(f"{len(corrupt)} chunks of {target.name} changed on disk")
+            if sha256 is not None and whole.hexdigest() != sha256:
+                # Every chunk matches what was received, so start over
+                database.reset(header)
+                raise ChunkError(f"checksum mismatch in {target.name}")
+        finally:
+            database.close()
+
+        os.replace(str(partial), str(target))
+        database.remove()
+
+    def _probe(self, url: str):
+        """Get (size, etag, last_modified, supports_ranges) for a URL"""
+        request = urllib.request.Request(url, method='HEAD')
+        try:
+            with self.opener(request, timeout=self.timeout) as response:
+                length = response.headers.get('Content-Length')
+                ranges = response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+                return ((int(length) if length else None), response.headers.get('ETag'),
+                        response.headers.get('Last-Modified'), ranges)
+        except urllib.error.HTTPError as e:
+            if e.code in (405, 501):  # HEAD not supported
+                return None, None, None, False
+            raise
+
+    def _verify(self, partial: Path, database: ChunkDatabase, indices: Iterable[int],
+                expected_digests: Optional[Sequence[str]], should_stop: Callable[[], bool],
+                whole=None) -> List[int]:
+        """Re-hash finished chunks on disk; returns the ones that do not match.
+
+        Args:
+            whole: Optional hash object that is also fed every chunk, in order
+        """
+        corrupt = []
+        with open(partial, 'rb') as f:
+            for index in indices:
+                if should_stop():
+                    raise DownloadPaused()
+                start, end = database.chunk_range(index)
+                f.seek(start)
+                digest = hashlib.sha256()
+                remaining = end - start
+                while remaining:
+                    block = f.read(min(VERIFY_BLOCK_SIZE, remaining))
+                    if not block:
+                        break
+                    digest.update(block)
+                    if whole is not None:
+                        whole.update(block)
+                    remaining -= len(block)
+                hexdigest = digest.hexdigest()
+                if remaining or hexdigest != database.digests.get(index) or (
+                        expected_digests is not None and expected_digests[index] != hexdigest):
+                    corrupt.append(index)
+        return corrupt
+
+    @staticmethod
+    def _validator(header: Dict[str, Any]) -> Optional[str]:
+        """If-Range value for the remote file: a strong ETag, else Last-Modified"""
+        etag = header.get('etag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return header.get('last_modified')
+
+    def _fetch_chunk(self, url, partial, database, index, priority, should_stop, expected_digests):
+        start, end = database.chunk_range(index)
+        size = database.header['size']
+        headers = {'Range': f'bytes={start}-{end - 1}'}
+        validator = self._validator(database.header)
+        if validator:
+            # A changed file comes back whole with 200 rather than as a 206
+            headers['If-Range'] = validator
+        request = urllib.request.Request(url, headers=headers)
+        digest = hashlib.sha256()
+        written = 0
+
+        with self.opener(request, timeout=self.timeout) as response, open(partial, 'r+b') as out:
+            if response.status != 206:
+                if validator:
+                    raise ChunkError(f"{url} changed on the server")
+                raise ChunkError(f"server ignored the Range request for chunk {index}")
+            match = CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+            if match is None or (int(match.group(1)), int(match.group(2)) + 1) != (start, end):
+                raise ChunkError(f"chunk {index} answered with Content-Range "
+                                 f"{response.headers.get('Content-Range')!r}")
+            etag = database.header.get('etag')
+            if match.group(3) not in ('*', str(size)) or (
+                    etag and response.headers.get('ETag') not in (None, etag)):
+                raise ChunkError(f"{url} changed on the server")
+            out.seek(start)
+            while written < end - start:
+                if should_stop():
+                    raise DownloadPaused()
+                if self.bucket is not None:
+                    self.bucket.consume(self.block_size, priority=priority)
+                block = response.read(min(self.block_size, end - start - written))
+                if not block:
+                    break
+                out.write(block)
+                digest.update(block)
+                written += len(block)
+            if written != end - start:
+                raise ChunkError(f"chunk {index} ended after {written} of {end - start} bytes")
+            out.flush()
+            os.fsync(out.fileno())
+
+        hexdigest = digest.hexdigest()
+        if expected_digests is not None and expected_digests[index] != hexdigest:
+            raise ChunkError(f"checksum mismatch in chunk {index}")
+        database.mark_done(index, hexdigest)
+
+    def _stream(self, url, partial, priority, should_stop) -> str:
+        """Fetch the whole file in one request; returns its SHA-256"""
+        digest = hashlib.sha256()
+        with self.opener(url, timeout=self.timeout) as response, open(partial, 'wb') as out:
+            while True:
+                if should_stop():
+                    raise DownloadPaused()
+                if self.bucket is not None:
+                    self.bucket.consume(self.block_size, priority=priority)
+                block = response.read(self.block_size)
+                if not block:
+                    break
+                out.write(block)
+                digest.update(block)
+        return digest.hexdigest()
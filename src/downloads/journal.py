@@ -0,0 +1,245 @@
+"""Append-only persistence for the download queue"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from core import metrics
+from core.fileio import atomic_write_json, atomic_write_text, quarantine
+
+logger = logging.getLogger(__name__)
+
+
+class QueueJournal:
+    """Snapshot plus append-only operation log for the download queue.
+
+    ``download_queue.json`` holds a snapshot of the queue and
+    ``download_queue.journal`` one JSON record per change made since. Each
+    change costs a single appended line, and the journal is folded back into
+    a fresh snapshot once it outgrows the queue.
+
+    Both files carry a generation number. Compaction writes the new snapshot
+    first and then resets the journal, each atomically, so a crash between the
+    two leaves a journal whose generation no longer matches and is ignored.
+    
+    Other processes may append to the same journal. catch_up() returns the
+    records they added since this instance last read or wrote it; callers
+    serialize access with a FileLock.
+    """
+
+    SNAPSHOT_VERSION = 2
+
+    def __init__(self, snapshot_file: Path, durable: bool = True, compact_min_records: int = 1000):
+        """Initialize the journal.
+
+        Args:
+            snapshot_file: Path of the queue snapshot
+            durable: fsync every appended record
+            compact_min_records: Journal length below which no compaction happens
+        """
+        self.snapshot_file = Path(snapshot_file)
+        self.journal_file = self.snapshot_file.with_suffix('.journal')
+        self.durable = durable
+        self.compact_min_records = compact_min_records
+        self.generation = 0
+        self.records = 0
+        self._handle = None
+        self._offset = 0        # Bytes of the journal already applied
+        self._signature = None  # Journal (inode, size, mtime) when last seen
+
+    def load(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Read the snapshot and the records logged since it was taken.
+
+        Returns:
+            Tuple of (snapshot items, journal records to replay in order)
+        """
+        self.close()
+        items, snapshot_ok = self._load_snapshot()
+        records = self._load_journal(require_generation=snapshot_ok)
+        self.records = len(records)
+        return items, records
+
+    def _load_snapshot(self) -> Tuple[List[Dict[str, Any]], bool]:
+        self.generation = 0
+        if not self.snapshot_file.exists():
+            return [], True
+        try:
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            moved_to = quarantine(self.snapshot_file)
+            logger.warning("Download queue snapshot %s is unreadable (%s); moved to %s",
+                           self.snapshot_file, e, moved_to)
+            return [], False
+
+        if isinstance(data, list):  # Format written before the journal existed
+            return data, True
+        self.generation = data.get('generation', 0)
+        return data.get('items', []), True
+
+    def _load_journal(self, require_generation: bool) -> List[Dict[str, Any]]:
+        if not self.journal_file.exists():
+            return []
+
+        records = []
+        generation = None
+        good_bytes = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    if line.endswith(b'\n'):
+                        logger.warning("Skipping damaged record in %s", self.journal_file)
+                        good_bytes += len(line)
+                        continue
+                    # A torn final append from a crash; drop it
+                    break
+                good_bytes += len(line)
+                if record.get('op') == 'base':
+                    generation = record.get('generation')
+                else:
+                    records.append(record)
+
+        if require_generation and generation != self.generation:
+            # Left over from before the last compaction; the snapshot has it all
+            self._reset_journal()
+            return []
+
+        if good_bytes < self.journal_file.stat().st_size:
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(good_bytes)
+        self.generation = generation if generation is not None else self.generation
+        self._offset = good_bytes
+        self._remember_signature()
+        return records
+    
+    def _stat_signature(self):
+        metrics.incr('queue.journal_stats')
+        try:
+            st = os.stat(self.journal_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+    
+    def _remember_signature(self):
+        self._signature = self._stat_signature()
+    
+    def changed(self) -> bool:
+        """Whether another process touched the journal since we last saw it"""
+        return self._stat_signature() != self._signature
+    
+    def catch_up(self) -> Optional[List[Dict[str, Any]]]:
+        """Read records other processes appended since our last read or write.
+        
+        Returns:
+            The new records, or None if the journal was compacted meanwhile and
+            the snapshot has to be loaded again
+        """
+        try:
+            with open(self.journal_file, 'rb') as f:
+                try:
+                    header = json.loads(f.readline())
+                except ValueError:
+                    return None
+                if header.get('op') != 'base' or header.get('generation') != self.generation:
+                    return None
+                # The journal may have been created by another process after ours was read
+                self._offset = max(self._offset, f.tell())
+                f.seek(self._offset)
+                records = []
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # Being written right now; picked up next time
+                    self._offset += len(line)
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        logger.warning("Skipping damaged record in %s", self.journal_file)
+        except FileNotFoundError:
+            return None
+        self.records += len(records)
+        self._remember_signature()
+        return records
+
+    def append(self, record: Dict[str, Any]):
+        """Durably log one change to the queue.
+
+        Args:
+            record: JSON-serializable description of the change
+
+        Raises:
+            OSError: If the record could not be written; any part of it that
+                reached the file is cut off again
+        """
+        if self._handle is None:
+            if not self.journal_file.exists() or self.journal_file.stat().st_size == 0:
+                self._reset_journal()
+            self._handle = open(self.journal_file, 'ab')
+
+        data = json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n'
+        try:
+            self._handle.write(data)
+            self._handle.flush()
+            if self.durable:
+                os.fsync(self._handle.fileno())
+        except BaseException:
+            self._truncate_to_offset()
+            raise
+        metrics.incr('queue.journal_bytes', len(data))
+        self.records += 1
+        self._offset += len(data)
+        self._remember_signature()
+
+    def _truncate_to_offset(self):
+        """Drop a partly written record, so the next append starts on a fresh line"""
+        try:
+            self.close()
+        except OSError:
+            pass  # Flushing the rest of the record failed too; it is cut off below
+        try:
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(self._offset)
+        except OSError as e:
+            logger.error("Could not remove a partly written record from %s: %s", self.journal_file, e)
+        self._remember_signature()
+
+    def should_compact(self, live_items: int) -> bool:
+        """Whether the journal has grown enough to be worth folding in.
+
+        Compacting only once the journal is longer than the queue keeps the
+        O(n) snapshot rewrite amortized to O(1) per change.
+        """
+        return self.records > max(self.compact_min_records, live_items)
+
+    def compact(self, items: List[Dict[str, Any]]):
+        """Write a new snapshot of the queue and start an empty journal.
+
+        Args:
+            items: Serialized queue items
+        """
+        self.close()
+        generation = self.generation + 1
+        atomic_write_json(self.snapshot_file, {
+            'version': self.SNAPSHOT_VERSION,
+            'generation': generation,
+            'items': items
+        }, durable=self.durable)
+        self.generation = generation
+        self._reset_journal()
+
+    def _reset_journal(self):
+        self.close()
+        header = json.dumps({'op': 'base', 'generation': self.generation}) + '\n'
+        atomic_write_text(self.journal_file, header, durable=self.durable)
+        self.records = 0
+        self._offset = len(header.encode('utf-8'))
+        self._remember_signature()
+
+    def close(self):
+        """Close the journal file handle"""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
@@ -0,0 +1,180 @@
+"""Disk-space-aware placement of Epic Games downloads"""
+
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DrivePlacement:
+    """Chooses a target drive for each download and reserves space on it.
+
+    Free space is read from the filesystem and reduced by what in-flight
+    downloads have reserved but not taken up yet: a reservation covers only
+    the space a download's file does not occupy yet and shrinks as the file
+    grows (see allocated()). Directories on the same device share one budget, so two game folders on one drive cannot both
+    claim the same free space. An item that fits nowhere is refused rather
+    than started, so parallel downloads never fill a drive halfway through.
+    """
+
+    def __init__(self, directories: Sequence[Path], headroom_bytes: int = 1024 ** 3,
+                 disk_usage: Callable = shutil.disk_usage):
+        """Initialize the placement engine.
+
+        Args:
+            directories: Candidate game directories, in order of preference
+            headroom_bytes: Space always left free on every drive
+            disk_usage: shutil.disk_usage-compatible callable
+        """
+        self.directories = [Path(d) for d in directories]
+        self.headroom_bytes = headroom_bytes
+        self._disk_usage = disk_usage
+        # game id -> (device, directory, bytes reserved, size of the download)
+        self._reservations: Dict[str, Tuple[object, Path, int, int]] = {}
+        self._reserved_by_device: Dict[object, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, **kwargs) -> 'DrivePlacement':
+        """Create a placement engine for the configured game directories"""
+        return cls(config.get('game_directories', []), **kwargs)
+
+    @staticmethod
+    def _device(directory: Path):
+        try:
+            return os.stat(directory).st_dev
+        except OSError:
+            return None
+
+    def available_bytes(self, directory: Path) -> int:
+        """Free space in a directory minus headroom and outstanding reservations"""
+        device = self._device(directory)
+        if device is None:
+            return 0
+        free = self._disk_usage(str(directory)).free
+        return free - self.headroom_bytes - self._reserved_by_device.get(device, 0)
+
+    def reserve(self, game_id: str, size_bytes: int, prefer: Optional[Path] = None,
+                already_written: int = 0) -> Optional[Path]:
+        """Pick a directory with room for a download and reserve the space.
+
+        Args:
+            game_id: Download the space is for
+            size_bytes: Size of the download
+            prefer: Directory to use if it has room, e.g. one holding a partial download
+            already_written: Space the download's partial file already takes up
+                in ``prefer``, which needs no reserving there
+
+        Returns:
+            The chosen directory, or None if the item fits on no drive
+        """
+        with self._lock:
+            if game_id in self._reservations:
+                return self._reservations[game_id][1]
+
+            candidates = list(self.directories)
+            if prefer is not None:
+                candidates.insert(0, Path(prefer))
+
+            chosen = None
+            reserved = 0
+            best_available = -1
+            seen_devices = set()
+            for directory in candidates:
+                device = self._device(directory)
+                if device is None or device in seen_devices:
+                    continue
+                seen_devices.add(device)
+                preferred = prefer is not None and directory == Path(prefer)
+                needed = size_bytes - already_written if preferred else size_bytes
+                available = self.available_bytes(directory)
+                if available < needed:
+                    continue
+                if preferred:
+                    chosen, reserved = directory, needed
+                    break
+                # Otherwise spread downloads onto the drive with the most room
+                if available > best_available:
+                    chosen, reserved, best_available = directory, needed, available
+
+            if chosen is None:
+                return None
+            device = self._device(chosen)
+            self._reservations[game_id] = (device, chosen, reserved, size_bytes)
+            self._reserved_by_device[device] = self._reserved_by_device.get(device, 0) + reserved
+            logger.debug("Reserved %d bytes on %s for %s", reserved, chosen, game_id)
+            return chosen
+
+    def allocated(self, game_id: str, size_bytes: int):
+        """Record the disk space a download's file takes up now.
+
+        That space already shows in the drive's free space, so only the rest
+        of the download stays reserved. Going by what the file occupies rather
+        than by what was written holds both for sparse files and for NTFS,
+        which allocates a preallocated file in full up front.
+        """
+        with self._lock:
+            reservation = self._reservations.get(game_id)
+            if reservation is None:
+                return
+            device, directory, reserved, total = reservation
+            remaining = max(0, total - size_bytes)
+            self._reservations[game_id] = (device, directory, remaining, total)
+            self._reserved_by_device[device] += remaining - reserved
+
+    def release(self, game_id: str):
+        """Give back the space reserved for a download"""
+        with self._lock:
+            reservation = self._reservations.pop(game_id, None)
+            if reservation is None:
+                return
+            device, _, reserved, _ = reservation
+            self._reserved_by_device[device] -= reserved
+
+    def fitting(self, sizes: Dict[str, int]) -> List[str]:
+        """Downloads that would fit if placed now, in the order given.
+
+        Each fitting download takes its space from the drive with the most
+        room, so the result never promises the same free space twice.
+
+        Args:
+            sizes: Space needed per game id
+        """
+        with self._lock:
+            available = {}
+            for directory in self.directories:
+                device = self._device(directory)
+                if device is not None and device not in available:
+                    available[device] = self.available_bytes(directory)
+        fits = []
+        for game_id, size_bytes in sizes.items():
+            device = max(available, key=available.get, default=None)
+            if device is not None and available[device] >= size_bytes:
+                available[device] -= size_bytes
+                fits.append(game_id)
+        return fits
+
+    def reserved_directory(self, game_id: str) -> Optional[Path]:
+        """Directory reserved for a download, if any"""
+        reservation = self._reservations.get(game_id)
+        return reservation[1] if reservation else None
+
+    def drives(self) -> List[Dict[str, object]]:
+        """Free and reserved space per configured directory"""
+        with self._lock:
+            report = []
+            for directory in self.directories:
+                device = self._device(directory)
+                if device is None:
+                    continue
+                report.append({
+                    'directory': str(directory),
+                    'free_bytes': self._disk_usage(str(directory)).free,
+                    'reserved_bytes': self._reserved_by_device.get(device, 0),
+                    'available_bytes': max(0, self.available_bytes(directory)),
+                })
+            return report
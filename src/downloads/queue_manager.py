@@ -1,12 +1,20 @@
 """Download queue management for Epic Games"""
 
-import json
-import os
+import heapq
+import itertools
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
+from core import metrics
+from core.locking import FileLock
+
+from .journal import QueueJournal
+
 @dataclass
 class DownloadItem:
     """Represents a game download in the queue"""
@@ -15,122 +23,394 @@ class DownloadItem:
     size_bytes: int
     priority: int = 0
     added_at: datetime = None
-    status: str = 'pending'  # pending, downloading, paused, completed, failed
+    status: str = 'pending'  # pending, downloading, held, paused, completed, failed
+    url: Optional[str] = None
+    # SHA-256 digests from the game's manifest, when it lists them
+    sha256: Optional[str] = None
+    chunk_digests: Optional[List[str]] = None
+    chunk_size: Optional[int] = None
     
     def __post_init__(self):
         if self.added_at is None:
             self.added_at = datetime.now()
+        elif isinstance(self.added_at, str):
+            self.added_at = datetime.fromisoformat(self.added_at)
+    
+    def sort_key(self):
+        """Queue order: highest priority first, then oldest first"""
+        return (-self.priority, self.added_at)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for the queue snapshot and journal"""
+        data = {
+            'game_id': self.game_id,
+            'game_name': self.game_name,
+            'size_bytes': self.size_bytes,
+            'priority': self.priority,
+            'added_at': self.added_at.isoformat(),
+            'status': self.status,
+            'url': self.url
+        }
+        # Digest lists can be long, so they are only stored when known
+        for key in ('sha256', 'chunk_digests', 'chunk_size'):
+            if getattr(self, key) is not None:
+                data[key] = getattr(self, key)
+        return data
+
+@dataclass
+class QueueEvent:
+    """A change to the download queue, pushed to subscribers"""
+    op: str  # add, remove, status, priority
+    item: DownloadItem
+    old_status: Optional[str] = None
+    new_status: Optional[str] = None
+
+# Marks a heap entry whose item was removed, re-prioritized or left 'pending'
+_REMOVED = None
 
 class DownloadQueueManager:
-    """Manages download queue for Epic Games"""
+    """Manages download queue for Epic Games
+    
+    Items are indexed by game id. Pending items are also kept in a heap ordered
+    by (priority desc, added_at asc); entries are invalidated in place rather
+    than removed, and skipped when they reach the top, so every operation on a
+    single item is O(log n) or better.
     
-    def __init__(self):
-        self.queue: List[DownloadItem] = []
-        self.queue_file = Path.home() / '.epic-games-manager' / 'download_queue.json'
+    Item and byte counts per status are kept up to date on every change, and
+    subscribers are told about each change as it happens.
+    
+    Several processes (the GUI, the CLI) may share one queue file. Every change
+    is made under an exclusive file lock after catching up with the journal
+    records other processes appended, and reads catch up first whenever the
+    journal changed on disk.
+    """
+    
+    def __init__(self, queue_file: Optional[Path] = None, durable: bool = True):
+        """Initialize the queue manager.
+        
+        Args:
+            queue_file: Queue snapshot path; the journal is kept next to it
+            durable: fsync each change before returning
+        """
+        self._items: Dict[str, DownloadItem] = {}
+        self._heap: List[list] = []
+        self._entries: Dict[str, list] = {}  # game_id -> live heap entry
+        self._counter = itertools.count()
+        self._stale = 0
+        self._status_counts: Counter = Counter()
+        self._status_bytes: Counter = Counter()
+        self._subscribers: List[Callable[[QueueEvent], None]] = []
+        self._pending_events: List[QueueEvent] = []
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self.queue_file = queue_file or Path.home() / '.epic-games-manager' / 'download_queue.json'
         self.queue_file.parent.mkdir(parents=True, exist_ok=True)
-        self._load_queue()
+        self._file_lock = FileLock.for_file(self.queue_file)
+        self._journal = QueueJournal(self.queue_file, durable=durable)
+        with self._file_lock.exclusive():
+            self._load_queue()
     
+    @property
+    def queue(self) -> List[DownloadItem]:
+        """All queued items in download order"""
+        self._refresh()
+        with self._lock:
+            return sorted(self._items.values(), key=DownloadItem.sort_key)
+    
+    @metrics.timed('queue.load')
     def _load_queue(self):
         """Load queue from persistent storage"""
-        if self.queue_file.exists():
+        try:
+            items, records = self._journal.load()
+            self._set_items(DownloadItem(**item) for item in items)
+            for record in records:
+                self._apply(record)
+        except Exception as e:
+            print(f"Failed to load queue: {e}")
+            self._set_items([])
+    
+    @contextmanager
+    def _exclusive(self):
+        """Hold the thread and file locks, in sync with other processes.
+        
+        Events produced inside are delivered to subscribers once the
+        outermost block has released both locks.
+        """
+        with self._lock:
+            outermost = self._lock_depth == 0
+            self._lock_depth += 1
             try:
-                with open(self.queue_file, 'r') as f:
-                    data = json.load(f)
-                    self.queue = [DownloadItem(**item) for item in data]
+                with self._file_lock.exclusive():
+                    if outermost:
+                        self._sync()
+                    yield
+            finally:
+                self._lock_depth -= 1
+                events = []
+                if outermost:
+                    events, self._pending_events = self._pending_events, []
+                subscribers = list(self._subscribers)
+        
+        # Outside the locks so a slow subscriber cannot stall the workers
+        for event in events:
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"Queue subscriber failed: {e}")
+    
+    def _sync(self):
+        """Apply changes other processes made to the queue files"""
+        if not self._journal.changed():
+            return
+        records = self._journal.catch_up()
+        if records is None:
+            # Another process compacted the journal; start from its snapshot
+            self._load_queue()
+            return
+        metrics.incr('queue.records_caught_up', len(records))
+        for record in records:
+            self._pending_events.extend(self._apply(record))
+    
+    def _refresh(self):
+        """Catch up before a read if the journal changed on disk"""
+        if self._journal.changed():
+            with self._exclusive():
+                pass
+    
+    def _set_items(self, items):
+        """Replace the queue contents and rebuild the heap in O(n)"""
+        self._items = {}
+        self._entries = {}
+        self._heap = []
+        self._stale = 0
+        self._status_counts = Counter()
+        self._status_bytes = Counter()
+        for item in items:
+            self._items[item.game_id] = item
+            self._count(item, 1)
+            if item.status == 'pending':
+                self._heap.append(self._new_entry(item))
+        heapq.heapify(self._heap)
+    
+    def _count(self, item: DownloadItem, sign: int):
+        """Add an item to (sign=1) or take it out of (sign=-1) the statistics"""
+        self._status_counts[item.status] += sign
+        self._status_bytes[item.status] += sign * item.size_bytes
+    
+    def _new_entry(self, item: DownloadItem) -> list:
+        """Create and register the heap entry for a pending item"""
+        # The counter keeps insertion order between items with equal keys
+        entry = [*item.sort_key(), next(self._counter), item.game_id]
+        self._entries[item.game_id] = entry
+        return entry
+    
+    def _push(self, item: DownloadItem):
+        """Make a pending item eligible for get_next_download"""
+        heapq.heappush(self._heap, self._new_entry(item))
+    
+    def _discard(self, game_id: str):
+        """Invalidate an item's heap entry, if it has one"""
+        entry = self._entries.pop(game_id, None)
+        if entry is None:
+            return
+        entry[-1] = _REMOVED
+        self._stale += 1
+        # Rebuild once dead entries dominate so the heap cannot grow unbounded
+        if self._stale > 1024 and self._stale > len(self._heap) // 2:
+            self._heap = [e for e in self._heap if e[-1] is not _REMOVED]
+            heapq.heapify(self._heap)
+            self._stale = 0
+    
+    def _apply(self, record: Dict[str, Any]) -> List[QueueEvent]:
+        """Apply one change to the in-memory queue.
+        
+        Used both for live changes and when replaying the journal, so the two
+        cannot drift apart.
+        
+        Returns:
+            Events describing what changed
+        """
+        op = record['op']
+        if op == 'add':
+            item = DownloadItem(**record['item'])
+            if item.game_id in self._items:
+                return []
+            self._items[item.game_id] = item
+            self._count(item, 1)
+            if item.status == 'pending':
+                self._push(item)
+            return [QueueEvent('add', item, new_status=item.status)]
+        if op == 'clear_completed':
+            # Completed items have no heap entries, so only the index changes
+            removed = [item for item in self._items.values() if item.status == 'completed']
+            for item in removed:
+                del self._items[item.game_id]
+                self._count(item, -1)
+            return [QueueEvent('remove', item, old_status=item.status) for item in removed]
+        
+        game_id = record['game_id']
+        item = self._items.get(game_id)
+        if item is None:
+            return []
+        old_status = item.status
+        if op == 'remove':
+            del self._items[game_id]
+            self._count(item, -1)
+            self._discard(game_id)
+            return [QueueEvent('remove', item, old_status=old_status)]
+        if op == 'status':
+            status = record['status']
+            if old_status == 'pending' and status != 'pending':
+                self._discard(game_id)
+            elif status == 'pending' and old_status != 'pending':
+                self._push(item)
+            self._count(item, -1)
+            item.status = status
+            self._count(item, 1)
+        elif op == 'priority':
+            item.priority = record['priority']
+            if game_id in self._entries:
+                self._discard(game_id)
+                self._push(item)
+        return [QueueEvent(op, item, old_status=old_status, new_status=item.status)]
+    
+    def _commit(self, record: Dict[str, Any]):
+        """Persist a change as a single journal append, then apply it and notify subscribers
+        
+        Raises:
+            OSError: If the change could not be written; the queue is left unchanged
+        """
+        with self._exclusive():
+            with metrics.span('queue.journal_write'):
+                self._journal.append(record)
+            metrics.incr('queue.changes')
+            self._pending_events.extend(self._apply(record))
+            try:
+                if self._journal.should_compact(len(self._items)):
+                    self.compact()
             except Exception as e:
-                print(f"Failed to load queue: {e}")
-                self.queue = []
+                # The change is in the journal, which stays valid without compaction
+                print(f"Failed to compact queue: {e}")
     
-    def _save_queue(self):
-        """Save queue to persistent storage"""
-        try:
-            data = []
-            for item in self.queue:
-                item_dict = {
-                    'game_id': item.game_id,
-                    'game_name': item.game_name,
-                    'size_bytes': item.size_bytes,
-                    'priority': item.priority,
-                    'added_at': item.added_at.isoformat(),
-                    'status': item.status
-                }
-                data.append(item_dict)
-            
-            with open(self.queue_file, 'w') as f:
-                json.dump(data, f, indent=2)
-        except Exception as e:
-            print(f"Failed to save queue: {e}")
-    
-    def add_to_queue(self, game_id: str, game_name: str, size_bytes: int, priority: int = 0):
-        """Add a game to the download queue"""
-        # Check if already in queue
-        if any(item.game_id == game_id for item in self.queue):
-            print(f"{game_name} is already in the queue")
-            return False
+    def subscribe(self, callback: Callable[[QueueEvent], None]) -> Callable[[], None]:
+        """Call ``callback`` with a QueueEvent after every change to the queue.
+        
+        Returns:
+            Function that cancels the subscription
+        """
+        with self._lock:
+            self._subscribers.append(callback)
         
-        item = DownloadItem(
-            game_id=game_id,
-            game_name=game_name,
-            size_bytes=size_bytes,
-            priority=priority
-        )
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+    
+    @metrics.timed('queue.compact')
+    def compact(self):
+        """Fold the journal into a fresh snapshot of the queue"""
+        with self._exclusive():
+            items = sorted(self._items.values(), key=DownloadItem.sort_key)
+            self._journal.compact([item.to_dict() for item in items])
+    
+    def add_to_queue(self, game_id: str, game_name: str, size_bytes: int, priority: int = 0,
+                     url: Optional[str] = None, sha256: Optional[str] = None,
+                     chunk_digests: Optional[List[str]] = None, chunk_size: Optional[int] = None):
+        """Add a game to the download queue
         
-        self.queue.append(item)
-        self._sort_queue()
-        self._save_queue()
+        ``sha256`` is the whole file's digest and ``chunk_digests`` one digest
+        per ``chunk_size`` bytes, when the game's manifest provides them; the
+        download is verified against whatever is given.
+        """
+        with self._exclusive():
+            # Check if already in queue
+            if game_id in self._items:
+                print(f"{game_name} is already in the queue")
+                return False
+            
+            item = DownloadItem(
+                game_id=game_id,
+                game_name=game_name,
+                size_bytes=size_bytes,
+                priority=priority,
+                url=url,
+                sha256=sha256,
+                chunk_digests=chunk_digests,
+                chunk_size=chunk_size
+            )
+            
+            self._commit({'op': 'add', 'item': item.to_dict()})
         print(f"Added {game_name} to download queue")
         return True
     
     def remove_from_queue(self, game_id: str):
         """Remove a game from the queue"""
-        self.queue = [item for item in self.queue if item.game_id != game_id]
-        self._save_queue()
+        with self._exclusive():
+            if game_id in self._items:
+                self._commit({'op': 'remove', 'game_id': game_id})
     
-    def _sort_queue(self):
-        """Sort queue by priority and added time"""
-        self.queue.sort(key=lambda x: (-x.priority, x.added_at))
+    def get_item(self, game_id: str) -> Optional[DownloadItem]:
+        """Get a queued item by game id"""
+        self._refresh()
+        return self._items.get(game_id)
     
     def get_next_download(self) -> Optional[DownloadItem]:
         """Get the next item to download"""
-        for item in self.queue:
-            if item.status == 'pending':
-                return item
-        return None
+        self._refresh()
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][-1] is _REMOVED:
+                heapq.heappop(heap)
+                self._stale -= 1
+            return self._items[heap[0][-1]] if heap else None
+    
+    def claim_next_download(self) -> Optional[DownloadItem]:
+        """Atomically take the next pending item and mark it downloading.
+        
+        Safe to call from several worker threads at once; each pending item
+        is handed to exactly one caller, including callers in other processes.
+        """
+        with self._exclusive():
+            item = self.get_next_download()
+            if item is not None:
+                self.update_status(item.game_id, 'downloading')
+            return item
     
     def update_status(self, game_id: str, status: str):
         """Update the status of a download"""
-        for item in self.queue:
-            if item.game_id == game_id:
-                item.status = status
-                self._save_queue()
-                break
-    
-    def get_queue_info(self) -> Dict[str, any]:
-        """Get information about the queue"""
-        total_size = sum(item.size_bytes for item in self.queue if item.status != 'completed')
-        pending = sum(1 for item in self.queue if item.status == 'pending')
-        downloading = sum(1 for item in self.queue if item.status == 'downloading')
-        completed = sum(1 for item in self.queue if item.status == 'completed')
+        with self._exclusive():
+            if game_id in self._items:
+                self._commit({'op': 'status', 'game_id': game_id, 'status': status})
+    
+    def get_queue_info(self, include_items: bool = True) -> Dict[str, any]:
+        """Get information about the queue
         
-        return {
-            'total_items': len(self.queue),
-            'pending': pending,
-            'downloading': downloading,
-            'completed': completed,
-            'total_size_gb': total_size / (1024**3),
-            'items': self.queue
-        }
+        The counts are maintained incrementally, so this is O(1) unless
+        ``include_items`` asks for the full, ordered item list.
+        """
+        self._refresh()
+        with self._lock:
+            total_size = sum(self._status_bytes.values()) - self._status_bytes['completed']
+            info = {
+                'total_items': len(self._items),
+                'pending': self._status_counts['pending'],
+                'downloading': self._status_counts['downloading'],
+                'completed': self._status_counts['completed'],
+                'total_size_gb': total_size / (1024**3),
+                'by_status': {status: count for status, count in self._status_counts.items() if count}
+            }
+            if include_items:
+                info['items'] = self.queue
+            return info
     
     def clear_completed(self):
         """Remove completed downloads from queue"""
-        self.queue = [item for item in self.queue if item.status != 'completed']
-        self._save_queue()
+        self._commit({'op': 'clear_completed'})
     
     def prioritize_game(self, game_id: str):
         """Move a game to the top of the queue"""
-        for item in self.queue:
-            if item.game_id == game_id:
-                item.priority = 999
-                self._sort_queue()
-                self._save_queue()
-                break
\ No newline at end of file
+        with self._exclusive():
+            if game_id in self._items:
+                self._commit({'op': 'priority', 'game_id': game_id, 'priority': 999})
\ No newline at end of file
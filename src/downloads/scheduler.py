@@ -0,0 +1,358 @@
+"""Concurrent download scheduler for Epic Games"""
+
+import logging
+import random
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+from .bandwidth import TokenBucket
+from .chunks import ChunkError, ChunkedDownloader, DownloadPaused, allocated_bytes
+from .placement import DrivePlacement
+from .queue_manager import DownloadItem, DownloadQueueManager
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadError(Exception):
+    """Raised when a download attempt fails"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class DownloadScheduler:
+    """Drains a DownloadQueueManager with a pool of worker threads.
+
+    Workers take items in queue order (priority desc, added_at asc) and move
+    them through pending -> downloading -> completed/failed. Failed attempts
+    are retried with exponential backoff and jitter. All workers share one
+    token bucket when a bandwidth limit is set.
+    
+    Each item is fetched in chunks by a ChunkedDownloader, so a paused,
+    failed or interrupted download resumes where it stopped.
+    """
+
+    def __init__(self, queue: DownloadQueueManager, download_dir: Path,
+                 max_workers: int = 3, bandwidth_limit: Optional[int] = None,
+                 max_retries: int = 3, backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 block_size: int = 64 * 1024, timeout: float = 30.0,
+                 chunk_size: int = 8 * 1024 * 1024, connections_per_item: int = 4,
+                 placement: Optional[DrivePlacement] = None,
+                 opener: Callable = urllib.request.urlopen):
+        """Initialize the scheduler.
+
+        Args:
+            queue: Queue to drain
+            download_dir: Directory downloads are written to
+            max_workers: Number of concurrent downloads
+            bandwidth_limit: Global limit in bytes per second, or None
+            max_retries: Retries after the first failed attempt
+            backoff_base: Delay before the first retry in seconds
+            backoff_max: Upper bound on the retry delay in seconds
+            block_size: Bytes read per request to the bandwidth limiter
+            timeout: Socket timeout per request in seconds
+            chunk_size: Bytes per resumable chunk
+            connections_per_item: Chunks of one item fetched in parallel
+            placement: Chooses a drive per item and holds items that fit
+                nowhere; without it everything goes to download_dir
+            opener: urlopen-compatible callable used for requests
+        """
+        self.queue = queue
+        self.download_dir = Path(download_dir)
+        self.max_workers = max_workers
+        self.bucket = None
+        if bandwidth_limit:
+            # Allow bursts of a quarter second so the limit holds over short windows
+            self.bucket = TokenBucket(bandwidth_limit, capacity=max(block_size, bandwidth_limit / 4))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.block_size = block_size
+        self.timeout = timeout
+        self.opener = opener
+        self.downloader = ChunkedDownloader(opener=opener, chunk_size=chunk_size,
+                                            connections=connections_per_item,
+                                            block_size=block_size, timeout=timeout,
+                                            bucket=self.bucket)
+
+        self.placement = placement
+
+        self.attempts: Dict[str, int] = {}
+        self._paused: Set[str] = set()
+        self._held: Dict[str, int] = {}  # game id -> bytes still to write
+        self._in_flight: Set[str] = set()
+        self._resumed: Set[str] = set()
+        self._stop = threading.Event()
+        self._wakeup = threading.Condition()
+        self._active = 0
+        # Bumped whenever idle workers should look at the queue again
+        self._changes = 0
+        self._releases = 0
+        self._workers = []
+
+    def destination(self, item: DownloadItem) -> Path:
+        """Get the file a queue item is downloaded to"""
+        directory = None
+        if self.placement is not None:
+            directory = self.placement.reserved_directory(item.game_id)
+        return (directory or self.download_dir) / item.game_id
+    
+    def _partial_directory(self, item: DownloadItem) -> Optional[Path]:
+        """Directory already holding part of this item's download, if any"""
+        for directory in self.placement.directories:
+            if (directory / f"{item.game_id}.part").exists():
+                return directory
+        return None
+    
+    def _place(self, item: DownloadItem) -> bool:
+        """Reserve space for an item, holding it back if no drive has room"""
+        if self.placement is None:
+            return True
+        partial_directory = self._partial_directory(item)
+        already_written = 0
+        if partial_directory is not None:
+            already_written = allocated_bytes(partial_directory / f"{item.game_id}.part")
+        needed = item.size_bytes - already_written
+        while True:
+            with self._wakeup:
+                releases = self._releases
+            directory = self.placement.reserve(item.game_id, item.size_bytes, prefer=partial_directory,
+                                               already_written=already_written)
+            if directory is not None:
+                return True
+            self.queue.update_status(item.game_id, 'held')
+            with self._wakeup:
+                paused = item.game_id in self._paused
+                if not paused and self._releases == releases:
+                    self._held[item.game_id] = needed
+                    break
+            if paused:
+                # Paused while being placed; hold it as paused instead
+                self.queue.update_status(item.game_id, 'paused')
+                return False
+            # Space was released while the item was being held; try again
+            self.queue.update_status(item.game_id, 'downloading')
+        logger.info("Holding %s: no drive has %d bytes free", item.game_name, needed)
+        return False
+    
+    def _release(self, item: DownloadItem):
+        """Return an item's reserved space and retry the held items that now fit"""
+        if self.placement is None:
+            return
+        self.placement.release(item.game_id)
+        with self._wakeup:
+            self._releases += 1
+            held = {game_id: needed for game_id, needed in self._held.items()
+                    if game_id not in self._paused}
+        fitting = self.placement.fitting(held)
+        with self._wakeup:
+            # Another release may have woken some of them already
+            woken = [game_id for game_id in fitting if self._held.pop(game_id, None) is not None]
+        for game_id in woken:
+            self.queue.update_status(game_id, 'pending')
+        if woken:
+            self.notify()
+
+    def start(self):
+        """Start the worker threads"""
+        if self._workers:
+            return
+        self.download_dir.mkdir(parents=True, exist_ok=True)
+        self._stop.clear()
+        # Items a previous, interrupted run was still working on or holding
+        for item in self.queue.queue:
+            if item.status in ('downloading', 'held'):
+                self.queue.update_status(item.game_id, 'pending')
+        for index in range(self.max_workers):
+            worker = threading.Thread(target=self._worker, name=f"download-worker-{index}")
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self, wait: bool = True):
+        """Stop taking new items; downloads in progress are abandoned as pending"""
+        self._stop.set()
+        self.notify()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self._workers = []
+
+    def notify(self):
+        """Wake idle workers after items were added to the queue"""
+        with self._wakeup:
+            self._changes += 1
+            self._wakeup.notify_all()
+    
+    def pause(self, game_id: str):
+        """Pause a download; its finished chunks are kept for resume()"""
+        with self._wakeup:
+            self._paused.add(game_id)
+            # A paused item must not be woken by the next release
+            self._held.pop(game_id, None)
+        self.queue.update_status(game_id, 'paused')
+    
+    def resume(self, game_id: str):
+        """Make a paused or failed download pending again.
+
+        A download whose worker is still stopping stays with that worker, so
+        no second worker can claim it and write the same partial file.
+        """
+        with self._wakeup:
+            self._paused.discard(game_id)
+            self.attempts.pop(game_id, None)
+            if game_id in self._in_flight:
+                # The worker either carries on or, if it already stopped,
+                # makes the item pending once it is done with it
+                self._resumed.add(game_id)
+                self.queue.update_status(game_id, 'downloading')
+                return
+        self.queue.update_status(game_id, 'pending')
+        self.notify()
+
+    def run_until_idle(self):
+        """Download everything that is pending, then stop the workers"""
+        self.start()
+        with self._wakeup:
+            while not self._stop.is_set():
+                if self._active == 0 and self.queue.get_next_download() is None:
+                    break
+                self._wakeup.wait(0.5)
+        self.stop()
+
+    def _worker(self):
+        while not self._stop.is_set():
+            with self._wakeup:
+                changes = self._changes
+                # Counted while claiming, so run_until_idle never sees a
+                # claimed item without a busy worker
+                self._active += 1
+            item = None
+            try:
+                # Claiming and placing write the journal, so they run outside
+                # the condition and workers do not queue up behind the disk
+                item = self.queue.claim_next_download()
+                if item is not None:
+                    self._run(item)
+            except Exception:
+                # e.g. the queue journal could not be written; keep the worker alive
+                logger.exception("Download worker failed on %s", item.game_name if item else "claim")
+            finally:
+                with self._wakeup:
+                    self._active -= 1
+                    if item is not None:
+                        self._wakeup.notify_all()
+            if item is None:
+                with self._wakeup:
+                    if self._changes == changes and not self._stop.is_set():
+                        self._wakeup.wait(1.0)
+
+    def _run(self, item: DownloadItem):
+        """Place and download a claimed item"""
+        with self._wakeup:
+            if item.game_id in self._in_flight:
+                # Made pending elsewhere while another worker still has it;
+                # the claim marked it downloading, which it still is
+                return
+            paused = item.game_id in self._paused
+            if not paused:
+                self._in_flight.add(item.game_id)
+        if paused:
+            # Woken from held just as it was paused
+            self.queue.update_status(item.game_id, 'paused')
+            return
+        try:
+            if self._place(item):
+                try:
+                    paused = self._process(item)
+                finally:
+                    self._release(item)
+        finally:
+            with self._wakeup:
+                self._in_flight.discard(item.game_id)
+                resumed = item.game_id in self._resumed
+                self._resumed.discard(item.game_id)
+            if resumed and paused:
+                self.queue.update_status(item.game_id, 'pending')
+                self.notify()
+
+    def _process(self, item: DownloadItem) -> bool:
+        """Download one item, retrying with backoff, and record the outcome.
+
+        Returns:
+            True if the item was paused and left paused
+        """
+        while not self._stop.is_set():
+            attempt = self.attempts.get(item.game_id, 0) + 1
+            self.attempts[item.game_id] = attempt
+            try:
+                self.fetch(item)
+            except DownloadPaused:
+                with self._wakeup:
+                    paused = item.game_id in self._paused
+                if paused:
+                    return True  # pause() already recorded the status
+                break
+            except DownloadError as e:
+                if self._stop.is_set():
+                    break
+                if not e.retryable or attempt > self.max_retries:
+                    logger.error("Download of %s failed after %d attempt(s): %s",
+                                 item.game_name, attempt, e)
+                    self.queue.update_status(item.game_id, 'failed')
+                    return False
+                delay = self.backoff_delay(attempt)
+                logger.warning("Download of %s failed (%s), retrying in %.1fs",
+                               item.game_name, e, delay)
+                if self._stop.wait(delay):
+                    break
+            else:
+                self.attempts.pop(item.game_id, None)
+                self.queue.update_status(item.game_id, 'completed')
+                return False
+
+        # Stopped mid-download; leave it for the next run
+        self.queue.update_status(item.game_id, 'pending')
+        return False
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given attempt number"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def fetch(self, item: DownloadItem):
+        """Download an item's URL to its destination.
+
+        Raises:
+            DownloadPaused: If the item was paused or the scheduler is stopping
+            DownloadError: If the transfer fails
+        """
+        if not item.url:
+            raise DownloadError("no source URL", retryable=False)
+
+        def should_stop():
+            return self._stop.is_set() or item.game_id in self._paused
+
+        on_allocated = None
+        if self.placement is not None:
+            # Space the file takes up shows in the drive's free space; stop reserving it
+            def on_allocated(size_bytes):
+                self.placement.allocated(item.game_id, size_bytes)
+
+        try:
+            self.downloader.download(item.url, self.destination(item), priority=item.priority,
+                                     should_stop=should_stop, expected_digests=item.chunk_digests,
+                                     sha256=item.sha256, chunk_size=item.chunk_size,
+                                     on_allocated=on_allocated)
+        except ChunkError as e:
+            raise DownloadError(str(e), retryable=e.retryable) from e
+        except urllib.error.HTTPError as e:
+            # Client errors other than rate limiting will not go away on retry
+            retryable = e.code >= 500 or e.code in (408, 429)
+            raise DownloadError(f"HTTP {e.code}", retryable=retryable) from e
+        except (urllib.error.URLError, OSError) as e:
+            raise DownloadError(str(e)) from e
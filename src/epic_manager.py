@@ -3,31 +3,57 @@
 
 import argparse
 import sys
-from pathlib import Path
-from typing import Optional
-
-from library.scanner import LibraryScanner
-from library.manifest import ManifestManager
-from downloads.queue_manager import DownloadQueueManager
-from free_games.tracker import FreeGamesTracker
-from achievements.monitor import AchievementMonitor
-from core.config import Config
-from core.license import LicenseValidator
+from functools import cached_property
+from typing import List, Optional
 
 class EpicGamesManager:
-    def __init__(self):
-        self.config = Config()
-        self.license = LicenseValidator()
-        self.library_scanner = LibraryScanner()
-        self.manifest_manager = ManifestManager()
-        self.download_manager = DownloadQueueManager()
-        self.free_games = FreeGamesTracker()
-        self.achievements = AchievementMonitor()
+    """Entry point for the CLI commands.
+    
+    Subsystems are created, and their modules imported, the first time a
+    command uses them, so each command only pays for what it touches.
+    """
+    
+    @cached_property
+    def config(self):
+        from core.config import Config
+        return Config()
+        
+    @cached_property
+    def license(self):
+        from core.license import LicenseValidator
+        return LicenseValidator()
+        
+    @cached_property
+    def library_scanner(self):
+        """The one LibraryScanner shared by every library subsystem"""
+        from core.discovery import find_manifest_directory
+        from library.scanner import LibraryScanner
+        return LibraryScanner(find_manifest_directory(self.config))
+        
+    @cached_property
+    def manifest_manager(self):
+        from library.manifest import ManifestManager
+        return ManifestManager(self.library_scanner)
+        
+    @cached_property
+    def download_manager(self):
+        from downloads.queue_manager import DownloadQueueManager
+        return DownloadQueueManager()
+        
+    @cached_property
+    def free_games(self):
+        from free_games.tracker import FreeGamesTracker
+        return FreeGamesTracker()
+        
+    @cached_property
+    def achievements(self):
+        from achievements.monitor import AchievementMonitor
+        return AchievementMonitor()
         
     def scan_library(self):
         """Scan Epic Games library for installed games"""
         print("🔍 Scanning Epic Games library...")
-        games = self.library_scanner.scan()
+        games = self.library_scanner.scan_manifests()
         
         if not games:
             print("❌ No games found. Is Epic Games Launcher installed?")
@@ -35,12 +61,10 @@ class EpicGamesManager:
             
         print(f"\n✅ Found {len(games)} games:")
         for game in games:
-            print(f"  - {game.name} ({game.size_gb:.1f} GB)")
+            print(f"  - {game.display_name} ({game.size_gb:.1f} GB)")
             
     def repair_manifest(self, game_name: Optional[str] = None):
         """Repair game manifests"""
-        tier = self.license.get_tier()
-        
         if game_name:
             print(f"🔧 Repairing manifest for {game_name}...")
             success = self.manifest_manager.repair_game(game_name)
@@ -49,7 +73,7 @@ class EpicGamesManager:
             else:
                 print(f"❌ Failed to repair {game_name}")
         else:
-            if tier == "free":
+            if not self.license.has_feature('batch_repair'):
                 print("⚠️  Batch repair requires Pro version")
                 print("💎 Upgrade at: https://gumroad.com/l/epic-games-manager")
                 return
@@ -62,6 +86,8 @@ class EpicGamesManager:
         """Check for free games"""
         print("🎮 Checking for free games...")
         games = self.free_games.get_current_free()
+        if self.free_games.offline:
+            print("⚠️  Offline - showing the last downloaded list")
         
         if not games:
             print("❌ No free games available right now")
@@ -72,6 +98,24 @@ class EpicGamesManager:
             print(f"  - {game['title']}")
             print(f"    Available until: {game['end_date']}")
             
+    def show_free_game_history(self, title: Optional[str] = None, since: Optional[str] = None,
+                               until: Optional[str] = None, min_price: Optional[float] = None,
+                               max_price: Optional[float] = None, limit: int = 50):
+        """Show past, current and upcoming promotions from the local archive"""
+        promotions = self.free_games.search_history(title, since=since, until=until,
+                                                     min_price=min_price, max_price=max_price,
+                                                     limit=limit)
+        if not promotions:
+            subject = f'"{title}"' if title else "that search"
+            print(f"❌ No free promotions recorded for {subject}")
+            return
+            
+        print(f"📜 {len(promotions)} promotion(s) found:")
+        for promotion in promotions:
+            worth = f" (worth {promotion['original_price']})" if promotion['original_price'] else ""
+            print(f"  - {promotion['title']}{worth}")
+            print(f"    Free {promotion['starts_at'][:10]} → {promotion['ends_at'][:10]}")
+            
     def backup_saves(self, all_games: bool = False):
         """Backup game saves"""
         tier = self.license.get_tier()
@@ -85,15 +129,34 @@ class EpicGamesManager:
         # Implementation here
         print("✅ Backup complete")
         
-    def show_achievements(self):
+    def show_achievements(self, check: bool = False):
         """Display achievement progress"""
+        if check:
+            problems = self.achievements.check_consistency(repair=True)
+            for problem in problems:
+                print(f"  ⚠️  {problem}")
+            print(f"{'🔧 Rebuilt' if problems else '✅ Verified'} achievement statistics")
+            
         print("🏆 Loading achievements...")
-        stats = self.achievements.get_stats()
+        stats = self.achievements.get_summary()
         
         print(f"\n📊 Achievement Statistics:")
         print(f"  Total Games: {stats['total_games']}")
         print(f"  Total Achievements: {stats['total_achievements']}")
         print(f"  Unlocked: {stats['unlocked']} ({stats['completion_rate']:.1f}%)")
+        
+    def export_achievements(self, destination: str, format: str = 'csv',
+                            games: Optional[List[str]] = None,
+                            since: Optional[str] = None, until: Optional[str] = None):
+        """Stream achievements to a file or stdout"""
+        try:
+            count = self.achievements.export_to(destination, format, game_ids=games,
+                                                since=since, until=until)
+        except (OSError, ValueError) as e:
+            print(f"❌ Export failed: {e}", file=sys.stderr)
+            return
+        # Keep stdout clean when it carries the export itself
+        print(f"✅ Exported {count} achievements", file=sys.stderr if destination == '-' else sys.stdout)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -104,6 +167,7 @@ Examples:
   epic_manager.py scan                    # Scan library
   epic_manager.py repair --game Fortnite  # Repair specific game
   epic_manager.py free-games              # Check free games
+  epic_manager.py free-games --history Hades  # Was Hades ever free?
   epic_manager.py backup --all            # Backup all saves (Pro)
   
 Pro Version ($4.99): https://gumroad.com/l/epic-games-manager
@@ -111,6 +175,14 @@ Support: https://github.com/yourusername/epic-games-manager
         """
     )
     
+    parser.add_argument('--profile', metavar='FILE',
+                        help='Write timings and counters of the command to FILE as JSON')
+    parser.add_argument('--metrics-textfile', metavar='FILE',
+                        help='Write timings and counters to FILE in Prometheus text format '
+                             '(for the node exporter textfile collector)')
+    parser.add_argument('--log-json', metavar='FILE',
+                        help='Append log records to FILE as JSON lines')
+    
     subparsers = parser.add_subparsers(dest='command', help='Commands')
     
     # Scan command
@@ -122,6 +194,18 @@ Support: https://github.com/yourusername/epic-games-manager
     
     # Free games command
     free_parser = subparsers.add_parser('free-games', help='Check free games')
+    free_parser.add_argument('--history', nargs='?', const='', metavar='TITLE',
+                             help='Search recorded promotions, optionally by title words')
+    free_parser.add_argument('--since', metavar='YYYY-MM-DD',
+                             help='With --history: only promotions running on or after this date')
+    free_parser.add_argument('--until', metavar='YYYY-MM-DD',
+                             help='With --history: only promotions starting on or before this date')
+    free_parser.add_argument('--min-price', type=float, metavar='AMOUNT',
+                             help='With --history: minimum original price')
+    free_parser.add_argument('--max-price', type=float, metavar='AMOUNT',
+                             help='With --history: maximum original price')
+    free_parser.add_argument('--limit', type=int, default=50,
+                             help='With --history: maximum number of results (default: 50)')
     
     # Backup command
     backup_parser = subparsers.add_parser('backup', help='Backup game saves')
@@ -129,6 +213,18 @@ Support: https://github.com/yourusername/epic-games-manager
     
     # Achievements command
     achievements_parser = subparsers.add_parser('achievements', help='Show achievements')
+    achievements_parser.add_argument('--check', action='store_true',
+                                     help='Verify achievement statistics and rebuild them if needed')
+    achievements_parser.add_argument('--export', metavar='FILE',
+                                     help="Export achievements to FILE ('-' for stdout)")
+    achievements_parser.add_argument('--format', choices=['csv', 'jsonl'], default='csv',
+                                     help='Export format (default: csv)')
+    achievements_parser.add_argument('--game', action='append', dest='games', metavar='GAME_ID',
+                                     help='Only export this game; may be repeated')
+    achievements_parser.add_argument('--since', metavar='YYYY-MM-DD',
+                                     help='Only export achievements unlocked on or after this date')
+    achievements_parser.add_argument('--until', metavar='YYYY-MM-DD',
+                                     help='Only export achievements unlocked on or before this date')
     
     # License command
     license_parser = subparsers.add_parser('license', help='Manage license')
@@ -140,18 +236,47 @@ Support: https://github.com/yourusername/epic-games-manager
         parser.print_help()
         return
         
-    manager = EpicGamesManager()
-    
+    if args.log_json:
+        import logging
+        from core.logs import JsonLogHandler
+        root_logger = logging.getLogger()
+        root_logger.addHandler(JsonLogHandler(args.log_json))
+        root_logger.setLevel(logging.INFO)
+        
+    if not (args.profile or args.metrics_textfile):
+        run_command(EpicGamesManager(), args)
+        return
+        
+    from core import metrics
+    metrics.enable()
+    try:
+        with metrics.span(f'cli.{args.command}'):
+            run_command(EpicGamesManager(), args)
+    finally:
+        if args.profile:
+            metrics.write_json(args.profile)
+        if args.metrics_textfile:
+            metrics.write_prometheus(args.metrics_textfile)
+
+def run_command(manager: EpicGamesManager, args: argparse.Namespace):
+    """Dispatch a parsed command line to the manager"""
     if args.command == 'scan':
         manager.scan_library()
     elif args.command == 'repair':
         manager.repair_manifest(args.game)
     elif args.command == 'free-games':
-        manager.track_free_games()
+        if args.history is not None:
+            manager.show_free_game_history(args.history or None, args.since, args.until,
+                                           args.min_price, args.max_price, args.limit)
+        else:
+            manager.track_free_games()
     elif args.command == 'backup':
         manager.backup_saves(args.all)
     elif args.command == 'achievements':
-        manager.show_achievements()
+        if args.export:
+            manager.export_achievements(args.export, args.format, args.games, args.since, args.until)
+        else:
+            manager.show_achievements(args.check)
     elif args.command == 'license':
         if args.activate:
             manager.license.activate(args.activate)
@@ -0,0 +1,221 @@
+"""Append-only local archive of every free-game promotion observed"""
+
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Applied in order, one list of statements per schema version; PRAGMA
+# user_version records how many have run
+MIGRATIONS = [
+    [
+        """CREATE TABLE promotions (
+            id              INTEGER PRIMARY KEY,
+            offer_id        TEXT NOT NULL,
+            title           TEXT NOT NULL,
+            starts_at       TEXT NOT NULL,
+            ends_at         TEXT NOT NULL,
+            original_price  TEXT NOT NULL DEFAULT '',
+            original_amount REAL,
+            currency        TEXT NOT NULL DEFAULT '',
+            store_url       TEXT NOT NULL DEFAULT '',
+            image_url       TEXT NOT NULL DEFAULT '',
+            observed_at     TEXT NOT NULL,
+            UNIQUE (offer_id, starts_at, ends_at)
+        )""",
+        # Inverted index of normalized title words; prefix searches are range scans
+        """CREATE TABLE title_tokens (
+            token         TEXT NOT NULL,
+            promotion_id  INTEGER NOT NULL REFERENCES promotions(id),
+            PRIMARY KEY (token, promotion_id)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX idx_promotions_starts ON promotions(starts_at, ends_at)",
+        "CREATE INDEX idx_promotions_ends ON promotions(ends_at)",
+        "CREATE INDEX idx_promotions_amount ON promotions(original_amount)",
+        """CREATE TRIGGER promotions_no_update BEFORE UPDATE ON promotions BEGIN
+            SELECT RAISE(ABORT, 'the promotion archive is append-only');
+        END""",
+        """CREATE TRIGGER promotions_no_delete BEFORE DELETE ON promotions BEGIN
+            SELECT RAISE(ABORT, 'the promotion archive is append-only');
+        END""",
+    ],
+]
+
+PROMOTION_COLUMNS = ('offer_id', 'title', 'starts_at', 'ends_at', 'original_price', 'original_amount',
+                     'currency', 'store_url', 'image_url', 'observed_at')
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words of a title with accents removed, in order, without repeats"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return list(dict.fromkeys(_WORD.findall(stripped)))
+
+
+def _prefix_end(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class PromotionArchive:
+    """Every free-game promotion ever observed, in one SQLite file.
+
+    Rows are only ever added; triggers reject updates and deletes. A
+    promotion is identified by offer ID and window, so seeing it again
+    changes nothing. Title words, the promotion window and the original
+    price are indexed, so history queries never scan the whole archive.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        """Open (and if needed create or upgrade) the archive.
+
+        Args:
+            path: Database file, or ':memory:'
+        """
+        self.path = path
+        if path != ':memory:':
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._conn.execute("PRAGMA busy_timeout = 10000")
+        if path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._migrate()
+
+    def _migrate(self):
+        with self.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for index in range(version, len(MIGRATIONS)):
+                logger.debug("Applying promotion archive migration %d", index + 1)
+                for statement in MIGRATIONS[index]:
+                    conn.execute(statement)
+            if version < len(MIGRATIONS):
+                conn.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements as one atomic write transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def record(self, offers: Iterable[Dict[str, Any]], observed_at: Optional[str] = None) -> int:
+        """Add promotions not archived yet.
+
+        Args:
+            offers: Dicts as from promotions.observed_offers (id, title,
+                starts_at, ends_at, original_price, original_amount,
+                currency, store_url, image_url)
+            observed_at: ISO timestamp of the observation; defaults to now
+
+        Returns:
+            Number of promotions added
+        """
+        observed_at = observed_at or datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        added = 0
+        with self.transaction() as conn:
+            for offer in offers:
+                cursor = conn.execute(
+                    "INSERT INTO promotions (offer_id, title, starts_at, ends_at, original_price, "
+                    "original_amount, currency, store_url, image_url, observed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(offer_id, starts_at, ends_at) DO NOTHING",
+                    (offer.get('id', ''), offer.get('title', ''), offer['starts_at'], offer['ends_at'],
+                     offer.get('original_price') or '', offer.get('original_amount'),
+                     offer.get('currency') or '', offer.get('store_url') or '',
+                     offer.get('image_url') or '', observed_at))
+                if not cursor.rowcount:
+                    continue
+                conn.executemany("INSERT INTO title_tokens (token, promotion_id) VALUES (?, ?)",
+                                 [(token, cursor.lastrowid) for token in tokenize(offer.get('title', ''))])
+                added += 1
+        if added:
+            logger.info("Archived %d new promotion(s)", added)
+        return added
+
+    @staticmethod
+    def _search_sql(title: Optional[str] = None, since: Optional[str] = None,
+                    until: Optional[str] = None, min_price: Optional[float] = None,
+                    max_price: Optional[float] = None, limit: Optional[int] = 50):
+        clauses, params = [], []
+        tokens = tokenize(title or '')
+        if tokens:
+            lookups = " INTERSECT ".join(
+                "SELECT promotion_id FROM title_tokens WHERE token >= ? AND token < ?" for _ in tokens)
+            clauses.append(f"id IN ({lookups})")
+            for token in tokens:
+                params.extend((token, _prefix_end(token)))
+        if since:
+            clauses.append("ends_at >= ?")
+            params.append(since)
+        if until:
+            # A bare date covers the whole day
+            clauses.append("starts_at <= ?")
+            params.append(until + 'T23:59:59Z' if len(until) == 10 else until)
+        if min_price is not None:
+            clauses.append("original_amount >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            clauses.append("original_amount <= ?")
+            params.append(max_price)
+
+        sql = f"SELECT {', '.join(PROMOTION_COLUMNS)} FROM promotions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY starts_at DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def search(self, title: Optional[str] = None, since: Optional[str] = None,
+               until: Optional[str] = None, min_price: Optional[float] = None,
+               max_price: Optional[float] = None, limit: Optional[int] = 50) -> List[Dict[str, Any]]:
+        """Find archived promotions, newest first.
+
+        Args:
+            title: Words that must all start a word of the title, in any order
+            since: Only promotions still running on or after this ISO date
+            until: Only promotions that started on or before this ISO date
+            min_price: Minimum original price in major currency units
+            max_price: Maximum original price in major currency units
+            limit: Maximum number of results, or None for all
+
+        Returns:
+            Promotion dicts with the PROMOTION_COLUMNS keys
+        """
+        sql, params = self._search_sql(title, since, until, min_price, max_price, limit)
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def query_plan(self, **filters) -> List[str]:
+        """SQLite's plan for search(**filters), to check which indexes it uses"""
+        sql, params = self._search_sql(**filters)
+        with self._lock:
+            return [row['detail'] for row in self._conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    def count(self) -> int:
+        """Number of archived promotions"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM promotions").fetchone()[0]
@@ -0,0 +1,108 @@
+"""Background polling of free-game promotions"""
+
+import http.client
+import logging
+import random
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.http import HttpError
+
+from .tracker import FreeGamesTracker
+
+logger = logging.getLogger(__name__)
+
+ChangeCallback = Callable[[List[Dict[str, Any]], List[Dict[str, Any]]], None]
+
+
+class PromotionPoller:
+    """Polls the promotions endpoint on a background thread.
+
+    Each cycle revalidates the cached payload, which costs a 304 when
+    nothing changed, and only diffs it against the seen-promotions index
+    when the body differs from the one last processed. ``on_change`` is
+    called with (new, ended) when that diff finds something. Intervals are
+    jittered so many clients do not poll in lockstep, and failed polls back
+    off exponentially up to ``backoff_max``.
+    """
+
+    def __init__(self, tracker: FreeGamesTracker, interval: float = 3600.0, jitter: float = 0.1,
+                 backoff_base: float = 60.0, backoff_max: float = 3600.0,
+                 on_change: Optional[ChangeCallback] = None,
+                 rng: Optional[random.Random] = None):
+        """Initialize the poller.
+
+        Args:
+            tracker: Tracker whose payload and seen index are polled
+            interval: Seconds between polls while the server answers
+            jitter: Fraction by which each interval is randomly stretched or shrunk
+            backoff_base: Delay after the first failed poll in seconds
+            backoff_max: Upper bound on the delay after failures in seconds
+            on_change: Called with (new games, ended promotions)
+            rng: Random source for the jitter, replaceable for testing
+        """
+        self.tracker = tracker
+        self.interval = interval
+        self.jitter = jitter
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.on_change = on_change
+        self.rng = rng or random.Random()
+        self.polls = 0
+        self.changes = 0
+        self.failures = 0  # Consecutive failed polls
+        self._stop = threading.Event()
+        self._thread = None
+
+    def next_delay(self) -> float:
+        """Seconds until the next poll, given the failures so far"""
+        if self.failures:
+            delay = min(self.backoff_max, self.backoff_base * (2 ** (self.failures - 1)))
+            return delay * self.rng.uniform(0.5, 1.0)
+        return self.interval * self.rng.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    def run_once(self) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """Poll once.
+
+        Returns:
+            (new, ended) if the payload changed, else None; also None after a
+            failure, which is counted for the backoff
+        """
+        self.polls += 1
+        try:
+            result = self.tracker.poll()
+        except (OSError, http.client.HTTPException, HttpError, ValueError) as e:
+            self.failures += 1
+            logger.warning("Polling free games failed (%d in a row): %s", self.failures, e)
+            return None
+        self.failures = 0
+        if result is None:
+            return None
+        self.changes += 1
+        new, ended = result
+        if (new or ended) and self.on_change is not None:
+            try:
+                self.on_change(new, ended)
+            except Exception:
+                logger.exception("Free games change callback failed")
+        return result
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.next_delay())
+
+    def start(self):
+        """Start polling; the first poll happens immediately"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='free-games-poller', daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop polling"""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+        self._thread = None
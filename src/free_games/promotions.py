@@ -0,0 +1,179 @@
+"""Parsing of the Epic Games Store freeGamesPromotions payload"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+STORE_PRODUCT_URL = 'https://store.epicgames.com/en-US/p/{slug}'
+DATE_FORMAT = '%Y-%m-%d'
+IMAGE_TYPES = ('Thumbnail', 'OfferImageWide', 'DieselStoreFrontWide', 'OfferImageTall')
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp from the store API as an aware UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def elements(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The offer elements of a decoded payload"""
+    try:
+        found = payload['data']['Catalog']['searchStore']['elements']
+    except (KeyError, TypeError):
+        return []
+    return found if isinstance(found, list) else []
+
+
+def _free_windows(groups: Optional[List[Dict[str, Any]]]) -> List[Tuple[datetime, datetime]]:
+    """(start, end) of every 100%-off promotion in a promotionalOffers list"""
+    windows = []
+    for group in groups or []:
+        for offer in group.get('promotionalOffers') or []:
+            discount = offer.get('discountSetting') or {}
+            if discount.get('discountPercentage') != 0:
+                continue
+            start = parse_timestamp(offer.get('startDate'))
+            end = parse_timestamp(offer.get('endDate'))
+            if start and end:
+                windows.append((start, end))
+    return windows
+
+
+def _store_url(element: Dict[str, Any]) -> str:
+    for mapping in (element.get('catalogNs') or {}).get('mappings') or []:
+        if mapping.get('pageSlug') and mapping.get('pageType', 'productHome') == 'productHome':
+            return STORE_PRODUCT_URL.format(slug=mapping['pageSlug'])
+    for mapping in element.get('offerMappings') or []:
+        if mapping.get('pageSlug'):
+            return STORE_PRODUCT_URL.format(slug=mapping['pageSlug'])
+    slug = element.get('productSlug') or element.get('urlSlug') or ''
+    return STORE_PRODUCT_URL.format(slug=slug.split('/')[0])
+
+
+def _image_url(element: Dict[str, Any]) -> str:
+    images = {image.get('type'): image.get('url') for image in element.get('keyImages') or []}
+    for image_type in IMAGE_TYPES:
+        if images.get(image_type):
+            return images[image_type]
+    return next((url for url in images.values() if url), '')
+
+
+def _original_price(element: Dict[str, Any]) -> str:
+    total = (element.get('price') or {}).get('totalPrice') or {}
+    formatted = (total.get('fmtPrice') or {}).get('originalPrice')
+    if formatted:
+        return formatted
+    amount = total.get('originalPrice')
+    if amount is None:
+        return ''
+    decimals = (total.get('currencyInfo') or {}).get('decimals', 2)
+    return f"{amount / 10 ** decimals:.{decimals}f} {total.get('currencyCode', '')}".strip()
+
+
+def _original_amount(element: Dict[str, Any]) -> Tuple[Optional[float], str]:
+    """Original price in major currency units, and the currency code"""
+    total = (element.get('price') or {}).get('totalPrice') or {}
+    amount = total.get('originalPrice')
+    if amount is None:
+        return None, total.get('currencyCode') or ''
+    decimals = (total.get('currencyInfo') or {}).get('decimals', 2)
+    return amount / 10 ** decimals, total.get('currencyCode') or ''
+
+
+def _local_date(moment: datetime) -> str:
+    return moment.astimezone().strftime(DATE_FORMAT)
+
+
+def _utc_stamp(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def current_offer(element: Dict[str, Any], now: datetime) -> Optional[Dict[str, Any]]:
+    """The element as a currently-free game, or None if it is not free right now"""
+    promotions = element.get('promotions') or {}
+    for start, end in _free_windows(promotions.get('promotionalOffers')):
+        if start <= now < end:
+            return {
+                'id': element.get('id', ''),
+                'starts_at': _utc_stamp(start),
+                'ends_at': _utc_stamp(end),
+                'title': element.get('title', ''),
+                'description': element.get('description', ''),
+                'original_price': _original_price(element),
+                'end_date': _local_date(end),
+                'store_url': _store_url(element),
+                'image_url': _image_url(element),
+            }
+    return None
+
+
+def upcoming_offer(element: Dict[str, Any], now: datetime) -> Optional[Dict[str, Any]]:
+    """The element as an upcoming free game, or None if no free promotion is scheduled"""
+    promotions = element.get('promotions') or {}
+    windows = [window for window in _free_windows(promotions.get('upcomingPromotionalOffers'))
+               if window[0] > now]
+    if not windows:
+        return None
+    start, end = min(windows)
+    return {
+        'id': element.get('id', ''),
+        'starts_at': _utc_stamp(start),
+        'ends_at': _utc_stamp(end),
+        'title': element.get('title', ''),
+        'description': element.get('description', ''),
+        'original_price': _original_price(element),
+        'start_date': _local_date(start),
+        'image_url': _image_url(element),
+    }
+
+
+def observed_offers(offer_elements: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Every 100%-off promotion window in the elements, past, current or upcoming"""
+    for element in offer_elements:
+        element_promotions = element.get('promotions') or {}
+        windows = (_free_windows(element_promotions.get('promotionalOffers'))
+                   + _free_windows(element_promotions.get('upcomingPromotionalOffers')))
+        if not windows:
+            continue
+        amount, currency = _original_amount(element)
+        for start, end in windows:
+            yield {
+                'id': element.get('id', ''),
+                'title': element.get('title', ''),
+                'starts_at': _utc_stamp(start),
+                'ends_at': _utc_stamp(end),
+                'original_price': _original_price(element),
+                'original_amount': amount,
+                'currency': currency,
+                'store_url': _store_url(element),
+                'image_url': _image_url(element),
+            }
+
+
+def free_games(offer_elements: Iterable[Dict[str, Any]], now: Optional[datetime] = None
+               ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Split offer elements into (currently free, upcoming free) games.
+
+    Args:
+        offer_elements: Elements of the promotions payload
+        now: Reference time (aware); defaults to the current time
+
+    Returns:
+        Tuple of (current, upcoming) game dicts, in payload order
+    """
+    now = now or datetime.now(timezone.utc)
+    current, upcoming = [], []
+    for element in offer_elements:
+        offer = current_offer(element, now)
+        if offer is not None:
+            current.append(offer)
+        offer = upcoming_offer(element, now)
+        if offer is not None:
+            upcoming.append(offer)
+    return current, upcoming
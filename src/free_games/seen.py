@@ -0,0 +1,123 @@
+"""Persistent index of free-game promotions already reported"""
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from core.fileio import atomic_write_json, quarantine
+from core.locking import FileLock
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+
+def promotion_key(game: Dict[str, Any]) -> str:
+    """Identity of one promotion: the offer ID plus its window"""
+    return f"{game.get('id', '')}@{game.get('starts_at', '')}/{game.get('ends_at', '')}"
+
+
+class SeenPromotions:
+    """Promotions already reported, keyed by offer ID and promotion window.
+
+    New and ended promotions are set differences between the keys of the
+    current payload and the stored ones, so the same offer running again
+    later counts as new. Ended promotions are kept for ``retention_days``,
+    so an offer that briefly drops out of the payload is not reported twice.
+    The index is updated under an exclusive file lock and written
+    atomically, so the CLI, the GUI and a background poller agree on what
+    was already announced.
+    """
+
+    def __init__(self, path: Optional[Path] = None, retention_days: int = 30,
+                 clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc)):
+        """Initialize the index.
+
+        Args:
+            path: Index file; defaults to ~/.epic-games-manager/free_games_seen.json
+            retention_days: Days an ended promotion is remembered
+            clock: Returns the current aware datetime, replaceable for testing
+        """
+        self.path = Path(path or Path.home() / '.epic-games-manager' / 'free_games_seen.json')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention = timedelta(days=retention_days)
+        self._clock = clock
+        self._lock = FileLock.for_file(self.path)
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION and isinstance(data.get('promotions'), dict):
+                return data
+            logger.warning("Unknown seen-promotions index format in %s; starting over", self.path)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            moved = quarantine(self.path)
+            logger.warning("Unreadable seen-promotions index %s (%s); moved to %s", self.path, e, moved)
+        return {'version': INDEX_VERSION, 'payload_digest': None, 'promotions': {}}
+
+    def load(self) -> Dict[str, Any]:
+        """The whole index as stored"""
+        with self._lock.shared():
+            return self._read()
+
+    def active_keys(self) -> Set[str]:
+        """Keys of promotions seen and not yet ended"""
+        return {key for key, entry in self.load()['promotions'].items() if not entry.get('ended_at')}
+
+    def payload_digest(self) -> Optional[str]:
+        """Digest of the payload the index was last updated from"""
+        return self.load().get('payload_digest')
+
+    def update(self, current: List[Dict[str, Any]], payload_digest: Optional[str] = None
+               ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Record the currently free games and report what changed.
+
+        Args:
+            current: Games currently free, as returned by FreeGamesTracker
+            payload_digest: Digest of the payload ``current`` came from
+
+        Returns:
+            Tuple of (new games, ended promotions); new games are the dicts
+            from ``current`` in their order, ended ones the stored entries
+        """
+        now = self._clock()
+        stamp = now.strftime('%Y-%m-%dT%H:%M:%SZ')
+        by_key = {promotion_key(game): game for game in current}
+        with self._lock.exclusive():
+            data = self._read()
+            entries = data['promotions']
+            active = {key for key, entry in entries.items() if not entry.get('ended_at')}
+            new_keys = by_key.keys() - entries.keys()
+            ended_keys = active - by_key.keys()
+            returned_keys = (by_key.keys() & entries.keys()) - active
+
+            for key in new_keys:
+                game = by_key[key]
+                entries[key] = {'id': game.get('id', ''), 'title': game.get('title', ''),
+                                'store_url': game.get('store_url', ''),
+                                'starts_at': game.get('starts_at', ''), 'ends_at': game.get('ends_at', ''),
+                                'first_seen': stamp, 'ended_at': None}
+            for key in returned_keys:
+                entries[key]['ended_at'] = None
+            for key in ended_keys:
+                entries[key]['ended_at'] = stamp
+
+            cutoff = (now - self.retention).strftime('%Y-%m-%dT%H:%M:%SZ')
+            expired = [key for key, entry in entries.items()
+                       if entry.get('ended_at') and entry['ended_at'] < cutoff]
+            for key in expired:
+                del entries[key]
+
+            if new_keys or ended_keys or returned_keys or expired or data.get('payload_digest') != payload_digest:
+                data['payload_digest'] = payload_digest
+                atomic_write_json(self.path, data)
+            ended = [dict(entries[key], key=key) for key in sorted(ended_keys)]
+
+        if new_keys or ended_keys:
+            logger.info("Promotions: %d new, %d ended", len(new_keys), len(ended_keys))
+        return [game for key, game in by_key.items() if key in new_keys], ended
@@ -0,0 +1,186 @@
+"""Streaming, projected parsing of the freeGamesPromotions payload.
+
+The payload is one large JSON document, but the tracker only needs a few
+fields of each element under ``data.Catalog.searchStore.elements``. Instead
+of decoding the whole document, the stream is read in chunks, the walker
+descends to that array and decodes one element at a time, and every
+element is cut down to the fields promotions.py reads. Peak memory is one
+chunk plus one element, and elements that never go free are dropped.
+"""
+
+import codecs
+import io
+import json
+import re
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from . import promotions
+
+ELEMENTS_PATH = ('data', 'Catalog', 'searchStore', 'elements')
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decoder = json.JSONDecoder()
+
+
+class PayloadError(ValueError):
+    """Raised when the payload is not well-formed JSON"""
+
+
+class _ChunkReader:
+    """Decoded text over a binary stream, refilled as the walker advances"""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping consumed text; False at end of stream"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        text = self.decoder.decode(chunk, final=self.eof)
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at end of input"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise PayloadError(f"Expected {char!r}, found {found or 'end of input'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the JSON value at the current position"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.fill():
+                    continue
+                raise PayloadError(str(e)) from e
+            # A number or literal cut off by the chunk boundary still decodes
+            if end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_elements(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield the elements of ``data.Catalog.searchStore.elements`` one by one.
+
+    Sibling values met on the way down are decoded and discarded, and
+    nothing after the array is read. A payload without the array (for
+    example ``{"data": null, "errors": [...]}``) yields nothing.
+
+    Raises:
+        PayloadError: If the document is malformed before the array ends
+    """
+    reader = _ChunkReader(stream, chunk_size)
+    for key in ELEMENTS_PATH:
+        if reader.peek() != '{':
+            return
+        reader.pos += 1
+        while True:
+            if reader.peek() == '}':
+                return
+            name = reader.value()
+            reader.expect(':')
+            if name == key:
+                break
+            reader.value()
+            if reader.peek() == ',':
+                reader.pos += 1
+
+    if reader.peek() != '[':
+        return
+    reader.pos += 1
+    if reader.peek() == ']':
+        return
+    while True:
+        element = reader.value()
+        if isinstance(element, dict):
+            yield element
+        separator = reader.peek()
+        reader.pos += 1
+        if separator == ']':
+            return
+        if separator != ',':
+            raise PayloadError(f"Expected ',' or ']' in elements, found {separator or 'end of input'!r}")
+
+
+def _has_free_window(element_promotions: Dict[str, Any]) -> bool:
+    for field in ('promotionalOffers', 'upcomingPromotionalOffers'):
+        for group in element_promotions.get(field) or []:
+            for offer in group.get('promotionalOffers') or []:
+                if (offer.get('discountSetting') or {}).get('discountPercentage') == 0:
+                    return True
+    return False
+
+
+def project(element: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Cut an element down to the fields promotions.py reads.
+
+    Returns:
+        The projected element, or None if it has no 100%-off promotion now
+        or upcoming and so can never be listed
+    """
+    element_promotions = element.get('promotions') or {}
+    if not _has_free_window(element_promotions):
+        return None
+    total = (element.get('price') or {}).get('totalPrice') or {}
+    return {
+        'id': element.get('id', ''),
+        'title': element.get('title', ''),
+        'description': element.get('description', ''),
+        'keyImages': [{'type': image.get('type'), 'url': image.get('url')}
+                      for image in element.get('keyImages') or []],
+        'catalogNs': {'mappings': [{'pageSlug': m.get('pageSlug'), 'pageType': m.get('pageType', 'productHome')}
+                                   for m in (element.get('catalogNs') or {}).get('mappings') or []]},
+        'offerMappings': [{'pageSlug': m.get('pageSlug')} for m in element.get('offerMappings') or []],
+        'productSlug': element.get('productSlug'),
+        'urlSlug': element.get('urlSlug'),
+        'price': {'totalPrice': {
+            'originalPrice': total.get('originalPrice'),
+            'currencyCode': total.get('currencyCode'),
+            'currencyInfo': total.get('currencyInfo') or {},
+            'fmtPrice': {'originalPrice': (total.get('fmtPrice') or {}).get('originalPrice')},
+        }},
+        'promotions': {
+            'promotionalOffers': element_promotions.get('promotionalOffers') or [],
+            'upcomingPromotionalOffers': element_promotions.get('upcomingPromotionalOffers') or [],
+        },
+    }
+
+
+def _as_stream(source: Union[bytes, BinaryIO]) -> BinaryIO:
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+
+def iter_projected(source: Union[bytes, BinaryIO], chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """Projected elements that can be free now or later, in payload order"""
+    for element in iter_elements(_as_stream(source), chunk_size):
+        projected = project(element)
+        if projected is not None:
+            yield projected
+
+
+def parse_free_games(source: Union[bytes, BinaryIO], now: Optional[datetime] = None,
+                     chunk_size: int = CHUNK_SIZE) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Streaming counterpart of promotions.free_games(promotions.elements(json.load(source)))"""
+    return promotions.free_games(iter_projected(source, chunk_size), now)
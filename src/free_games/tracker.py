@@ -1,70 +1,151 @@
 """Free games tracker for Epic Games Store"""
 
-import json
-import urllib.request
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+import hashlib
+import http.client
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+from core.http import CachedHttpClient, CachedResponse, HttpError
+
+from . import promotions, stream
+from .archive import PromotionArchive
+from .seen import SeenPromotions
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions"
 
 class FreeGamesTracker:
     """Tracks and notifies about free games on Epic Games Store"""
     
-    def __init__(self):
-        # This would normally use Epic's API, but for demo purposes we'll use mock data
-        self.api_url = "https://store-site-backend-static.ak.epicgames.com/freeGamesPromotions"
+    def __init__(self, client: Optional[CachedHttpClient] = None, api_url: Optional[str] = None,
+                 cache_ttl: float = 3600.0, seen: Optional[SeenPromotions] = None,
+                 check_interval: float = 3600.0, archive: Optional[PromotionArchive] = None):
+        """Initialize the tracker.
+        
+        Args:
+            client: HTTP client; by default one caching under ~/.epic-games-manager/http-cache
+            api_url: Promotions endpoint, replaceable for testing
+            cache_ttl: Seconds the promotions payload is reused before revalidating it
+            seen: Index of promotions already reported
+            check_interval: Minimum seconds between two check_for_new_games calls
+            archive: History of every promotion observed; by default
+                ~/.epic-games-manager/free_games_archive.db
+        """
+        self.api_url = api_url or API_URL
+        self.client = client or CachedHttpClient(ttl=cache_ttl)
+        self.seen = seen or SeenPromotions()
+        self.check_interval = check_interval
+        self.archive = archive or PromotionArchive(
+            Path.home() / '.epic-games-manager' / 'free_games_archive.db')
         self.cached_games = []
         self.last_check = None
+        self.offline = False  # True when the last fetch fell back to a stale copy
+        self._body = None
+        self._digest = None
+        self._elements = []
+        
+    def _fetch(self, ttl: Optional[float] = None, allow_stale: bool = True) -> CachedResponse:
+        """Promotions payload through the HTTP cache"""
+        response = self.client.get(self.api_url, headers={'Accept': 'application/json'},
+                                   ttl=ttl, allow_stale=allow_stale)
+        self.offline = response.stale
+        return response
+        
+    def _elements_for(self, response: CachedResponse) -> List[Dict[str, any]]:
+        """Offer elements of a payload, parsed once per distinct body.
+        
+        Only the elements that can be free, projected to the fields the
+        tracker uses, are kept; see free_games.stream. Every promotion in a
+        new body is added to the archive.
+        """
+        if response.body != self._body:
+            self._elements = list(stream.iter_projected(response.body))
+            try:
+                self.archive.record(promotions.observed_offers(self._elements))
+            except sqlite3.Error as e:
+                logger.warning("Could not archive promotions: %s", e)
+            self._body = response.body
+            self._digest = hashlib.sha1(response.body).hexdigest()
+        return self._elements
+        
+    def _fetch_elements(self) -> List[Dict[str, any]]:
+        """Offer elements of the promotions payload.
+        
+        The payload comes through the HTTP cache, so repeated calls within
+        the TTL make no request and later ones are conditional.
+        """
+        try:
+            return self._elements_for(self._fetch())
+        except (OSError, http.client.HTTPException, HttpError) as e:
+            logger.warning("Could not fetch free games: %s", e)
+        except ValueError as e:
+            logger.warning("Invalid free games payload: %s", e)
+        return []
         
     def get_current_free(self) -> List[Dict[str, any]]:
         """Get currently free games"""
-        # In a real implementation, this would fetch from Epic's API
-        # For now, return mock data
-        mock_games = [
-            {
-                'title': 'Example Game 1',
-                'description': 'An amazing adventure game',
-                'original_price': '$29.99',
-                'end_date': (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d'),
-                'store_url': 'https://store.epicgames.com/en-US/p/example-game-1',
-                'image_url': 'https://example.com/game1.jpg'
-            },
-            {
-                'title': 'Example Game 2',
-                'description': 'A thrilling action game',
-                'original_price': '$19.99',
-                'end_date': (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d'),
-                'store_url': 'https://store.epicgames.com/en-US/p/example-game-2',
-                'image_url': 'https://example.com/game2.jpg'
-            }
-        ]
-        
-        self.cached_games = mock_games
-        self.last_check = datetime.now()
-        return mock_games
+        current, _ = promotions.free_games(self._fetch_elements())
+        self.cached_games = current
+        return current
+    
+    def search_history(self, title: Optional[str] = None, **filters) -> List[Dict[str, any]]:
+        """Search every promotion observed so far; see PromotionArchive.search"""
+        return self.archive.search(title, **filters)
     
     def get_upcoming_free(self) -> List[Dict[str, any]]:
         """Get upcoming free games"""
-        # Mock data for upcoming games
-        upcoming = [
-            {
-                'title': 'Future Game 1',
-                'description': 'Coming next week',
-                'original_price': '$39.99',
-                'start_date': (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d'),
-                'image_url': 'https://example.com/future1.jpg'
-            }
-        ]
+        _, upcoming = promotions.free_games(self._fetch_elements())
         return upcoming
     
+    def _diff(self, elements: List[Dict[str, any]]) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
+        current, _ = promotions.free_games(elements)
+        self.cached_games = current
+        return self.seen.update(current, self._digest)
+    
+    def check_for_changes(self) -> Tuple[List[Dict[str, any]], List[Dict[str, any]]]:
+        """Compare the currently free games with the seen-promotions index.
+        
+        Returns:
+            Tuple of (games not reported before, promotions that ended); both
+            empty if the payload could not be fetched
+        """
+        try:
+            elements = self._elements_for(self._fetch())
+        except (OSError, http.client.HTTPException, HttpError, ValueError) as e:
+            # Without a payload every known promotion would look ended
+            logger.warning("Could not check free games: %s", e)
+            return [], []
+        return self._diff(elements)
+    
+    def poll(self) -> Optional[Tuple[List[Dict[str, any]], List[Dict[str, any]]]]:
+        """Revalidate the payload and diff it only if it changed.
+        
+        Unlike the other methods this always asks the server (conditionally),
+        never serves a stale copy and lets fetch errors propagate, so a
+        poller can back off.
+        
+        Returns:
+            (new, ended) as check_for_changes, or None if the payload is the
+            one the index was last updated from
+        """
+        elements = self._elements_for(self._fetch(ttl=0, allow_stale=False))
+        if self._digest == self.seen.payload_digest():
+            return None
+        return self._diff(elements)
+    
     def check_for_new_games(self) -> List[Dict[str, any]]:
         """Check if there are new free games since last check"""
-        current_games = self.get_current_free()
-        
-        # In a real implementation, compare with previously seen games
-        # For now, just return current games if it's been more than an hour
-        if self.last_check and (datetime.now() - self.last_check).seconds < 3600:
+        # Throttle before fetching, otherwise every call costs a request
+        if self.last_check and (datetime.now() - self.last_check).total_seconds() < self.check_interval:
             return []
         
-        return current_games
+        new_games, _ = self.check_for_changes()
+        self.last_check = datetime.now()
+        return new_games
     
     def format_notification(self, games: List[Dict[str, any]]) -> str:
         """Format games list for notification"""
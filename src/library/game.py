@@ -76,6 +76,11 @@ class Game:
             
         return manifest_dict
     
+    @property
+    def size_gb(self) -> float:
+        """Installed size in GiB"""
+        return (self.install_size or 0) / 1024 ** 3
+    
     def is_installed(self) -> bool:
         """Check if the game is actually installed at the specified location.
         
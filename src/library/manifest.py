@@ -7,11 +7,23 @@ from typing import List, Dict, Any, Optional, Tuple
 import logging
 from datetime import datetime
 
+from core import metrics
+from core.fileio import atomic_write_json
+from core.locking import FileLock
+from core.logs import LoopLog
+
 from .game import Game
 from .scanner import LibraryScanner
 
 logger = logging.getLogger(__name__)
 
+# Summary lines logged after bulk_update_location instead of a line per game;
+# the final "Updated N games, M failed" line covers updates and failures
+BULK_UPDATE_SUMMARIES = {
+    'backup': "Backed up {count:,} manifests",
+    'skipped': "Skipped {count:,} games not found in new location",
+}
+
 
 class ManifestManager:
     """Manages Epic Games manifest files and repairs."""
@@ -24,6 +36,8 @@ class ManifestManager:
         """
         self.scanner = scanner or LibraryScanner()
         self.backup_dir = self._get_backup_directory()
+        # Serializes manifest edits with other instances of this tool
+        self._lock = FileLock.for_directory(self.scanner.manifest_dir)
     
     @staticmethod
     def _get_backup_directory() -> Path:
@@ -45,8 +59,13 @@ class ManifestManager:
         Returns:
             Path to the backup file or None if backup failed
         """
+        return self._backup_manifest(game, LoopLog(logger))
+    
+    @metrics.timed('manifest.backup')
+    def _backup_manifest(self, game: Game, log: LoopLog) -> Optional[Path]:
         if not game.manifest_path or not game.manifest_path.exists():
-            logger.error(f"Cannot backup manifest for {game.display_name}: manifest path not found")
+            log.error('failed', "Cannot backup manifest for %s: manifest path not found", game.display_name,
+                      app_name=game.app_name)
             return None
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -55,10 +74,12 @@ class ManifestManager:
         
         try:
             shutil.copy2(game.manifest_path, backup_path)
-            logger.info(f"Created backup: {backup_path}")
+            metrics.incr('manifest.backups_written')
+            log.info('backup', "Created backup: %s", backup_path, app_name=game.app_name, path=str(backup_path))
             return backup_path
         except Exception as e:
-            logger.error(f"Failed to backup manifest for {game.display_name}: {e}")
+            log.error('failed', "Failed to backup manifest for %s: %s", game.display_name, e,
+                      app_name=game.app_name)
             return None
     
     def update_game_location(self, game: Game, new_base_path: Path) -> bool:
@@ -71,54 +92,66 @@ class ManifestManager:
         Returns:
             True if update was successful
         """
+        return self._update_game_location(game, new_base_path, LoopLog(logger))
+    
+    @metrics.timed('manifest.update_location')
+    def _update_game_location(self, game: Game, new_base_path: Path, log: LoopLog) -> bool:
         if not game.manifest_path or not game.manifest_path.exists():
-            logger.error(f"Cannot update manifest for {game.display_name}: manifest path not found")
+            log.error('failed', "Cannot update manifest for %s: manifest path not found", game.display_name,
+                      app_name=game.app_name)
             return False
         
         # Check if the new location actually exists
         new_game_path = new_base_path / game.get_game_folder_name()
         if not new_game_path.exists():
-            logger.error(f"New game location does not exist: {new_game_path}")
+            log.error('failed', "New game location does not exist: %s", new_game_path, app_name=game.app_name)
             return False
         
         # Backup the manifest first
-        backup_path = self.backup_manifest(game)
+        backup_path = self._backup_manifest(game, log)
         if not backup_path:
-            logger.warning("Failed to create backup, proceeding anyway...")
+            log.warning('failed', "Failed to create backup for %s, proceeding anyway...", game.display_name,
+                        app_name=game.app_name)
         
         try:
-            # Read the current manifest
-            with open(game.manifest_path, 'r', encoding='utf-8') as f:
-                manifest_data = json.load(f)
-            
-            # Update the game object
-            game.update_location(new_base_path)
+            with self._lock.exclusive():
+                # Read the current manifest
+                with open(game.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest_data = json.load(f)
+                
+                # Update the game object
+                game.update_location(new_base_path)
+                
+                # Update the manifest data
+                manifest_data['InstallLocation'] = str(game.install_location)
+                manifest_data['ManifestLocation'] = str(game.manifest_location)
+                manifest_data['StagingLocation'] = str(game.staging_location)
+                
+                # Write the updated manifest
+                with metrics.span('manifest.write'):
+                    atomic_write_json(game.manifest_path, manifest_data)
             
-            # Update the manifest data
-            manifest_data['InstallLocation'] = str(game.install_location)
-            manifest_data['ManifestLocation'] = str(game.manifest_location)
-            manifest_data['StagingLocation'] = str(game.staging_location)
-            
-            # Write the updated manifest
-            with open(game.manifest_path, 'w', encoding='utf-8') as f:
-                json.dump(manifest_data, f, indent=2)
-            
-            logger.info(f"Updated manifest for {game.display_name} to {new_game_path}")
+            log.info('updated', "Updated manifest for %s to %s", game.display_name, new_game_path,
+                     app_name=game.app_name, path=str(new_game_path))
             return True
             
         except Exception as e:
-            logger.error(f"Failed to update manifest for {game.display_name}: {e}")
+            log.error('failed', "Failed to update manifest for %s: %s", game.display_name, e,
+                      app_name=game.app_name)
             
             # Try to restore from backup
             if backup_path and backup_path.exists():
                 try:
                     shutil.copy2(backup_path, game.manifest_path)
-                    logger.info("Restored manifest from backup")
+                    log.info('restored', "Restored manifest for %s from backup", game.display_name,
+                             app_name=game.app_name)
                 except Exception as restore_error:
-                    logger.error(f"Failed to restore backup: {restore_error}")
+                    log.error('failed', "Failed to restore backup of %s: %s", game.display_name, restore_error,
+                              app_name=game.app_name)
             
             return False
     
+    @metrics.timed('manifest.bulk_update_location')
     def bulk_update_location(self, new_base_path: Path) -> Tuple[List[Game], List[Game]]:
         """Update the location for all games that exist in the new path.
         
@@ -129,31 +162,36 @@ class ManifestManager:
             Tuple of (updated_games, failed_games)
         """
         if not new_base_path.exists() or not new_base_path.is_dir():
-            logger.error(f"New base path does not exist or is not a directory: {new_base_path}")
+            logger.error("New base path does not exist or is not a directory: %s", new_base_path)
             return [], []
         
-        # Scan for current manifests
-        games = self.scanner.scan_manifests()
-        
         updated_games = []
         failed_games = []
         
-        for game in games:
-            # Check if the game exists in the new location
-            new_game_path = new_base_path / game.get_game_folder_name()
+        # Hold the lock for the whole batch so another instance cannot
+        # interleave its own edits between our scan and our writes
+        with self._lock.exclusive(), LoopLog(logger, summaries=BULK_UPDATE_SUMMARIES) as log:
+            # Scan for current manifests
+            games = self.scanner.scan_manifests()
             
-            if new_game_path.exists() and new_game_path.is_dir():
-                # Update the manifest
-                if self.update_game_location(game, new_base_path):
-                    updated_games.append(game)
+            for game in games:
+                # Check if the game exists in the new location
+                new_game_path = new_base_path / game.get_game_folder_name()
+                
+                if new_game_path.exists() and new_game_path.is_dir():
+                    # Update the manifest
+                    if self._update_game_location(game, new_base_path, log):
+                        updated_games.append(game)
+                    else:
+                        failed_games.append(game)
                 else:
-                    failed_games.append(game)
-            else:
-                logger.info(f"Skipping {game.display_name}: not found in new location")
+                    log.info('skipped', "Skipping %s: not found in new location", game.display_name,
+                             app_name=game.app_name)
         
-        logger.info(f"Updated {len(updated_games)} games, {len(failed_games)} failed")
+        logger.info("Updated %d games, %d failed", len(updated_games), len(failed_games))
         return updated_games, failed_games
     
+    @metrics.timed('manifest.repair')
     def repair_manifest(self, game: Game) -> bool:
         """Attempt to repair a corrupt or missing manifest.
         
@@ -164,7 +202,7 @@ class ManifestManager:
             True if repair was successful
         """
         if not game.is_installed():
-            logger.error(f"Cannot repair manifest for {game.display_name}: game not installed")
+            logger.error("Cannot repair manifest for %s: game not installed", game.display_name)
             return False
         
         try:
@@ -211,24 +249,54 @@ class ManifestManager:
                 if key not in manifest_data:
                     manifest_data[key] = value
             
-            # Write the repaired manifest
-            if game.manifest_path and game.manifest_path.exists():
-                # Backup first
-                self.backup_manifest(game)
-            else:
-                # Create a new manifest path
-                game.manifest_path = self.scanner.manifest_dir / f"{game.app_name}.item"
-            
-            with open(game.manifest_path, 'w', encoding='utf-8') as f:
-                json.dump(manifest_data, f, indent=2)
+            with self._lock.exclusive():
+                # Write the repaired manifest
+                if game.manifest_path and game.manifest_path.exists():
+                    # Backup first
+                    self.backup_manifest(game)
+                else:
+                    # Create a new manifest path
+                    game.manifest_path = self.scanner.manifest_dir / f"{game.app_name}.item"
+                
+                with metrics.span('manifest.write'):
+                    atomic_write_json(game.manifest_path, manifest_data)
             
-            logger.info(f"Repaired manifest for {game.display_name}")
+            logger.info("Repaired manifest for %s", game.display_name)
             return True
             
         except Exception as e:
-            logger.error(f"Failed to repair manifest for {game.display_name}: {e}")
+            logger.error("Failed to repair manifest for %s: %s", game.display_name, e)
             return False
     
+    def repair_game(self, name: str) -> bool:
+        """Repair the manifest of one game, looked up by display or app name.
+        
+        Args:
+            name: Display name or app name of the game
+            
+        Returns:
+            True if repair was successful
+        """
+        game = self.scanner.get_game_by_name(name)
+        if game is None:
+            logger.error("No installed game named %s", name)
+            return False
+        return self.repair_manifest(game)
+    
+    def repair_all(self) -> int:
+        """Repair every installed game whose manifest fails validation.
+        
+        Returns:
+            Number of manifests repaired
+        """
+        repaired = 0
+        for game in self.scanner.scan_manifests():
+            if game.is_installed() and not self.validate_manifest(game)['valid']:
+                if self.repair_manifest(game):
+                    repaired += 1
+        return repaired
+    
+    @metrics.timed('manifest.validate')
     def validate_manifest(self, game: Game) -> Dict[str, Any]:
         """Validate a game's manifest file.
         
@@ -252,8 +320,11 @@ class ManifestManager:
         
         try:
             # Load and parse the manifest
-            with open(game.manifest_path, 'r', encoding='utf-8') as f:
-                manifest_data = json.load(f)
+            with open(game.manifest_path, 'rb') as f:
+                raw = f.read()
+            metrics.incr('library.manifests_parsed')
+            metrics.incr('library.bytes_read', len(raw))
+            manifest_data = json.loads(raw)
             
             # Check required fields
             required_fields = ['AppName', 'DisplayName', 'InstallLocation']
@@ -294,7 +365,7 @@ class ManifestManager:
             True if removal was successful
         """
         if not game.manifest_path or not game.manifest_path.exists():
-            logger.warning(f"Manifest for {game.display_name} does not exist")
+            logger.warning("Manifest for %s does not exist", game.display_name)
             return True
         
         # Create backup before removal
@@ -303,9 +374,10 @@ class ManifestManager:
             logger.warning("Failed to create backup before removal")
         
         try:
-            game.manifest_path.unlink()
-            logger.info(f"Removed manifest for {game.display_name}")
+            with self._lock.exclusive():
+                game.manifest_path.unlink()
+            logger.info("Removed manifest for %s", game.display_name)
             return True
         except Exception as e:
-            logger.error(f"Failed to remove manifest for {game.display_name}: {e}")
+            logger.error("Failed to remove manifest for %s: %s", game.display_name, e)
             return False
\ No newline at end of file
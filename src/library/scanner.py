@@ -6,41 +6,53 @@ from pathlib import Path
 from typing import List, Optional, Dict, Any
 import logging
 
+from core import metrics
+from core.discovery import default_manifest_dir, find_manifest_directory
+from core.logs import LoopLog
+
 from .game import Game
 
 logger = logging.getLogger(__name__)
 
+# Summary lines logged after a scan instead of a line per manifest
+SCAN_SUMMARIES = {
+    'found': "Found {count:,} games",
+    'invalid': "Skipped {count:,} unreadable or incomplete manifests",
+}
+
 
 class LibraryScanner:
     """Scans for Epic Games installations and manifests."""
     
-    def __init__(self):
-        """Initialize the library scanner."""
-        self.manifest_dir = self._get_manifest_directory()
+    def __init__(self, manifest_dir: Optional[Path] = None):
+        """Initialize the library scanner.
+        
+        Args:
+            manifest_dir: Optional manifest directory to scan instead of the
+                discovered one
+        """
+        self.manifest_dir = manifest_dir or self._get_manifest_directory()
         self.games: List[Game] = []
     
     @staticmethod
     def _get_manifest_directory() -> Path:
         """Get the Epic Games manifest directory based on the platform.
         
+        Uses the shared discovery service, falling back to the platform's
+        conventional location when no manifest directory exists yet.
+        
         Returns:
             Path to the manifest directory
             
         Raises:
             NotImplementedError: If platform is not supported
         """
-        system = platform.system()
-        
-        if system == 'Windows':
-            return Path('C:/ProgramData/Epic/EpicGamesLauncher/Data/Manifests')
-        elif system == 'Darwin':  # macOS
-            return Path.home() / 'Library' / 'Application Support' / 'Epic' / 'EpicGamesLauncher' / 'Data' / 'Manifests'
-        elif system == 'Linux':
-            # Linux path may vary based on Wine/Proton setup
-            return Path.home() / '.config' / 'Epic' / 'EpicGamesLauncher' / 'Data' / 'Manifests'
-        else:
-            raise NotImplementedError(f"Platform {system} is not supported")
+        found = find_manifest_directory() or default_manifest_dir()
+        if found is None:
+            raise NotImplementedError(f"Platform {platform.system()} is not supported")
+        return found
     
+    @metrics.timed('library.scan')
     def scan_manifests(self) -> List[Game]:
         """Scan the manifest directory for installed games.
         
@@ -50,47 +62,57 @@ class LibraryScanner:
         self.games = []
         
         if not self.manifest_dir.exists():
-            logger.warning(f"Manifest directory does not exist: {self.manifest_dir}")
+            logger.warning("Manifest directory does not exist: %s", self.manifest_dir)
             return self.games
         
         # Scan for .item files
-        for manifest_file in self.manifest_dir.glob("*.item"):
-            try:
-                game = self._load_manifest(manifest_file)
-                if game:
-                    self.games.append(game)
-                    logger.info(f"Found game: {game.display_name}")
-            except Exception as e:
-                logger.error(f"Error loading manifest {manifest_file}: {e}")
+        with LoopLog(logger, summaries=SCAN_SUMMARIES) as log:
+            for manifest_file in self.manifest_dir.glob("*.item"):
+                try:
+                    game = self._load_manifest(manifest_file, log)
+                    if game:
+                        self.games.append(game)
+                        log.info('found', "Found game: %s", game.display_name, app_name=game.app_name)
+                except Exception as e:
+                    log.error('invalid', "Error loading manifest %s: %s", manifest_file, e,
+                              path=str(manifest_file))
         
         return self.games
     
-    def _load_manifest(self, manifest_path: Path) -> Optional[Game]:
+    def _load_manifest(self, manifest_path: Path, log: Optional[LoopLog] = None) -> Optional[Game]:
         """Load a single manifest file.
         
         Args:
             manifest_path: Path to the manifest .item file
+            log: Loop log of the scan this load is part of
             
         Returns:
             Game instance or None if loading failed
         """
+        log = log or LoopLog(logger)
         try:
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                manifest_data = json.load(f)
+            with open(manifest_path, 'rb') as f:
+                raw = f.read()
+            metrics.incr('library.manifests_parsed')
+            metrics.incr('library.bytes_read', len(raw))
+            manifest_data = json.loads(raw)
             
             # Basic validation
             required_fields = ['AppName', 'DisplayName', 'InstallLocation']
             if not all(field in manifest_data for field in required_fields):
-                logger.warning(f"Manifest {manifest_path} missing required fields")
+                log.warning('invalid', "Manifest %s missing required fields", manifest_path,
+                            path=str(manifest_path))
+                metrics.incr('library.manifest_errors')
                 return None
             
             return Game.from_manifest(manifest_data, manifest_path)
             
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in manifest {manifest_path}: {e}")
+            log.error('invalid', "Invalid JSON in manifest %s: %s", manifest_path, e, path=str(manifest_path))
         except Exception as e:
-            logger.error(f"Error loading manifest {manifest_path}: {e}")
+            log.error('invalid', "Error loading manifest %s: %s", manifest_path, e, path=str(manifest_path))
         
+        metrics.incr('library.manifest_errors')
         return None
     
     def find_installed_games(self) -> List[Game]:
@@ -103,7 +125,7 @@ class LibraryScanner:
             self.scan_manifests()
         
         installed_games = [game for game in self.games if game.is_installed()]
-        logger.info(f"Found {len(installed_games)} installed games out of {len(self.games)} manifests")
+        logger.info("Found %d installed games out of %d manifests", len(installed_games), len(self.games))
         
         return installed_games
     
@@ -117,7 +139,7 @@ class LibraryScanner:
             self.scan_manifests()
         
         missing_games = [game for game in self.games if not game.is_installed()]
-        logger.info(f"Found {len(missing_games)} missing games out of {len(self.games)} manifests")
+        logger.info("Found %d missing games out of %d manifests", len(missing_games), len(self.games))
         
         return missing_games
     
@@ -133,16 +155,17 @@ class LibraryScanner:
         games_found = []
         
         if not directory.exists() or not directory.is_dir():
-            logger.warning(f"Directory does not exist or is not a directory: {directory}")
+            logger.warning("Directory does not exist or is not a directory: %s", directory)
             return games_found
         
         # Look for directories containing .egstore folder (Epic Games marker)
-        for item in directory.iterdir():
-            if item.is_dir():
-                egstore_path = item / '.egstore'
-                if egstore_path.exists() and egstore_path.is_dir():
-                    games_found.append(item)
-                    logger.info(f"Found Epic Games installation: {item}")
+        with LoopLog(logger, summaries={'installation': "Found {count:,} Epic Games installations"}) as log:
+            for item in directory.iterdir():
+                if item.is_dir():
+                    egstore_path = item / '.egstore'
+                    if egstore_path.exists() and egstore_path.is_dir():
+                        games_found.append(item)
+                        log.info('installation', "Found Epic Games installation: %s", item, path=str(item))
         
         return games_found
     
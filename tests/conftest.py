@@ -0,0 +1,10 @@
+"""Shared pytest setup: import the library from src/, the GUI module from the
+project root and the stand-in server and corpus generator from benchmarks/"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "src", ROOT / "benchmarks"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
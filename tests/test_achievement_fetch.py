@@ -0,0 +1,96 @@
+"""BatchAchievementFetcher against the local stand-in server"""
+
+import asyncio
+import time
+
+import pytest
+
+from achievements.fetcher import BatchAchievementFetcher, ConnectionPool, HostRateLimiter, HttpAchievementSource
+from achievements.store import AchievementStore
+from achievements.sync import AchievementSync
+from bench_achievement_fetch import make_library, serve
+from standin_server import StandinServer
+
+GAMES = 30
+PER_GAME = 6
+
+
+def snapshot(store):
+    return sorted((s["game_id"], s["total"], s["unlocked"]) for s in store.game_summaries())
+
+
+@pytest.fixture
+def library():
+    return make_library(GAMES, PER_GAME)
+
+
+@pytest.fixture
+def store():
+    store = AchievementStore(":memory:")
+    yield store
+    store.close()
+
+
+def fetcher_for(server, store, **kwargs):
+    source = HttpAchievementSource(server.base_url, pool=ConnectionPool())
+    kwargs.setdefault("concurrency", 4)
+    kwargs.setdefault("requests_per_second", 1000.0)
+    return BatchAchievementFetcher(store, source, backoff_base=0.01, **kwargs)
+
+
+def test_batched_fetch_matches_a_sequential_sync(library, store):
+    with StandinServer() as server:
+        serve(server, library, 0, 0)
+        expected = AchievementStore(":memory:")
+        AchievementSync(expected, HttpAchievementSource(server.base_url, pool=ConnectionPool())).sync()
+
+    with StandinServer() as server:
+        # Every fifth game answers 503 once before succeeding
+        serve(server, library, 0, 5)
+        fetcher = fetcher_for(server, store)
+
+        result = fetcher.fetch_all()
+
+        assert result == {"games": GAMES, "failed": 0, "changed": GAMES * PER_GAME}
+        assert snapshot(store) == snapshot(expected)
+        assert sum(server.request_counts.values()) == 1 + GAMES + len(range(0, GAMES, 5))
+        # Keep-alive connections are shared, not opened per request
+        assert fetcher.source.pool.connections_opened <= fetcher.concurrency
+    expected.close()
+
+
+def test_second_fetch_is_incremental(library, store):
+    with StandinServer() as server:
+        serve(server, library, 0, 0)
+        fetcher = fetcher_for(server, store)
+        fetcher.fetch_all()
+
+        again = fetcher.fetch_all()
+
+    assert again == {"games": GAMES, "failed": 0, "changed": 0}
+    assert store.library_stats()["total"] == GAMES * PER_GAME
+
+
+def test_unknown_game_fails_without_stopping_the_others(library, store):
+    with StandinServer() as server:
+        serve(server, library, 0, 0)
+        fetcher = fetcher_for(server, store)
+
+        result = fetcher.fetch_all(["game0", "missing", "game1"])
+
+        # 404 is not retried
+        assert server.request_counts["/achievements/missing"] == 1
+    assert result == {"games": 2, "failed": 1, "changed": 2 * PER_GAME}
+    assert store.game_ids() == ["game0", "game1"]
+
+
+def test_rate_limiter_spaces_requests_per_host():
+    limiter = HostRateLimiter(rate=50, burst=1)
+
+    async def acquire_all():
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire("a") for _ in range(6)), limiter.acquire("b"))
+        return time.monotonic() - started
+
+    # Five requests to host "a" beyond the burst at 50 per second
+    assert asyncio.run(acquire_all()) >= 5 / 50 * 0.9
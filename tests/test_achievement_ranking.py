@@ -0,0 +1,73 @@
+"""EasyAchievementRanker scoring and top-k queries on both backends"""
+
+import pytest
+
+from achievements.ranking import EasyAchievementRanker
+from achievements.store import AchievementStore
+from bench_achievement_ranking import fill
+
+
+@pytest.fixture
+def store():
+    store = AchievementStore(":memory:")
+    yield store
+    store.close()
+
+
+def test_common_nearly_done_quick_achievements_rank_first(store):
+    store.apply_changes("game1", "Game 1", [
+        {"id": "hard", "name": "Hard", "rarity": 1.0, "progress": 0.0, "estimated_minutes": 600},
+        {"id": "easy", "name": "Easy", "rarity": 90.0, "progress": 0.9, "estimated_minutes": 5},
+        {"id": "unknown", "name": "Unknown"},
+        {"id": "done", "name": "Done", "rarity": 99.0, "unlocked": True, "unlock_date": "2024-05-01"},
+    ])
+
+    top = EasyAchievementRanker(store, use_numpy=False).top(10)
+
+    assert [row["id"] for row in top] == ["easy", "unknown", "hard"]
+    assert top[1]["rarity"] is None and top[1]["score"] == 0.3
+
+
+def test_ties_keep_store_order_and_k_limits_the_result(store):
+    store.apply_changes("game1", "Game 1", [{"id": f"a{i}", "name": f"A{i}"} for i in range(5)])
+    ranker = EasyAchievementRanker(store, use_numpy=False)
+
+    assert [row["id"] for row in ranker.top(3)] == ["a0", "a1", "a2"]
+    assert ranker.top(0) == []
+
+
+def test_per_game_queries_agree_with_the_global_ranking(store):
+    fill(store, 20, 30, seed=3)
+    ranker = EasyAchievementRanker(store, use_numpy=False)
+
+    per_game = ranker.top_per_game(4)
+
+    assert sorted(per_game) == [f"game{g:05d}" for g in range(20)]
+    for game_id, rows in per_game.items():
+        assert rows == ranker.top_for_game(game_id, 4)
+        assert all(row["game_id"] == game_id for row in rows)
+        assert [row["score"] for row in rows] == sorted((row["score"] for row in rows), reverse=True)
+    best = ranker.top(1)[0]
+    assert best == max((rows[0] for rows in per_game.values()), key=lambda row: row["score"])
+    assert ranker.top_for_game("no such game") == []
+
+
+def test_scores_are_refreshed_when_the_store_changes(store):
+    store.apply_changes("game1", "Game 1", [{"id": "a", "name": "A", "rarity": 10.0}])
+    ranker = EasyAchievementRanker(store, use_numpy=False)
+    assert [row["id"] for row in ranker.top(1)] == ["a"]
+
+    store.apply_changes("game2", "Game 2", [{"id": "b", "name": "B", "rarity": 80.0}])
+
+    assert [row["game_id"] for row in ranker.top(2)] == ["game2", "game1"]
+
+
+def test_numpy_and_python_backends_agree(store):
+    pytest.importorskip("numpy")
+    fill(store, 50, 40, seed=7)
+    numpy_ranker = EasyAchievementRanker(store, use_numpy=True)
+    python_ranker = EasyAchievementRanker(store, use_numpy=False)
+
+    assert numpy_ranker.top(25) == python_ranker.top(25)
+    assert numpy_ranker.top_for_game("game00003", 5) == python_ranker.top_for_game("game00003", 5)
+    assert numpy_ranker.top_per_game(3) == python_ranker.top_per_game(3)
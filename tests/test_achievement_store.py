@@ -0,0 +1,121 @@
+"""AchievementStore schema migrations and the triggers that keep its aggregates current"""
+
+import sqlite3
+
+import pytest
+
+from achievements.store import MIGRATIONS, AchievementStore
+
+
+def achievement(achievement_id, unlocked=False, **fields):
+    return {'id': achievement_id, 'name': f"Achievement {achievement_id}", 'unlocked': unlocked,
+            'unlock_date': '2024-05-01' if unlocked else None, **fields}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AchievementStore(tmp_path / "achievements.db")
+    yield store
+    store.close()
+
+
+def user_version(path):
+    conn = sqlite3.connect(str(path))
+    try:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_new_store_is_at_the_latest_schema_version(tmp_path, store):
+    assert user_version(tmp_path / "achievements.db") == len(MIGRATIONS)
+    assert store.library_stats() == {'games': 0, 'total': 0, 'unlocked': 0, 'perfect': 0}
+
+
+def test_upgrade_fills_aggregates_for_existing_data(tmp_path):
+    path = tmp_path / "achievements.db"
+    conn = sqlite3.connect(str(path))
+    for statement in MIGRATIONS[0]:
+        conn.execute(statement)
+    conn.execute("INSERT INTO games (game_id, name) VALUES ('a', 'Alpha'), ('b', 'Beta'), ('c', 'Empty')")
+    conn.executemany("INSERT INTO achievements (game_id, achievement_id, name, unlocked) VALUES (?, ?, ?, ?)",
+                     [('a', '1', 'One', 1), ('a', '2', 'Two', 1), ('b', '1', 'One', 1), ('b', '2', 'Two', 0)])
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    store = AchievementStore(path)
+    try:
+        assert user_version(path) == len(MIGRATIONS)
+        assert store.game_stats('a') == {'total': 2, 'unlocked': 2}
+        assert store.game_stats('b') == {'total': 2, 'unlocked': 1}
+        assert store.game_stats('c') == {'total': 0, 'unlocked': 0}
+        assert store.library_stats() == {'games': 2, 'total': 4, 'unlocked': 3, 'perfect': 1}
+        assert store.check_aggregates() == []
+        # The columns added by later migrations are usable
+        store.apply_changes('b', 'Beta', [achievement('3', progress=0.5, estimated_minutes=10)])
+        locked = [a for a in store.get_game('b')['achievements'] if a['id'] == '3']
+        assert locked[0]['progress'] == 0.5
+    finally:
+        store.close()
+
+
+def test_reopening_does_not_migrate_again(tmp_path, store):
+    store.apply_changes('a', 'Alpha', [achievement('1', unlocked=True)])
+    store.close()
+
+    reopened = AchievementStore(tmp_path / "achievements.db")
+    try:
+        assert reopened.library_stats() == {'games': 1, 'total': 1, 'unlocked': 1, 'perfect': 1}
+    finally:
+        reopened.close()
+
+
+def test_triggers_follow_inserts_unlocks_and_deletes(store):
+    store.apply_changes('a', 'Alpha', [achievement('1'), achievement('2', unlocked=True)])
+    store.apply_changes('b', 'Beta', [achievement('1', unlocked=True)])
+    assert store.game_stats('a') == {'total': 2, 'unlocked': 1}
+    assert store.library_stats() == {'games': 2, 'total': 3, 'unlocked': 2, 'perfect': 1}
+
+    assert store.set_unlocked('a', '1', unlock_date='2024-06-01')
+    assert not store.set_unlocked('a', '1', unlock_date='2024-06-01')
+    assert store.library_stats() == {'games': 2, 'total': 3, 'unlocked': 3, 'perfect': 2}
+
+    store.set_unlocked('b', '1', unlocked=False)
+    assert store.library_stats() == {'games': 2, 'total': 3, 'unlocked': 2, 'perfect': 1}
+
+    store.apply_changes('a', 'Alpha', [{'id': '2', 'deleted': True}])
+    assert store.game_stats('a') == {'total': 1, 'unlocked': 1}
+
+    store.apply_changes('a', 'Alpha', [achievement('3')], replace=True)
+    assert [a['id'] for a in store.get_game('a')['achievements']] == ['3']
+    assert store.game_stats('a') == {'total': 1, 'unlocked': 0}
+
+    store.remove_game('b')
+    assert store.game_stats('b') is None
+    assert store.library_stats() == {'games': 1, 'total': 1, 'unlocked': 0, 'perfect': 0}
+    assert store.check_aggregates() == []
+
+
+def test_failed_batch_changes_nothing(store):
+    store.apply_changes('a', 'Alpha', [achievement('1')], sync_token='t1')
+
+    with pytest.raises(KeyError):
+        store.apply_changes('a', 'Alpha', [achievement('2', unlocked=True), {'name': 'no id'}],
+                            sync_token='t2')
+
+    assert [a['id'] for a in store.get_game('a')['achievements']] == ['1']
+    assert store.sync_token('a') == 't1'
+    assert store.library_stats() == {'games': 1, 'total': 1, 'unlocked': 0, 'perfect': 0}
+
+
+def test_check_aggregates_reports_and_repairs_drift(store):
+    store.apply_changes('a', 'Alpha', [achievement('1', unlocked=True), achievement('2')])
+    with store.transaction() as conn:
+        conn.execute("UPDATE game_stats SET total = 10 WHERE game_id = 'a'")
+
+    problems = store.check_aggregates(repair=True)
+
+    assert problems and problems[0].startswith("game a:")
+    assert store.check_aggregates() == []
+    assert store.game_stats('a') == {'total': 2, 'unlocked': 1}
@@ -0,0 +1,32 @@
+"""epic_manager.py subcommands import only the subsystems they use"""
+
+import pytest
+
+from bench_cli_startup import COMMANDS, PACKAGES, project_imports, run
+
+# Packages a command must not import at all
+FORBIDDEN = {
+    "help": PACKAGES,
+    "license": ("library", "downloads", "free_games", "achievements"),
+    "free-games --history": ("library", "downloads", "achievements"),
+    "achievements": ("library", "downloads", "free_games"),
+    "scan": ("downloads", "free_games", "achievements"),
+    "repair": ("downloads", "free_games", "achievements"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(FORBIDDEN))
+def test_command_imports_only_what_it_uses(name, tmp_path):
+    command = COMMANDS[name]
+    run(command, str(tmp_path))  # first start creates the config and data directories
+
+    modules = project_imports(command, str(tmp_path))
+
+    assert [m for m in modules if m.split(".")[0] in FORBIDDEN[name]] == []
+
+
+def test_scan_loads_the_library(tmp_path):
+    # Guards the check above against commands that fail before importing anything
+    modules = project_imports(COMMANDS["scan"], str(tmp_path))
+
+    assert "library.scanner" in modules
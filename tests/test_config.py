@@ -0,0 +1,103 @@
+"""Config transactions, hot reload, recovery from broken files and schema migration"""
+
+import json
+
+import pytest
+
+from core.config import Config, ConfigError
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def config():
+    return Config(reload_interval=0)
+
+
+def stored(config):
+    with open(config.config_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_transaction_writes_all_changes_at_once(config):
+    config.save()
+    with config.transaction():
+        for i in range(5):
+            config.add_game_directory(f"/games/{i}")
+            config.set("last_scan", str(i))
+        # Nothing reaches the file before the outermost transaction ends
+        assert stored(config)["game_directories"] == []
+
+    assert stored(config)["game_directories"] == [f"/games/{i}" for i in range(5)]
+    assert stored(config)["last_scan"] == "4"
+
+
+def test_failed_transaction_is_rolled_back(config):
+    config.set("theme", "dark")
+    before = config.config_file.read_text(encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with config.transaction() as values:
+            values["theme"] = "light"
+            config.add_game_directory("/games/new")
+            raise RuntimeError("abort")
+
+    assert config.get_str("theme") == "dark"
+    assert config.get_game_directories() == []
+    assert config.config_file.read_text(encoding="utf-8") == before
+
+
+def test_other_instance_sees_changes_and_hand_edits(config):
+    other = Config(reload_interval=0)
+
+    config.set("theme", "light")
+    assert other.get_str("theme") == "light"
+
+    text = config.config_file.read_text(encoding="utf-8")
+    config.config_file.write_text(text.replace('"light"', '"solarized"'), encoding="utf-8")
+    assert other.get_str("theme") == "solarized"
+
+
+def test_broken_file_keeps_last_good_values_and_is_not_overwritten(config):
+    config.set("theme", "light")
+    text = config.config_file.read_text(encoding="utf-8")
+    broken = text[: len(text) // 2]
+    config.config_file.write_text(broken, encoding="utf-8")
+
+    assert config.get_str("theme") == "light"
+    with pytest.raises(ConfigError):
+        with config.transaction() as values:
+            values["theme"] = "dark"
+    assert config.config_file.read_text(encoding="utf-8") == broken
+
+
+def test_broken_file_is_moved_aside_on_startup(config):
+    config.config_file.write_text("{broken", encoding="utf-8")
+
+    fresh = Config()
+
+    assert len(list(config.config_dir.glob("config.json.corrupt-*"))) == 1
+    assert fresh.get_str("theme") == "dark"
+
+
+def test_typed_set_rejects_the_wrong_type(config):
+    with pytest.raises(ConfigError):
+        config.set("auto_backup", "yes")
+    assert config.get_bool("auto_backup") is True
+
+
+def test_unversioned_file_is_migrated(config):
+    config.config_file.write_text(json.dumps({"game_directories": "D:/Games", "theme": "light"}),
+                                  encoding="utf-8")
+
+    migrated = Config()
+
+    assert migrated.get_game_directories() == ["D:/Games"]
+    assert migrated.get_str("theme") == "light"
+    assert migrated.get_bool("auto_backup") is True
+    assert migrated.get("schema_version") == 1
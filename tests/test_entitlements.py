@@ -0,0 +1,119 @@
+"""Entitlements cache: invalidation on activation, other writers and expiry"""
+
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from core import license as license_module
+from core.license import Entitlements, LicenseValidator, get_entitlements
+
+SRC = str(Path(__file__).resolve().parent.parent / "src")
+LIFETIME = 0.2
+
+
+def license_data(key, tier, valid_until=None):
+    return {'key': key, 'tier': tier, 'checksum': hashlib.sha256(key.encode()).hexdigest(),
+            'valid_until': valid_until.isoformat() if valid_until else None}
+
+
+def write_license(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+
+@pytest.fixture(autouse=True)
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def validator():
+    return LicenseValidator()
+
+
+def test_validators_share_one_service_per_file(validator):
+    assert LicenseValidator().entitlements is validator.entitlements is get_entitlements()
+
+
+def test_activation_and_deactivation_take_effect_at_once(validator):
+    service = validator.entitlements
+    assert service.tier == 'free' and not service.has('batch_repair')
+
+    validator.activate('EPIC-TEAM-0000-1111-2222')
+    assert service.tier == 'team' and service.has('batch_repair')
+
+    validator.deactivate()
+    assert service.tier == 'free' and not service.has('batch_repair')
+
+
+def test_other_process_is_seen_after_the_check_interval(validator, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(license_module, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    service = validator.entitlements
+    service.check_interval = 60
+    assert service.tier == 'free'
+
+    activate = ("import sys; sys.path.insert(0, sys.argv[1]); from core.license import LicenseValidator; "
+                "LicenseValidator().activate('EPIC-PRO-0000-1111-2222')")
+    subprocess.run([sys.executable, "-c", activate, SRC], check=True)
+
+    now[0] += 59
+    assert service.tier == 'free'
+    now[0] += 1
+    assert service.tier == 'pro'
+
+
+def test_tampered_license_is_free(tmp_path):
+    path = tmp_path / "license.json"
+    write_license(path, dict(license_data('EPIC-PRO-0000-1111-2222', 'pro'), checksum='0' * 64))
+
+    assert Entitlements(path).tier == 'free'
+
+
+def test_unreadable_license_is_free(tmp_path):
+    path = tmp_path / "license.json"
+    path.write_text("{broken", encoding='utf-8')
+
+    service = Entitlements(path)
+
+    assert service.tier == 'free' and not service.has('batch_repair')
+
+
+def test_license_expiring_while_cached_falls_back_to_free(tmp_path):
+    path = tmp_path / "license.json"
+    write_license(path, license_data('EPIC-PRO-0000-1111-2222', 'pro',
+                                     valid_until=datetime.now() + timedelta(seconds=LIFETIME)))
+    service = Entitlements(path, check_interval=0)
+
+    assert service.tier == 'pro'
+    time.sleep(LIFETIME * 1.5)
+    assert service.tier == 'free'
+
+
+def test_expired_license_is_free(tmp_path):
+    path = tmp_path / "license.json"
+    write_license(path, license_data('EPIC-PRO-0000-1111-2222', 'pro',
+                                     valid_until=datetime.now() - timedelta(days=1)))
+
+    assert Entitlements(path).tier == 'free'
+
+
+def test_invalidate_rereads_within_the_interval(tmp_path):
+    path = tmp_path / "license.json"
+    service = Entitlements(path, check_interval=3600)
+    assert service.tier == 'free'
+
+    write_license(path, license_data('EPIC-PRO-0000-1111-2222', 'pro'))
+    assert service.tier == 'free'
+
+    service.invalidate()
+    assert service.tier == 'pro'
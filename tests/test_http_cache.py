@@ -0,0 +1,180 @@
+"""CachedHttpClient revalidation and stale fallback, and the free games tracker on top of it"""
+
+import json
+import time
+
+import pytest
+
+from core.http import CachedHttpClient, HttpError
+from free_games.archive import PromotionArchive
+from free_games.seen import SeenPromotions
+from free_games.tracker import FreeGamesTracker
+from standin_server import ConditionalResource, StandinServer, promotions_payload
+
+TTL = 3600.0
+OFFERS = 40
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def resource():
+    return ConditionalResource.json(promotions_payload(OFFERS))
+
+
+@pytest.fixture
+def server(resource):
+    with StandinServer() as server:
+        server.add_route("/freeGamesPromotions", resource)
+        yield server
+
+
+@pytest.fixture
+def url(server):
+    return server.base_url + "/freeGamesPromotions"
+
+
+def requests(server):
+    return server.request_counts.get("/freeGamesPromotions", 0)
+
+
+def test_fresh_response_is_served_without_a_request(tmp_path, server, url, resource, clock):
+    client = CachedHttpClient(tmp_path, ttl=TTL, clock=clock)
+
+    first = client.get(url)
+    second = client.get(url)
+
+    assert (first.source, second.source) == ("network", "cache")
+    assert second.body == resource.body
+    assert requests(server) == 1
+
+
+def test_expired_response_is_revalidated_with_a_304(tmp_path, server, url, resource, clock):
+    client = CachedHttpClient(tmp_path, ttl=TTL, clock=clock)
+    client.get(url)
+
+    clock.now += TTL + 1
+    response = client.get(url)
+
+    assert response.source == "revalidated"
+    assert response.body == resource.body
+    assert resource.not_modified == 1 and resource.full_responses == 1
+    # The revalidation restarts the TTL
+    assert client.get(url).source == "cache"
+    assert requests(server) == 2
+
+
+def test_changed_resource_is_fetched_again(tmp_path, server, url, resource, clock):
+    client = CachedHttpClient(tmp_path, ttl=TTL, clock=clock)
+    client.get(url)
+
+    resource.update(b'{"changed": true}')
+    clock.now += TTL + 1
+    response = client.get(url)
+
+    assert response.source == "network"
+    assert json.loads(response.body) == {"changed": True}
+
+
+def test_cache_on_disk_is_shared_between_clients(tmp_path, server, url, clock):
+    CachedHttpClient(tmp_path, ttl=TTL, clock=clock).get(url)
+
+    response = CachedHttpClient(tmp_path, ttl=TTL, clock=clock).get(url)
+
+    assert response.source == "cache"
+    assert requests(server) == 1
+
+
+def test_server_error_serves_the_stale_copy(tmp_path, server, url, resource, clock):
+    client = CachedHttpClient(tmp_path, ttl=TTL, clock=clock)
+    client.get(url)
+
+    resource.failing = True
+    clock.now += TTL + 1
+
+    assert client.get(url).stale
+    with pytest.raises(HttpError) as error:
+        client.get(url, allow_stale=False)
+    assert error.value.status == 503
+
+
+def test_unreachable_server_serves_the_stale_copy(tmp_path, clock):
+    with StandinServer() as server:
+        server.add_route("/doc", ConditionalResource(b"body"))
+        url = server.base_url + "/doc"
+        client = CachedHttpClient(tmp_path, ttl=TTL, clock=clock)
+        client.get(url)
+        client.close()
+
+    clock.now += TTL + 1
+    response = client.get(url)
+
+    assert response.stale and response.body == b"body"
+    with pytest.raises(OSError):
+        client.get(url, allow_stale=False)
+
+
+def test_nothing_cached_and_server_failing_raises(tmp_path, server, url, resource, clock):
+    resource.failing = True
+
+    with pytest.raises(HttpError):
+        CachedHttpClient(tmp_path, ttl=TTL, clock=clock).get(url)
+
+
+def test_connection_is_reused(tmp_path, server, url, clock):
+    client = CachedHttpClient(tmp_path, ttl=0, clock=clock)
+    for _ in range(5):
+        client.get(url)
+
+    assert client.pool.connections_opened == 1
+    assert server.connection_count == 1
+
+
+@pytest.fixture
+def tracker(tmp_path, url, clock):
+    tracker = FreeGamesTracker(client=CachedHttpClient(tmp_path / "cache", ttl=TTL, clock=clock),
+                               api_url=url, seen=SeenPromotions(tmp_path / "seen.json"),
+                               archive=PromotionArchive(tmp_path / "archive.db"))
+    yield tracker
+    tracker.client.close()
+
+
+def test_tracker_reads_through_the_cache(tracker, server, resource, clock):
+    assert len(tracker.get_current_free()) == len(range(0, OFFERS, 4))
+    assert len(tracker.get_upcoming_free()) == len(range(1, OFFERS, 4))
+    assert requests(server) == 1
+
+    resource.update(json.dumps(promotions_payload(OFFERS, free_every=2)).encode())
+    clock.now += TTL + 1
+
+    assert len(tracker.get_current_free()) == len(range(0, OFFERS, 2))
+    assert requests(server) == 2
+
+
+def test_tracker_throttles_checks_before_fetching(tracker, server):
+    assert tracker.check_for_new_games()
+    before = requests(server)
+
+    assert tracker.check_for_new_games() == []
+    assert requests(server) == before
+
+
+def test_tracker_goes_offline_on_the_stale_copy(tracker, resource, clock):
+    tracker.get_current_free()
+
+    resource.failing = True
+    clock.now += TTL + 1
+
+    assert len(tracker.get_current_free()) == len(range(0, OFFERS, 4))
+    assert tracker.offline
@@ -0,0 +1,91 @@
+"""Library scanning, manifest maintenance and the download queue on a synthetic library"""
+
+import contextlib
+import io
+import random
+
+import pytest
+
+from downloads.queue_manager import DownloadQueueManager
+from library.manifest import ManifestManager
+from library.scanner import LibraryScanner
+from manifest_corpus import generate_library
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    # Backups and lock files go under HOME
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    return generate_library(tmp_path / "library", 200, files=(1, 5), broken=0.05, seed=3)
+
+
+@pytest.fixture
+def scanner(corpus):
+    return LibraryScanner(corpus.manifest_dir)
+
+
+def test_scan_finds_every_valid_manifest(corpus, scanner):
+    found = scanner.scan_manifests()
+
+    assert sorted(game.display_name for game in found) == sorted(corpus.display_names)
+    assert len(scanner.scan_manifests()) == len(found)
+
+
+def test_lookups_find_every_game_by_display_and_app_name(corpus, scanner):
+    scanner.scan_manifests()
+
+    for name in corpus.display_names:
+        assert scanner.get_game_by_name(name).display_name == name
+    for name in corpus.app_names:
+        assert scanner.get_game_by_name(name.upper()).app_name == name
+    assert scanner.get_game_by_name("no such game") is None
+
+
+def test_validation_reports_missing_installs(corpus, scanner):
+    reports = [ManifestManager(scanner).validate_manifest(game) for game in scanner.scan_manifests()]
+
+    missing = sum(any(w.startswith("Install location does not exist") for w in r["warnings"]) for r in reports)
+    assert all(report["valid"] for report in reports)
+    assert missing == corpus.missing
+
+
+def test_every_manifest_is_backed_up(scanner):
+    manager = ManifestManager(scanner)
+    backups = [manager.backup_manifest(game) for game in scanner.scan_manifests()]
+
+    assert all(backup is not None and backup.exists() for backup in backups)
+
+
+def test_bulk_update_moves_copied_games_and_persists(corpus, scanner):
+    scanner.scan_manifests()
+
+    updated, failed = ManifestManager(scanner).bulk_update_location(corpus.moved_root)
+
+    assert len(updated) == corpus.moved and not failed
+    relocated = [game for game in LibraryScanner(corpus.manifest_dir).scan_manifests()
+                 if game.install_location.parent == corpus.moved_root]
+    assert len(relocated) == corpus.moved
+
+
+def test_queue_serves_prioritized_first_and_drains(tmp_path, scanner):
+    rng = random.Random(1)
+    queue = DownloadQueueManager(tmp_path / "download_queue.json", durable=False)
+    games = scanner.scan_manifests()
+    # add_to_queue prints a line per call
+    with contextlib.redirect_stdout(io.StringIO()):
+        for game in games:
+            queue.add_to_queue(game.app_name, game.display_name, game.install_size, priority=rng.randint(0, 5))
+    favourite = rng.choice(games)
+
+    queue.prioritize_game(favourite.app_name)
+
+    assert queue.get_next_download().game_id == favourite.app_name
+    assert queue.get_next_download().priority == 999
+    while True:
+        item = queue.claim_next_download()
+        if item is None:
+            break
+        queue.update_status(item.game_id, "completed")
+    queue.clear_completed()
+    assert queue.get_queue_info(include_items=False)["total_items"] == 0
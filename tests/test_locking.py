@@ -0,0 +1,38 @@
+"""Concurrent config, license and queue writers from several processes lose no updates"""
+
+import json
+import multiprocessing
+
+from core.config import Config
+from core.license import LicenseValidator
+from downloads.queue_manager import DownloadQueueManager
+from stress_locking import worker
+
+PROCESSES = 4
+OPS = 15
+
+
+def test_no_update_is_lost_across_processes(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    queue_file = tmp_path / "queue" / "download_queue.json"
+    queue_file.parent.mkdir()
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Event()
+    processes = [ctx.Process(target=worker, args=(i, OPS, str(queue_file), start)) for i in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    start.set()
+    for process in processes:
+        process.join(60)
+
+    assert [process.exitcode for process in processes] == [0] * PROCESSES
+    with open(Config().config_file) as f:
+        raw_config = json.load(f)
+    expected = PROCESSES * OPS
+    assert len([key for key in raw_config if key.startswith("worker")]) == expected
+    assert len(set(raw_config["game_directories"])) == expected
+    with open(LicenseValidator().license_file) as f:
+        assert json.load(f)["tier"] == "pro"
+    info = DownloadQueueManager(queue_file=queue_file, durable=False).get_queue_info(include_items=False)
+    assert info["total_items"] == expected
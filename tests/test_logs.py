@@ -0,0 +1,173 @@
+"""LoopLog rate limiting and summaries, JSON log lines, and the GUI's activity log"""
+
+import io
+import json
+import logging
+import threading
+import time
+
+import pytest
+
+from core.logs import JsonLogHandler, LoopLog
+from epic_manifest_updater import ActivityLogHandler, LogBuffer
+from manifest_corpus import generate_library
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def captured():
+    logger = logging.getLogger("tests.loop")
+    handler = Records()
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger, handler.records
+    logger.removeHandler(handler)
+
+
+def test_loop_log_limits_each_category_and_summarizes(captured):
+    logger, records = captured
+
+    with LoopLog(logger, limit=2, summaries={'skipped': "Skipped {count:,} games ({suppressed} hidden)"}) as log:
+        for i in range(5):
+            log.info('skipped', "Skipping %s", f"game{i}", app_name=f"game{i}")
+        log.warning('failed', "Failed %s", "game9")
+
+    messages = [record.getMessage() for record in records]
+    assert messages == ["Skipping game0", "Skipping game1", "Failed game9", "Skipped 5 games (3 hidden)"]
+    assert records[0].category == 'skipped' and records[0].app_name == 'game0'
+    assert records[-1].summary and records[-1].count == 5
+
+
+def test_loop_log_notes_suppressed_records_without_a_summary(captured):
+    logger, records = captured
+
+    with LoopLog(logger, limit=1) as log:
+        for _ in range(3):
+            log.info('found', "Found one")
+
+    assert [record.getMessage() for record in records] == ["Found one", "2 more 'found' records not logged"]
+
+
+def test_loop_log_attributes_records_to_the_caller(captured):
+    logger, records = captured
+
+    with LoopLog(logger) as log:
+        log.info('found', "Found one")
+
+    assert records[0].funcName == "test_loop_log_attributes_records_to_the_caller"
+
+
+def test_json_handler_writes_one_object_per_line():
+    stream = io.StringIO()
+    logger = logging.getLogger("tests.json")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = JsonLogHandler(stream)
+    logger.addHandler(handler)
+    try:
+        with LoopLog(logger, summaries={'updated': "Updated {count:,} manifests"}) as log:
+            log.error('updated', "Updated %s", "game0", path="C:/Games/game0")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed")
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines[0]['message'] == "Updated game0"
+    assert (lines[0]['level'], lines[0]['category'], lines[0]['path']) == ("ERROR", "updated", "C:/Games/game0")
+    assert lines[1]['summary'] and lines[1]['count'] == 1
+    assert "ValueError: boom" in lines[2]['exception']
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return generate_library(tmp_path / "corpus", 120, files=(1, 3), seed=1)
+
+
+def relocate(corpus):
+    from library.manifest import ManifestManager
+    from library.scanner import LibraryScanner
+
+    return ManifestManager(LibraryScanner(corpus.manifest_dir)).bulk_update_location(corpus.moved_root)
+
+
+def test_bulk_update_logs_a_bounded_number_of_records_with_full_counts(corpus):
+    library_logger = logging.getLogger("library")
+    handler = Records()
+    library_logger.addHandler(handler)
+    library_logger.setLevel(logging.INFO)
+    try:
+        updated, failed = relocate(corpus)
+    finally:
+        library_logger.removeHandler(handler)
+        library_logger.setLevel(logging.NOTSET)
+
+    valid = len(corpus.display_names)
+    summaries = {record.category: record.count for record in handler.records if getattr(record, 'summary', False)}
+    assert (len(updated), failed) == (corpus.moved, [])
+    assert summaries == {"found": valid, "invalid": corpus.broken, "backup": corpus.moved,
+                         "updated": corpus.moved, "skipped": valid - corpus.moved}
+    assert f"Skipped {valid - corpus.moved:,} games not found in new location" in \
+        [record.getMessage() for record in handler.records]
+    assert len(handler.records) <= 60
+
+
+def test_activity_log_handler_forwards_library_records(corpus):
+    lines = []
+    library_logger = logging.getLogger("library")
+    handler = ActivityLogHandler(lambda message, level: lines.append((level, message)))
+    library_logger.addHandler(handler)
+    library_logger.setLevel(logging.INFO)
+    try:
+        relocate(corpus)
+    finally:
+        library_logger.removeHandler(handler)
+        library_logger.setLevel(logging.NOTSET)
+
+    assert ("SUCCESS", f"{corpus.moved - LoopLog.DEFAULT_LIMIT} more 'updated' records not logged") in lines
+    assert sum(1 for level, _ in lines if level == "SUCCESS") == LoopLog.DEFAULT_LIMIT + 1
+
+
+def test_log_buffer_keeps_every_line_in_order_under_concurrent_writers():
+    buffer = LogBuffer()
+    drained = []
+    done = threading.Event()
+    threads, lines = 4, 5000
+
+    def write(n):
+        for i in range(lines):
+            buffer.append(f"{n}:{i}\n")
+
+    def drain():
+        while not done.is_set():
+            drained.append(buffer.drain())
+            time.sleep(0.001)
+        drained.append(buffer.drain())
+
+    reader = threading.Thread(target=drain)
+    reader.start()
+    writers = [threading.Thread(target=write, args=(n,)) for n in range(threads)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    done.set()
+    reader.join()
+
+    received = "".join(drained).splitlines()
+    assert len(received) == threads * lines
+    for n in range(threads):
+        assert [int(line.split(":")[1]) for line in received if line.startswith(f"{n}:")] == list(range(lines))
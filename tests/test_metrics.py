@@ -0,0 +1,108 @@
+"""core.metrics recording and export, and the counters of the instrumented library code"""
+
+import contextlib
+import io
+import json
+import re
+
+import pytest
+
+from core import metrics
+from manifest_corpus import generate_library
+
+PROMETHEUS_LINE = re.compile(r"^(# TYPE [a-zA-Z_:][a-zA-Z0-9_:]* (counter|gauge|summary)"
+                             r"|[a-zA-Z_:][a-zA-Z0-9_:]* -?[0-9.e+-]+)$")
+
+
+@pytest.fixture
+def recording():
+    metrics.reset()
+    metrics.enable()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+def test_nothing_is_recorded_while_disabled():
+    metrics.reset()
+
+    metrics.incr("test.counter")
+    with metrics.span("test.span"):
+        pass
+    metrics.timed("test.timed")(lambda: None)()
+
+    assert metrics.snapshot()["counters"] == {} and metrics.snapshot()["timings"] == {}
+    assert metrics.span("a") is metrics.span("b")
+
+
+def test_counters_and_timings_are_recorded(recording):
+    metrics.incr("test.counter")
+    metrics.incr("test.counter", 4)
+    for _ in range(3):
+        with metrics.span("test.span"):
+            pass
+
+    @metrics.timed("test.timed")
+    def fail():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        fail()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"test.counter": 5}
+    assert snapshot["timings"]["test.span"]["count"] == 3
+    # Calls that raise are timed too
+    assert snapshot["timings"]["test.timed"]["count"] == 1
+    assert fail.__name__ == "fail"
+
+
+def test_prometheus_output_is_well_formed(recording):
+    metrics.incr("library.manifests_parsed", 3)
+    metrics.observe("queue.journal_write", 0.002)
+
+    text = metrics.to_prometheus()
+
+    assert all(PROMETHEUS_LINE.match(line) for line in text.splitlines())
+    assert "epic_games_manager_library_manifests_parsed_total 3" in text
+    assert "epic_games_manager_queue_journal_write_seconds_count 1" in text
+
+
+def test_snapshots_are_written_to_files(recording, tmp_path):
+    metrics.incr("test.counter")
+
+    metrics.write_json(tmp_path / "metrics.json")
+    metrics.write_prometheus(tmp_path / "metrics.prom")
+
+    assert json.loads((tmp_path / "metrics.json").read_text())["counters"] == {"test.counter": 1}
+    assert "epic_games_manager_test_counter_total 1" in (tmp_path / "metrics.prom").read_text()
+
+
+def test_library_counters_agree_with_the_corpus(recording, tmp_path, monkeypatch):
+    from downloads.queue_manager import DownloadQueueManager
+    from library.manifest import ManifestManager
+    from library.scanner import LibraryScanner
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    corpus = generate_library(tmp_path / "library", 150, files=(1, 3), broken=0.05, seed=2)
+
+    scanner = LibraryScanner(corpus.manifest_dir)
+    games = scanner.scan_manifests()
+    manager = ManifestManager(scanner)
+    for game in games:
+        manager.validate_manifest(game)
+    manager.bulk_update_location(corpus.moved_root)
+    queue = DownloadQueueManager(tmp_path / "queue.json", durable=False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for game in games:
+            queue.add_to_queue(game.app_name, game.display_name, game.install_size)
+    while queue.claim_next_download() is not None:
+        pass
+
+    counters, timings = metrics.snapshot()["counters"], metrics.snapshot()["timings"]
+    # Scanned twice (once more inside bulk_update_location), validated once per valid game
+    manifests = corpus.summary()["manifests"]
+    assert counters["library.manifests_parsed"] == 2 * manifests + len(corpus.display_names)
+    assert counters["library.manifest_errors"] == 2 * corpus.broken
+    assert counters["manifest.backups_written"] == timings["manifest.update_location"]["count"] == corpus.moved
+    assert timings["queue.journal_write"]["count"] == counters["queue.changes"] == 2 * len(games)
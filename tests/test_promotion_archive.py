@@ -0,0 +1,107 @@
+"""PromotionArchive: append-only storage and indexed history search"""
+
+import sqlite3
+
+import pytest
+
+from bench_promotion_archive import QUERIES, make_promotions, python_search
+from free_games.archive import PromotionArchive, tokenize
+
+
+def offer(offer_id, title="Dark Legend", starts_at="2024-05-01T15:00:00Z", ends_at="2024-05-08T15:00:00Z",
+          amount=19.99):
+    return {'id': offer_id, 'title': title, 'starts_at': starts_at, 'ends_at': ends_at,
+            'original_price': f"${amount:.2f}", 'original_amount': amount, 'currency': 'USD'}
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = PromotionArchive(tmp_path / "archive.db")
+    yield archive
+    archive.close()
+
+
+def test_promotion_seen_again_is_not_added_twice(archive):
+    assert archive.record([offer('a'), offer('b')]) == 2
+    assert archive.record([offer('a'), offer('b')]) == 0
+    # The same offer in a later window is a new promotion
+    assert archive.record([offer('a', starts_at="2024-06-01T15:00:00Z", ends_at="2024-06-08T15:00:00Z")]) == 1
+    assert archive.count() == 3
+
+
+@pytest.mark.parametrize("statement", [
+    "UPDATE promotions SET title = 'Changed'",
+    "DELETE FROM promotions",
+])
+def test_rows_cannot_be_changed_or_removed(archive, statement):
+    archive.record([offer('a')])
+
+    with pytest.raises(sqlite3.IntegrityError, match="append-only"):
+        with archive.transaction() as conn:
+            conn.execute(statement)
+
+    assert [row['title'] for row in archive.search()] == ["Dark Legend"]
+
+
+def test_reopening_keeps_the_archive(tmp_path, archive):
+    archive.record([offer('a')])
+    archive.close()
+
+    reopened = PromotionArchive(tmp_path / "archive.db")
+    try:
+        assert reopened.count() == 1
+        assert reopened.record([offer('a')]) == 0
+    finally:
+        reopened.close()
+
+
+def test_tokenize_folds_case_and_accents():
+    assert tokenize("Star Wars: Édition Spéciale star") == ["star", "wars", "edition", "speciale"]
+
+
+def test_title_words_match_word_prefixes_in_any_order(archive):
+    archive.record([offer('a', "Hollow Knight"), offer('b', "Knight Hollow Tales"), offer('c', "Hollowed")])
+
+    assert sorted(row['offer_id'] for row in archive.search("kni holl")) == ['a', 'b']
+    assert sorted(row['offer_id'] for row in archive.search("hollow")) == ['a', 'b', 'c']
+    assert archive.search("hollow castle") == []
+
+
+def test_bare_until_date_covers_the_whole_day(archive):
+    archive.record([offer('a', starts_at="2024-05-01T23:00:00Z")])
+
+    assert len(archive.search(until="2024-05-01")) == 1
+    assert archive.search(until="2024-04-30") == []
+
+
+@pytest.fixture(scope="module")
+def filled(tmp_path_factory):
+    offers = make_promotions(3000, seed=3)
+    archive = PromotionArchive(tmp_path_factory.mktemp("archive") / "archive.db")
+    archive.record(offers)
+    yield archive, [dict(o, rowid=i) for i, o in enumerate(offers)]
+    archive.close()
+
+
+@pytest.mark.parametrize("query", QUERIES.values(), ids=list(QUERIES))
+def test_search_matches_a_full_scan(filled, query):
+    archive, rows = filled
+
+    found = archive.search(**query)
+
+    assert found
+    assert [row['title'] for row in found] == [row['title'] for row in python_search(rows, **query)]
+
+
+@pytest.mark.parametrize("query, index", [
+    ({"title": "dragon"}, "title_tokens"),
+    ({"since": "2021-03-01", "until": "2021-03-15"}, "idx_promotions_"),
+    ({"min_price": 59.99, "max_price": 59.99}, "idx_promotions_amount"),
+])
+def test_searches_use_an_index(filled, query, index):
+    archive, _ = filled
+
+    plan = " ".join(archive.query_plan(**query))
+
+    assert index in plan
+    assert "SCAN promotions" not in plan
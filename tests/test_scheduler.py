@@ -0,0 +1,78 @@
+"""DownloadScheduler against the local stand-in server"""
+
+from pathlib import Path
+
+import pytest
+
+from downloads.queue_manager import DownloadQueueManager
+from downloads.scheduler import DownloadScheduler
+from standin_server import StandinServer, file_bytes
+
+SIZE = 256 * 1024
+
+
+@pytest.fixture
+def server():
+    with StandinServer() as server:
+        yield server
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return DownloadQueueManager(tmp_path / "download_queue.json", durable=False)
+
+
+def add_items(queue, server, count, fail_every=0):
+    for i in range(count):
+        fail = 1 if fail_every and i % fail_every == 0 else 0
+        queue.add_to_queue(f"game-{i}", f"Game {i}", SIZE, priority=i % 3,
+                           url=f"{server.base_url}/files/game-{i}?size={SIZE}&fail={fail}")
+
+
+def completion_order(queue):
+    """Priorities of the items in the order they complete"""
+    finished = []
+    queue.subscribe(lambda event: event.new_status == "completed" and finished.append(event.item.priority))
+    return finished
+
+
+def test_downloads_every_item_and_retries_injected_failures(tmp_path, server, queue):
+    add_items(queue, server, 10, fail_every=5)
+    scheduler = DownloadScheduler(queue, tmp_path / "downloads", max_workers=3, backoff_base=0.01)
+
+    scheduler.run_until_idle()
+
+    info = queue.get_queue_info(include_items=False)
+    assert info["by_status"] == {"completed": 10}
+    for i in range(10):
+        assert (tmp_path / "downloads" / f"game-{i}").read_bytes() == file_bytes(f"game-{i}", 0, SIZE)
+    assert scheduler.attempts == {}
+
+    # Each injected 503 costs exactly one extra request, and nothing else is retried
+    clean = server.request_counts["/files/game-1"]
+    retried = {path: count - clean for path, count in server.request_counts.items() if count != clean}
+    assert retried == {"/files/game-0": 1, "/files/game-5": 1}
+
+
+def test_gives_up_after_max_retries(tmp_path, server, queue):
+    queue.add_to_queue("broken", "Broken", SIZE, url=f"{server.base_url}/files/broken?size={SIZE}&fail=99")
+    scheduler = DownloadScheduler(queue, tmp_path / "downloads", max_workers=1,
+                                  max_retries=2, backoff_base=0.01)
+
+    scheduler.run_until_idle()
+
+    assert queue.get_item("broken").status == "failed"
+    assert server.request_counts["/files/broken"] == 3
+
+
+def test_higher_priorities_finish_first_under_a_saturated_limit(tmp_path, server, queue):
+    add_items(queue, server, 12)
+    finished = completion_order(queue)
+    # Two workers share a limit well below what the link could carry
+    scheduler = DownloadScheduler(queue, tmp_path / "downloads", max_workers=2,
+                                  bandwidth_limit=4 * SIZE)
+
+    scheduler.run_until_idle()
+
+    assert sorted(finished) == [0] * 4 + [1] * 4 + [2] * 4
+    assert finished == sorted(finished, reverse=True)
@@ -0,0 +1,186 @@
+"""Seen-promotions diffing and the background poller built on it"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from core.http import CachedHttpClient
+from free_games.archive import PromotionArchive
+from free_games.poller import PromotionPoller
+from free_games.seen import SeenPromotions, promotion_key
+from free_games.tracker import FreeGamesTracker
+from standin_server import ConditionalResource, StandinServer, promotions_payload
+
+OFFERS = 40
+QUARTER = len(range(0, OFFERS, 4))
+HALF = len(range(0, OFFERS, 2))
+
+
+def game(offer_id, starts_at="2024-05-01T15:00:00Z", ends_at="2024-05-08T15:00:00Z"):
+    return {'id': offer_id, 'title': f"Game {offer_id}", 'starts_at': starts_at, 'ends_at': ends_at}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2024, 5, 2, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def seen(tmp_path, clock):
+    return SeenPromotions(tmp_path / "seen.json", retention_days=30, clock=clock)
+
+
+def ids(games):
+    return sorted(g['id'] for g in games)
+
+
+def test_first_update_reports_everything_once(seen):
+    new, ended = seen.update([game('a'), game('b')], 'digest-1')
+
+    assert (ids(new), ended) == (['a', 'b'], [])
+    assert seen.update([game('a'), game('b')], 'digest-1') == ([], [])
+    assert seen.payload_digest() == 'digest-1'
+
+
+def test_removed_promotions_are_reported_as_ended(seen):
+    seen.update([game('a'), game('b')])
+
+    new, ended = seen.update([game('a')])
+
+    assert new == []
+    assert [entry['key'] for entry in ended] == [promotion_key(game('b'))]
+    assert seen.active_keys() == {promotion_key(game('a'))}
+
+
+def test_promotion_that_returns_is_not_reported_again(seen):
+    seen.update([game('a')])
+    seen.update([])
+
+    assert seen.update([game('a')]) == ([], [])
+    assert seen.active_keys() == {promotion_key(game('a'))}
+
+
+def test_same_offer_in_a_new_window_is_new(seen):
+    seen.update([game('a')])
+
+    new, ended = seen.update([game('a', starts_at="2024-06-01T15:00:00Z", ends_at="2024-06-08T15:00:00Z")])
+
+    assert ids(new) == ['a']
+    assert len(ended) == 1
+
+
+def test_ended_promotions_are_forgotten_after_the_retention(seen, clock):
+    seen.update([game('a')])
+    seen.update([])
+
+    clock.now += timedelta(days=31)
+    seen.update([])
+
+    assert seen.load()['promotions'] == {}
+    assert ids(seen.update([game('a')])[0]) == ['a']
+
+
+def test_index_is_shared_between_instances(tmp_path, seen, clock):
+    seen.update([game('a')])
+
+    other = SeenPromotions(tmp_path / "seen.json", clock=clock)
+
+    assert other.update([game('a'), game('b')]) == ([game('b')], [])
+
+
+def test_unreadable_index_is_quarantined(tmp_path, seen):
+    seen.path.write_text("{not json", encoding="utf-8")
+
+    new, _ = seen.update([game('a')])
+
+    assert ids(new) == ['a']
+    assert len(list(tmp_path.glob("seen.json.corrupt-*"))) == 1
+
+
+@pytest.fixture
+def payloads():
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    return {
+        'quarter': json.dumps(promotions_payload(OFFERS, free_every=4, now=now)).encode(),
+        'half': json.dumps(promotions_payload(OFFERS, free_every=2, now=now)).encode(),
+    }
+
+
+@pytest.fixture
+def resource(payloads):
+    return ConditionalResource(payloads['quarter'])
+
+
+@pytest.fixture
+def tracker(tmp_path, resource):
+    with StandinServer() as server:
+        server.add_route("/freeGamesPromotions", resource)
+        tracker = FreeGamesTracker(client=CachedHttpClient(tmp_path / "cache"),
+                                   api_url=server.base_url + "/freeGamesPromotions",
+                                   seen=SeenPromotions(tmp_path / "seen.json"),
+                                   archive=PromotionArchive(tmp_path / "archive.db"))
+        yield tracker
+        tracker.client.close()
+
+
+def test_poller_reports_each_change_once(tracker, resource, payloads):
+    events = []
+    poller = PromotionPoller(tracker, on_change=lambda new, ended: events.append((len(new), len(ended))))
+
+    poller.run_once()
+    for _ in range(3):
+        assert poller.run_once() is None
+    assert resource.not_modified == 3
+    resource.update(payloads['half'])
+    poller.run_once()
+    resource.update(payloads['quarter'])
+    poller.run_once()
+
+    assert events == [(QUARTER, 0), (HALF - QUARTER, 0), (0, HALF - QUARTER)]
+    assert (poller.polls, poller.changes) == (6, 3)
+
+
+def test_poller_backs_off_while_the_server_fails(tracker, resource):
+    poller = PromotionPoller(tracker, interval=10, jitter=0, backoff_base=20, backoff_max=60,
+                             rng=random.Random(1))
+    poller.run_once()
+    assert poller.next_delay() == 10
+
+    resource.failing = True
+    delays = []
+    for _ in range(4):
+        assert poller.run_once() is None
+        delays.append(poller.next_delay())
+
+    assert poller.failures == 4
+    assert 10 <= delays[0] <= 20 and 20 <= delays[1] <= 40
+    assert all(30 <= delay <= 60 for delay in delays[2:])
+
+    resource.failing = False
+    poller.run_once()
+    assert poller.failures == 0
+
+
+def test_tracker_sharing_the_index_sees_nothing_new(tracker):
+    tracker.check_for_changes()
+
+    other = FreeGamesTracker(client=CachedHttpClient(tracker.client.cache_dir), api_url=tracker.api_url,
+                             seen=tracker.seen, archive=tracker.archive)
+
+    assert other.check_for_changes() == ([], [])
+
+
+def test_day_old_check_is_not_throttled(tracker):
+    tracker.last_check = datetime.now() - timedelta(days=1, minutes=1)
+
+    assert len(tracker.check_for_new_games()) == QUARTER